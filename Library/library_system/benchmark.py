@@ -0,0 +1,1421 @@
+"""
+Library Inventory System - Benchmark Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Timing benchmarks for the library engine on generated catalogs
+"""
+
+import asyncio
+import collections
+import contextlib
+import csv
+import itertools
+import json
+import os
+import platform
+import random
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import importer
+import snapshot
+from bitmap import AvailabilityBitmap
+from book import Book
+from events import Events
+from history import LoanHistory
+from journal import Journal
+from library import Library
+from member import Member
+from search import SearchIndex
+from sharding import ShardedLibrary
+from storage import ColumnarStorage, convert_to_columns
+from workload import (generate_catalog, generate_members, generate_operations,
+                      make_isbn, zipf_cum_weights)
+
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the Library's console messages while timing."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def bench_bulk_add(size):
+    """
+    Time adding `size` books and `size` members to an empty library.
+    
+    Args:
+        size (int): Number of books and members to add
+        
+    Returns:
+        tuple: (Library, seconds for books, seconds for members)
+    """
+    library = Library()
+    with quiet():
+        start = time.perf_counter()
+        for n in range(size):
+            library.add_book(f"Title {n}", f"Author {n % 1000}", make_isbn(n))
+        books_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for n in range(size):
+            library.register_member(f"Member {n}", f"M{n:08d}")
+        members_time = time.perf_counter() - start
+    return library, books_time, members_time
+
+
+def bench_lookups(library, size, lookups=100_000, seed=42):
+    """
+    Time random ISBN and member ID lookups against a populated library.
+    
+    Args:
+        library (Library): Library populated by bench_bulk_add
+        size (int): Number of books and members in the library
+        lookups (int): Number of lookups to perform for each kind
+        seed (int): Random seed for reproducible key selection
+        
+    Returns:
+        tuple: (microseconds per book lookup, microseconds per member lookup)
+    """
+    rng = random.Random(seed)
+    isbns = [make_isbn(rng.randrange(size)) for _ in range(lookups)]
+    member_ids = [f"M{rng.randrange(size):08d}" for _ in range(lookups)]
+    
+    start = time.perf_counter()
+    for isbn in isbns:
+        library.find_book_by_isbn(isbn)
+    book_us = (time.perf_counter() - start) / lookups * 1e6
+    
+    start = time.perf_counter()
+    for member_id in member_ids:
+        library.find_member_by_id(member_id)
+    member_us = (time.perf_counter() - start) / lookups * 1e6
+    return book_us, member_us
+
+
+def bench_linear_scan(library, size, lookups=20, seed=42):
+    """
+    Time the previous linear-scan lookup for comparison.
+    
+    Args:
+        library (Library): Library populated by bench_bulk_add
+        size (int): Number of books in the library
+        lookups (int): Number of scans to perform
+        seed (int): Random seed for reproducible key selection
+        
+    Returns:
+        float: Microseconds per lookup
+    """
+    rng = random.Random(seed)
+    isbns = [make_isbn(rng.randrange(size)) for _ in range(lookups)]
+    
+    start = time.perf_counter()
+    for isbn in isbns:
+        next((book for book in library.books if book.isbn == isbn), None)
+    return (time.perf_counter() - start) / lookups * 1e6
+
+
+def run_lookups(sizes):
+    """Run the lookup and bulk-add benchmark for each catalog size."""
+    print(f"{'records':>10} {'add books':>10} {'add members':>12} "
+          f"{'isbn us':>8} {'member us':>10} {'scan us':>10}")
+    for size in sizes:
+        library, books_time, members_time = bench_bulk_add(size)
+        book_us, member_us = bench_lookups(library, size)
+        scan_us = bench_linear_scan(library, size)
+        print(f"{size:>10} {books_time:>9.2f}s {members_time:>11.2f}s "
+              f"{book_us:>8.3f} {member_us:>10.3f} {scan_us:>10.1f}")
+
+
+def bench_journal(library, size, operations=2_000, seed=42):
+    """
+    Time lend/return pairs persisted through the journal.
+    
+    Args:
+        library (Library): Library populated by bench_bulk_add
+        size (int): Number of books and members in the library
+        operations (int): Number of lend/return pairs to perform
+        seed (int): Random seed for reproducible key selection
+        
+    Returns:
+        float: Microseconds per journaled operation
+    """
+    rng = random.Random(seed)
+    pairs = [(f"M{rng.randrange(size):08d}", make_isbn(rng.randrange(size)))
+             for _ in range(operations)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        storage = library.storage
+        storage.journal = Journal(os.path.join(directory, 'journal.log'))
+        storage.compact_every = 0
+        with quiet():
+            start = time.perf_counter()
+            for member_id, isbn in pairs:
+                library.lend_book(member_id, isbn)
+                library.take_return(member_id, isbn)
+            storage.journal.sync()
+            elapsed = time.perf_counter() - start
+        storage.journal.close()
+        storage.journal = None
+    return elapsed / (2 * operations) * 1e6
+
+
+def run_journal(sizes):
+    """Run the journaled-transaction benchmark for each catalog size."""
+    print(f"{'records':>10} {'us per op':>10}")
+    for size in sizes:
+        library, _, _ = bench_bulk_add(size)
+        print(f"{size:>10} {bench_journal(library, size):>10.1f}")
+
+
+def write_dataset(directory, books, members, seed=42):
+    """
+    Write a generated snapshot with `books` books and `members` members.
+    
+    Every member holds one book, so re-linking loans is part of the load.
+    
+    Args:
+        directory (str): Directory to write books.json and members.json to
+        books (int): Number of books
+        members (int): Number of members (at most `books`)
+        seed (int): Random seed for reproducible borrow counts
+    """
+    rng = random.Random(seed)
+    books_data = {
+        'generation': 1,
+        'journal_seq': 0,
+        'books': [{'title': f"Title {n}", 'author': f"Author {n % 1000}",
+                   'isbn': make_isbn(n), 'available': n >= members}
+                  for n in range(books)],
+        'borrow_history': {make_isbn(n): rng.randrange(50) for n in range(books)}
+    }
+    members_data = {
+        'generation': 1,
+        'members': [{'name': f"Member {n}", 'member_id': f"M{n:08d}",
+                     'borrowed_books': [make_isbn(n)]}
+                    for n in range(members)]
+    }
+    snapshot.write({os.path.join(directory, 'books.json'): books_data,
+                    os.path.join(directory, 'members.json'): members_data})
+
+
+def legacy_load(directory):
+    """Load a snapshot the way load_data did before streaming (json.load)."""
+    with open(os.path.join(directory, 'books.json')) as f:
+        books_data = json.load(f)
+    books = {}
+    for book_data in books_data.get('books', []):
+        book = Book.from_dict(book_data)
+        books[book.isbn] = book
+    borrow_history = books_data.get('borrow_history', {})
+    
+    with open(os.path.join(directory, 'members.json')) as f:
+        members_data = json.load(f)
+    members = {}
+    for member_data in members_data.get('members', []):
+        member = Member.from_dict(member_data)
+        members[member.member_id] = member
+    for member_data in members_data.get('members', []):
+        member = members[member_data['member_id']]
+        for isbn in member_data.get('borrowed_books', []):
+            book = books.get(isbn)
+            if book:
+                member.restore_loan(book)
+    return books, members, borrow_history
+
+
+def load_worker(mode, directory):
+    """
+    Load a dataset in this process and print wall time and peak RSS as JSON.
+    
+    For the Library loaders, the mean time of 1000 lookups of random books
+    straight after the load is reported too.
+    
+    Args:
+        mode (str): 'legacy' for json.load, 'streaming' for load_data,
+            'columns' for load_data from books.col
+        directory (str): Directory holding books.json (or books.col) and members.json
+    """
+    start = time.perf_counter()
+    if mode == 'legacy':
+        legacy_load(directory)
+    else:
+        if mode == 'columns':
+            books_file = os.path.join(directory, 'books.col')
+            library = Library(storage=ColumnarStorage())
+        else:
+            books_file = os.path.join(directory, 'books.json')
+            library = Library()
+        with quiet():
+            library.load_data(books_file, os.path.join(directory, 'members.json'))
+    elapsed = time.perf_counter() - start
+    result = {'seconds': elapsed, 'peak_rss_mb': peak_rss_kb() / 1024}
+    if mode != 'legacy':
+        rng = random.Random(42)
+        isbns = [make_isbn(rng.randrange(len(library.books))) for _ in range(1000)]
+        start = time.perf_counter()
+        for isbn in isbns:
+            library.find_book_by_isbn(isbn)
+        result['lookup_us'] = (time.perf_counter() - start) / len(isbns) * 1e6
+    print(json.dumps(result))
+
+
+def peak_rss_kb():
+    """Return this process's peak resident set size in KiB."""
+    # VmHWM starts afresh at exec, unlike ru_maxrss, which a child
+    # inherits from the parent it was forked from
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def run_load(sizes):
+    """Compare the json.load loader with the streaming loader (members = books / 5)."""
+    print(f"{'books':>10} {'members':>8} {'loader':>10} {'seconds':>8} {'peak RSS':>10}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            write_dataset(directory, size, size // 5)
+            for mode in ('legacy', 'streaming'):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), 'load-worker', mode, directory],
+                    capture_output=True, text=True, check=True).stdout
+                result = json.loads(output)
+                print(f"{size:>10} {size // 5:>8} {mode:>10} {result['seconds']:>8.2f} "
+                      f"{result['peak_rss_mb']:>8.0f}MB")
+
+
+def run_coldstart(sizes):
+    """
+    Compare cold starts from books.json and from a columnar books.col.
+    
+    Each load runs in a fresh process. Members are books / 100, each
+    holding one book, so the books file dominates the load.
+    """
+    print(f"{'books':>10} {'loader':>10} {'seconds':>8} {'peak RSS':>10} {'us/lookup':>10}")
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            write_dataset(directory, size, size // 100)
+            with quiet():
+                convert_to_columns(os.path.join(directory, 'books.json'),
+                                   os.path.join(directory, 'members.json'),
+                                   os.path.join(directory, 'books.col'))
+            for mode in ('streaming', 'columns'):
+                output = subprocess.run(
+                    [sys.executable, os.path.abspath(__file__), 'load-worker', mode, directory],
+                    capture_output=True, text=True, check=True).stdout
+                result = json.loads(output)
+                print(f"{size:>10} {mode:>10} {result['seconds']:>8.2f} "
+                      f"{result['peak_rss_mb']:>8.0f}MB {result['lookup_us']:>10.2f}")
+
+
+class LegacyBook:
+    """Book as it was before __slots__ and interned authors, for comparison."""
+    
+    def __init__(self, title, author, isbn, available=True):
+        """Initialize a dict-backed book."""
+        self.title = title
+        self.author = author
+        self.isbn = isbn
+        self.available = available
+
+
+def bytes_per_book(factory, size):
+    """
+    Measure the memory allocated per book, strings included.
+    
+    Titles, authors and ISBNs are built afresh for every book, as they are
+    when parsed from books.json; 1000 distinct authors are shared.
+    
+    Args:
+        factory (callable): Book class to instantiate
+        size (int): Number of books to create
+        
+    Returns:
+        float: Bytes allocated per book
+    """
+    tracemalloc.start()
+    books = [factory(f"Title {n}", f"Author {n % 1000}", make_isbn(n)) for n in range(size)]
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del books
+    return used / size
+
+
+def run_memory(sizes):
+    """Report bytes per book before and after the compact representation."""
+    print(f"{'books':>10} {'legacy B':>9} {'slotted B':>10} {'bitmap B':>9}")
+    for size in sizes:
+        legacy = bytes_per_book(LegacyBook, size)
+        slotted = bytes_per_book(Book, size)
+        bitmap = AvailabilityBitmap()
+        for _ in range(size):
+            bitmap.append()
+        print(f"{size:>10} {legacy:>9.1f} {slotted:>10.1f} {bitmap.nbytes() / size:>9.3f}")
+
+
+def run_report(sizes, polls=1000, seed=42):
+    """Time the report figures on a catalog with a tenth of the books on loan."""
+    print(f"{'records':>10} {'us per report':>14}")
+    for size in sizes:
+        library, _, _ = bench_bulk_add(size)
+        rng = random.Random(seed)
+        with quiet():
+            for n in range(size // 10):
+                library.lend_book(f"M{n:08d}", make_isbn(rng.randrange(size)))
+        
+        start = time.perf_counter()
+        for _ in range(polls):
+            library.get_borrowed_books_count()
+            library.get_active_members_count()
+            library.get_most_borrowed_book()
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10} {elapsed / polls * 1e6:>14.2f}")
+
+
+def run_batch(sizes, items=5_000, seed=42):
+    """Compare looping over lend_book/take_return with lend_many/return_many."""
+    print(f"{'records':>10} {'api':>8} {'lend/s':>10} {'return/s':>10}")
+    for size in sizes:
+        library, _, _ = bench_bulk_add(size)
+        rng = random.Random(seed)
+        isbns = rng.sample(range(size), min(items, size))
+        pairs = [(f"M{rng.randrange(size):08d}", make_isbn(n)) for n in isbns]
+        
+        with tempfile.TemporaryDirectory() as directory:
+            storage = library.storage
+            storage.journal = Journal(os.path.join(directory, 'journal.log'))
+            storage.compact_every = 0
+            for api in ('loop', 'batch'):
+                with quiet():
+                    start = time.perf_counter()
+                    if api == 'loop':
+                        for member_id, isbn in pairs:
+                            library.lend_book(member_id, isbn)
+                    else:
+                        library.lend_many(pairs)
+                    storage.journal.sync()
+                    lend_time = time.perf_counter() - start
+                    
+                    start = time.perf_counter()
+                    if api == 'loop':
+                        for member_id, isbn in pairs:
+                            library.take_return(member_id, isbn)
+                    else:
+                        library.return_many(pairs)
+                    storage.journal.sync()
+                    return_time = time.perf_counter() - start
+                print(f"{size:>10} {api:>8} {len(pairs) / lend_time:>10.0f} "
+                      f"{len(pairs) / return_time:>10.0f}")
+            storage.journal.close()
+            storage.journal = None
+
+
+def run_copies(sizes, operations=20_000):
+    """
+    Time lending and returning the last free copy of a title with many copies.
+    
+    Every other copy is out on loan first, so finding the free copy is as
+    far from the first copy as it can be.
+    """
+    print(f"{'copies':>10} {'us per lend':>12} {'us per return':>14}")
+    for size in sizes:
+        library = Library(compact_every=0)
+        with quiet():
+            library.add_book("Title", "Author", make_isbn(0), copies=size)
+            for n in range(size):
+                library.register_member(f"Member {n}", f"M{n:08d}")
+            library.lend_many((f"M{n:08d}", make_isbn(0)) for n in range(size - 1))
+        
+        member = library.find_member_by_id(f"M{size - 1:08d}")
+        book = library.find_book_by_isbn(make_isbn(0))
+        lend_time = return_time = 0
+        for _ in range(operations):
+            start = time.perf_counter()
+            library._lend(member, book)
+            middle = time.perf_counter()
+            library._return(member, book)
+            lend_time += middle - start
+            return_time += time.perf_counter() - middle
+        print(f"{size:>10} {lend_time / operations * 1e6:>12.2f} "
+              f"{return_time / operations * 1e6:>14.2f}")
+
+
+def run_holds(sizes, operations=5_000):
+    """
+    Time returns that set the copy aside for the next in a long hold queue.
+    
+    One single-copy title has `size` members queued for it; each cycle the
+    holder returns it and the member it is set aside for collects it.
+    """
+    print(f"{'queued':>10} {'us per return':>14} {'us per pickup':>14} {'us per hold':>12}")
+    for size in sizes:
+        library = Library(compact_every=0)
+        isbn = make_isbn(0)
+        with quiet():
+            library.add_book("Title", "Author", isbn)
+            for n in range(size + 1):
+                library.register_member(f"Member {n}", f"M{n:08d}")
+            library.lend_book(f"M{0:08d}", isbn)
+            start = time.perf_counter()
+            for n in range(1, size + 1):
+                library.place_hold(f"M{n:08d}", isbn)
+            hold_time = time.perf_counter() - start
+            
+            cycles = min(operations, size)
+            return_time = pickup_time = 0
+            for n in range(cycles):
+                start = time.perf_counter()
+                library.take_return(f"M{n:08d}", isbn)
+                middle = time.perf_counter()
+                library.lend_book(f"M{n + 1:08d}", isbn)
+                pickup_time += time.perf_counter() - middle
+                return_time += middle - start
+        print(f"{size:>10} {return_time / cycles * 1e6:>14.2f} "
+              f"{pickup_time / cycles * 1e6:>14.2f} {hold_time / size * 1e6:>12.2f}")
+
+
+def run_dues(sizes, queries=200, seed=42):
+    """
+    Compare the due-date index with scanning every member's loans.
+    
+    Loans are spread over the last 30 days, and the time queried is chosen
+    so that about 1% of them are overdue.
+    """
+    print(f"{'loans':>10} {'overdue':>8} {'index ms':>9} {'scan ms':>9} "
+          f"{'due 24h ms':>11} {'fines ms':>9}")
+    for size in sizes:
+        library, _, _ = bench_bulk_add(size)
+        rng = random.Random(seed)
+        now = time.time()
+        for n in range(size):
+            member = library.find_member_by_id(f"M{n:08d}")
+            book = library.find_book_by_isbn(make_isbn(n))
+            library._lend(member, book, now - rng.uniform(0, 30 * 86400))
+        ordered = sorted(due for due, member_id, isbn in library.dues.between(None, now + 365 * 86400))
+        when = ordered[size // 100]
+        
+        def timed(query, repeat):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = query()
+            return result, (time.perf_counter() - start) / repeat * 1000
+        
+        overdue, index_ms = timed(lambda: library.get_overdue_loans(when), queries)
+        scanned, scan_ms = timed(lambda: [
+            (due, member.member_id, isbn) for member in library.members
+            for isbn, due in ((isbn, loan.due_at) for isbn, loan in member.loans.items())
+            if due < when],
+            max(1, queries // 20))
+        assert sorted(scanned) == overdue
+        _, soon_ms = timed(lambda: library.get_loans_due(24, when), queries)
+        _, fines_ms = timed(lambda: library.compute_fines(when), queries)
+        print(f"{size:>10} {len(overdue):>8} {index_ms:>9.3f} {scan_ms:>9.3f} "
+              f"{soon_ms:>11.3f} {fines_ms:>9.3f}")
+
+
+def run_institution(sizes):
+    """
+    Time lending to and returning from one member holding `size` books.
+    
+    Institutional accounts such as schools hold hundreds of books at once;
+    with loans keyed by ISBN, each return costs the same however many
+    the member holds.
+    """
+    print(f"{'held':>10} {'us per lend':>12} {'us per return':>14} {'us per holders':>15}")
+    for size in sizes:
+        library = Library(compact_every=0)
+        with quiet():
+            for n in range(size):
+                library.add_book(f"Title {n}", f"Author {n % 1000}", make_isbn(n))
+            library.register_member("School", "S0")
+        pairs = [("S0", make_isbn(n)) for n in range(size)]
+        with quiet():
+            start = time.perf_counter()
+            library.lend_many(pairs)
+            lend_time = time.perf_counter() - start
+            
+            start = time.perf_counter()
+            for n in range(size):
+                library.get_holders(make_isbn(n))
+            holders_time = time.perf_counter() - start
+            
+            # Return the newest loan first, the worst case for a list of loans
+            start = time.perf_counter()
+            library.return_many(reversed(pairs))
+            return_time = time.perf_counter() - start
+        print(f"{size:>10} {lend_time / size * 1e6:>12.2f} {return_time / size * 1e6:>14.2f} "
+              f"{holders_time / size * 1e6:>15.2f}")
+
+
+def write_catalog(path, size, seed=42):
+    """
+    Write a CSV catalog of `size` rows with valid ISBN-13s.
+    
+    About 1% of the rows have a bad check digit and another 1% repeat an
+    earlier ISBN, so the import has rejects to report.
+    """
+    rng = random.Random(seed)
+    with open(path, 'w', newline='') as f:
+        f.write("title,author,isbn,copies\n")
+        for n in range(size):
+            body = f"978{n:09d}"
+            check = -sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(body)) % 10
+            roll = rng.random()
+            if roll < 0.01:
+                check = (check + 1) % 10
+            elif roll < 0.02 and n:
+                body = f"978{rng.randrange(n):09d}"
+                check = -sum(int(d) * (3 if i % 2 else 1) for i, d in enumerate(body)) % 10
+            f.write(f'"Title {n}, vol. {n % 7}",Author {n % 1000},{body}{check},{1 + n % 3}\n')
+
+
+def run_import(sizes):
+    """
+    Time importing a CSV catalog row by row and through the importer.
+    
+    The row-by-row baseline reads the file with csv.DictReader and calls
+    add_book for each row, as a script would without the importer. The
+    importer is timed parsing in-process and with a process pool.
+    """
+    workers = os.cpu_count() or 1
+    print(f"{'rows':>10} {'row-by-row/s':>13} {'in-process/s':>13} "
+          f"{f'pool x{max(workers, 2)}/s':>13} {'added':>9} {'rejected':>9}")
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            path = os.path.join(directory, 'catalog.csv')
+            write_catalog(path, size)
+            
+            library = Library(compact_every=0)
+            with quiet():
+                start = time.perf_counter()
+                with open(path, newline='') as f:
+                    for row in csv.DictReader(f):
+                        isbn = importer.normalize_isbn(row['isbn'])
+                        if isbn and not library.find_book_by_isbn(isbn):
+                            library.add_book(row['title'], row['author'], isbn,
+                                             int(row['copies']))
+                baseline = size / (time.perf_counter() - start)
+            
+            rates = []
+            for pool in (0, max(workers, 2)):
+                library = Library(compact_every=0)
+                with quiet():
+                    stats = importer.import_catalog(library, path, workers=pool)
+                rates.append(stats['rows_per_sec'])
+            print(f"{size:>10} {baseline:>13.0f} {rates[0]:>13.0f} {rates[1]:>13.0f} "
+                  f"{stats['added']:>9} {stats['rejected']:>9}")
+
+
+def stress_worker(library, size, operations, seed, tally):
+    """
+    Lend and return random books as fast as possible from one thread.
+    
+    Args:
+        library (Library): Library shared by all workers
+        size (int): Number of books and members in the library
+        operations (int): Number of lend or return attempts
+        seed (int): Random seed for this worker
+        tally (list): Receives this worker's (lends, returns) that succeeded
+    """
+    rng = random.Random(seed)
+    lends = returns = 0
+    for _ in range(operations):
+        member_id = f"M{rng.randrange(size):08d}"
+        isbn = make_isbn(rng.randrange(size))
+        if rng.random() < 0.5:
+            lends += library.lend_book(member_id, isbn)
+        else:
+            returns += library.take_return(member_id, isbn)
+    tally.append((lends, returns))
+
+
+def check_invariants(library, lends, returns):
+    """
+    List the ways a library disagrees with the loans that succeeded.
+    
+    Args:
+        library (Library): Library after a stress run
+        lends (int): Number of successful lends
+        returns (int): Number of successful returns
+        
+    Returns:
+        list: Descriptions of every violated invariant (empty if none)
+    """
+    problems = []
+    holders = {}
+    for member in library.members:
+        for book in member.borrowed_books:
+            if book.isbn in holders:
+                problems.append(f"{book.isbn} lent to both {holders[book.isbn]} "
+                                f"and {member.member_id}")
+            holders[book.isbn] = member.member_id
+    for book in library.books:
+        if book.available == (book.isbn in holders):
+            problems.append(f"{book.isbn} availability disagrees with its holder")
+    if sum(library.borrow_history.values()) != lends:
+        problems.append(f"borrow_history totals {sum(library.borrow_history.values())} "
+                        f"but {lends} lends succeeded")
+    if len(holders) != lends - returns:
+        problems.append(f"{len(holders)} books on loan but {lends - returns} expected")
+    if not library.check_counters():
+        problems.append("report counters disagree with a recount")
+    return problems
+
+
+def run_stress(sizes, threads=8, operations=20_000, seed=42):
+    """Hammer lend_book/take_return from many threads and check the invariants."""
+    print(f"{'records':>10} {'locking':>10} {'ops/s':>10} {'violations':>11}")
+    interval = sys.getswitchinterval()
+    # Switch threads far more often than usual to provoke races
+    sys.setswitchinterval(1e-6)
+    try:
+        for size in sizes:
+            for mode, stripes in (('none', 0), ('global', 1), ('striped', 64)):
+                library = Library(lock_stripes=stripes)
+                with quiet():
+                    for n in range(size):
+                        library.add_book(f"Title {n}", f"Author {n % 1000}", make_isbn(n))
+                        library.register_member(f"Member {n}", f"M{n:08d}")
+                
+                tally = []
+                workers = [threading.Thread(target=stress_worker,
+                                            args=(library, size, operations, seed + n, tally))
+                           for n in range(threads)]
+                with quiet():
+                    start = time.perf_counter()
+                    for worker in workers:
+                        worker.start()
+                    for worker in workers:
+                        worker.join()
+                    elapsed = time.perf_counter() - start
+                    problems = check_invariants(library, sum(t[0] for t in tally),
+                                                sum(t[1] for t in tally))
+                print(f"{size:>10} {mode:>10} {threads * operations / elapsed:>10.0f} "
+                      f"{len(problems):>11}")
+                for problem in problems[:3]:
+                    print(f"{'':>10} {problem}")
+    finally:
+        sys.setswitchinterval(interval)
+
+
+async def load_client(port, requests, depth, members, books, seed, latencies):
+    """
+    Send a mixed workload over one connection, keeping `depth` requests in flight.
+    
+    Four in five requests look a book up; the rest lend or return one.
+    
+    Args:
+        port (int): Server port on localhost
+        requests (int): Number of requests to send
+        depth (int): Maximum requests awaiting a reply (1 = no pipelining)
+        members (int): Number of members in the dataset
+        books (int): Number of books in the dataset
+        seed (int): Random seed for this client
+        latencies (list): Receives each request's round-trip time in seconds
+    """
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    window = asyncio.Semaphore(depth)
+    sent_at = collections.deque()
+    
+    async def receive():
+        for _ in range(requests):
+            await reader.readline()
+            latencies.append(time.perf_counter() - sent_at.popleft())
+            window.release()
+    
+    receiver = asyncio.create_task(receive())
+    for _ in range(requests):
+        roll = rng.random()
+        request = {'isbn': make_isbn(rng.randrange(books))}
+        if roll < 0.8:
+            request['op'] = 'book'
+        else:
+            request['op'] = 'lend' if roll < 0.9 else 'return'
+            request['member_id'] = f"M{rng.randrange(members):08d}"
+        await window.acquire()
+        sent_at.append(time.perf_counter())
+        writer.write(json.dumps(request).encode('utf-8') + b'\n')
+        await writer.drain()
+    await receiver
+    writer.close()
+
+
+async def generate_load(port, clients, requests, depth, members, books, seed):
+    """Run many load clients at once; returns (seconds, latencies)."""
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(load_client(port, requests, depth, members, books, seed + n, latencies)
+                           for n in range(clients)))
+    return time.perf_counter() - start, latencies
+
+
+def run_server(sizes, clients=32, requests=1_000, seed=42):
+    """Measure requests/sec and latency against a localhost server process."""
+    print(f"{'books':>10} {'clients':>8} {'depth':>6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    server_script = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server.py')
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            write_dataset(directory, size, size // 5)
+            server = subprocess.Popen([sys.executable, server_script, '--port', '0'],
+                                      cwd=directory, stdout=subprocess.PIPE, text=True)
+            try:
+                port = None
+                for line in server.stdout:
+                    if 'Listening on' in line:
+                        port = int(line.rsplit(':', 1)[1])
+                        break
+                if port is None:
+                    raise RuntimeError("server did not start")
+                
+                for depth in (1, 16):
+                    elapsed, latencies = asyncio.run(generate_load(
+                        port, clients, requests, depth, size // 5, size, seed))
+                    latencies.sort()
+                    print(f"{size:>10} {clients:>8} {depth:>6} {len(latencies) / elapsed:>8.0f} "
+                          f"{latencies[len(latencies) // 2] * 1000:>8.2f} "
+                          f"{latencies[int(len(latencies) * 0.99)] * 1000:>8.2f}")
+            finally:
+                server.send_signal(signal.SIGINT)
+                server.communicate(timeout=600)
+
+
+def make_words(count, seed=42):
+    """
+    Build a vocabulary of distinct pronounceable words.
+    
+    Args:
+        count (int): Number of words
+        seed (int): Random seed for reproducible words
+        
+    Returns:
+        list: Lowercase words of 4 to 9 letters
+    """
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choice('bcdfghklmnprstvz') + rng.choice('aeiou')
+                          for _ in range(rng.randint(2, 4)))[:rng.randint(4, 9)])
+    return sorted(words)
+
+
+def run_search(sizes, queries=2000, seed=42):
+    """Time index rebuilds and searches over generated titles and authors."""
+    print(f"{'books':>10} {'rebuild s':>10} {'mean ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    words = make_words(50_000, seed)
+    surnames = make_words(5_000, seed + 1)
+    cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    for size in sizes:
+        rng = random.Random(seed)
+        # Title words follow Zipf's law, so common words have long postings
+        library = Library()
+        with quiet():
+            for n in range(size):
+                title = ' '.join(rng.choices(words, cum_weights=cum_weights,
+                                             k=rng.randint(2, 6)))
+                library.add_book(title.title(), f"{rng.choice(surnames).title()} {n % 97}",
+                                 make_isbn(n))
+        
+        start = time.perf_counter()
+        index = SearchIndex()
+        index.add_many(library.books)
+        index.search('warm up')
+        rebuild = time.perf_counter() - start
+        
+        # One or two words from real titles, the last one possibly cut short
+        books = list(library.books)
+        timings = []
+        for _ in range(queries):
+            text = rng.choice(books).title.split()
+            picked = rng.sample(text, min(len(text), rng.randint(1, 2)))
+            picked[-1] = picked[-1][:rng.randint(3, len(picked[-1]))]
+            start = time.perf_counter()
+            index.search(' '.join(picked))
+            timings.append((time.perf_counter() - start) * 1000)
+        timings.sort()
+        print(f"{size:>10} {rebuild:>10.2f} {sum(timings) / queries:>8.3f} "
+              f"{timings[int(queries * 0.99)]:>8.3f} {timings[-1]:>8.3f}")
+
+
+def run_events(sizes, operations=50_000, seed=42):
+    """
+    Time lend/return pairs and lookups with the console sink, with no sinks,
+    and with no sinks but lookup timing turned on.
+    
+    The console sink writes to os.devnull, so the figures show the cost of
+    building and formatting the messages rather than of a terminal.
+    """
+    print(f"{'records':>10} {'sinks':>8} {'us/lend+return':>15} {'us/lookup':>10} "
+          f"{'lend p99 us':>12}")
+    for size in sizes:
+        library, _, _ = bench_bulk_add(size)
+        library.storage.compact_every = 0
+        rng = random.Random(seed)
+        pairs = [(f"M{rng.randrange(size):08d}", make_isbn(rng.randrange(size)))
+                 for _ in range(operations)]
+        isbns = [isbn for _, isbn in pairs]
+        for sinks in ('console', 'none', 'lookups'):
+            library.events = Events(sinks=None if sinks == 'console' else [],
+                                    time_lookups=sinks == 'lookups')
+            with quiet():
+                start = time.perf_counter()
+                for member_id, isbn in pairs:
+                    library.lend_book(member_id, isbn)
+                    library.take_return(member_id, isbn)
+                lend_time = time.perf_counter() - start
+                
+                start = time.perf_counter()
+                for isbn in isbns:
+                    library.find_book_by_isbn(isbn)
+                lookup_time = time.perf_counter() - start
+            p99 = library.events.histograms['lend'].percentile(0.99) * 1e6
+            print(f"{size:>10} {sinks:>8} {lend_time / operations * 1e6:>15.2f} "
+                  f"{lookup_time / operations * 1e6:>10.3f} {p99:>12.0f}")
+
+
+def run_shards(sizes, batch=1_000, singles=2_000, reports=20, queries=200, seed=42):
+    """
+    Compare one in-process Library with ShardedLibrary at several worker counts.
+    
+    Batched lends and returns, reports and searches are where the shards
+    work in parallel; single lends and returns show the cost of the
+    round trips to the workers. Worker counts beyond the machine's cores
+    cannot run faster, so this is worth running on a multi-core machine.
+    """
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cores})
+    print(f"{'books':>10} {'workers':>8} {'batch op/s':>11} {'single us':>10} "
+          f"{'report ms':>10} {'search/s':>9}")
+    for size in sizes:
+        catalog = generate_catalog(size, seed)
+        members = generate_members(max(size // 10, 1))
+        traffic = generate_operations(catalog, members, batch * 10, seed)
+        pairs = list(dict.fromkeys((member_id, isbn) for op, member_id, isbn in traffic
+                                   if op == 'lend'))
+        chunks = [pairs[n:n + batch] for n in range(0, len(pairs), batch)]
+        words = [f"title {n}" for n in random.Random(seed).sample(range(size), queries)]
+        
+        for workers in [0] + counts:
+            with tempfile.TemporaryDirectory() as directory:
+                if workers:
+                    library = ShardedLibrary(workers, directory, events=Events(sinks=[]),
+                                             compact_every=0)
+                else:
+                    library = Library(compact_every=0, events=Events(sinks=[]))
+                try:
+                    library.add_books(catalog)
+                    for name, member_id in members:
+                        library.register_member(name, member_id)
+                    library.search_books(words[0])  # leave building the index out
+                    
+                    start = time.perf_counter()
+                    for chunk in chunks:
+                        library.lend_many(chunk)
+                    for chunk in chunks:
+                        library.return_many(chunk)
+                    batch_rate = 2 * len(pairs) / (time.perf_counter() - start)
+                    
+                    start = time.perf_counter()
+                    for member_id, isbn in pairs[:singles // 2]:
+                        library.lend_book(member_id, isbn)
+                        library.take_return(member_id, isbn)
+                    single_us = (time.perf_counter() - start) / singles * 1e6
+                    
+                    start = time.perf_counter()
+                    with quiet():
+                        for _ in range(reports):
+                            library.display_report()
+                    report_ms = (time.perf_counter() - start) / reports * 1000
+                    
+                    start = time.perf_counter()
+                    for query in words:
+                        library.search_books(query)
+                    search_rate = queries / (time.perf_counter() - start)
+                finally:
+                    if workers:
+                        library.close()
+            label = workers or 'single'
+            print(f"{size:>10} {label:>8} {batch_rate:>11.0f} {single_us:>10.1f} "
+                  f"{report_ms:>10.2f} {search_rate:>9.0f}")
+
+
+def run_versions(sizes, operations=50_000, opens=1_000, seed=42):
+    """
+    Measure what snapshots cost writers, and what they save them.
+    
+    Lends and returns are replayed with no snapshot open and with one
+    held open throughout, which makes each record's first change copy it.
+    Then a writer thread lends and returns while the catalog and members
+    are listed, once holding every lock as a consistent listing had to
+    and once from a snapshot; the writes done meanwhile show how long
+    circulation was held up.
+    """
+    print(f"{'records':>10} {'open us':>8} {'op/s no snap':>13} {'op/s snap':>10} "
+          f"{'locked ms':>10} {'writes':>7} {'snap ms':>8} {'writes':>7}")
+    for size in sizes:
+        catalog = generate_catalog(size, seed)
+        members = generate_members(max(size // 10, 1))
+        traffic = generate_operations(catalog, members, operations, seed)
+        rates = []
+        for held in (False, True):
+            library = Library(compact_every=0, lock_stripes=16, events=Events(sinks=[]))
+            library.add_books(catalog)
+            for name, member_id in members:
+                library.register_member(name, member_id)
+            snap = library.snapshot() if held else None
+            start = time.perf_counter()
+            for op, member_id, isbn in traffic:
+                if op == 'lend':
+                    library.lend_book(member_id, isbn)
+                else:
+                    library.take_return(member_id, isbn)
+            rates.append(operations / (time.perf_counter() - start))
+            if snap is not None:
+                snap.close()
+        
+        start = time.perf_counter()
+        for _ in range(opens):
+            library.snapshot().close()
+        open_us = (time.perf_counter() - start) / opens * 1e6
+        
+        def listing(view):
+            return sum(1 for book in view.books) + sum(1 for member in view.members)
+        
+        writes = []
+        list_ms = []
+        for mode in ('locked', 'snapshot'):
+            stop = threading.Event()
+            done = [0]
+            
+            def writer():
+                for op, member_id, isbn in itertools.cycle(traffic):
+                    if stop.is_set():
+                        return
+                    if op == 'lend':
+                        library.lend_book(member_id, isbn)
+                    else:
+                        library.take_return(member_id, isbn)
+                    done[0] += 1
+            
+            thread = threading.Thread(target=writer)
+            thread.start()
+            time.sleep(0.05)
+            before = done[0]
+            start = time.perf_counter()
+            if mode == 'locked':
+                with library._locked():
+                    listing(library)
+            else:
+                with library.snapshot() as view:
+                    listing(view)
+            list_ms.append((time.perf_counter() - start) * 1000)
+            writes.append(done[0] - before)
+            stop.set()
+            thread.join()
+        print(f"{size:>10} {open_us:>8.1f} {rates[0]:>13.0f} {rates[1]:>10.0f} "
+              f"{list_ms[0]:>10.1f} {writes[0]:>7} {list_ms[1]:>8.1f} {writes[1]:>7}")
+
+
+def run_views(sizes, requests=100_000, capacity=10_000, repeats=3, seed=42):
+    """
+    Time rendered book and member views with and without the view cache.
+    
+    Requests follow Zipf's law, as terminals asking for the popular
+    titles do. Lends and returns of the same titles, which invalidate
+    the views they touch, are timed on their own. Each figure is the
+    best of a few runs, since a shared machine adds a lot of noise.
+    """
+    print(f"{'records':>10} {'cache':>6} {'us/book dict':>13} {'us/book text':>13} "
+          f"{'us/member':>10} {'us/lend|ret':>12} {'hit rate':>9}")
+    for size in sizes:
+        catalog = generate_catalog(size, seed)
+        members = generate_members(max(size // 10, 1))
+        rng = random.Random(seed)
+        ranked = [isbn for _, _, isbn, _ in catalog]
+        rng.shuffle(ranked)
+        isbns = rng.choices(ranked, cum_weights=zipf_cum_weights(size, 0.8), k=requests)
+        member_ids = rng.choices([member_id for _, member_id in members],
+                                 cum_weights=zipf_cum_weights(len(members), 0.8), k=requests)
+        writes = list(zip(member_ids[:requests // 10], isbns))
+        for cache in (0, capacity):
+            library = Library(compact_every=0, events=Events(sinks=[]), view_cache=cache)
+            library.add_books(catalog)
+            for name, member_id in members:
+                library.register_member(name, member_id)
+            
+            def best(run, count):
+                timings = []
+                for _ in range(repeats):
+                    start = time.perf_counter()
+                    run()
+                    timings.append(time.perf_counter() - start)
+                return min(timings) / count * 1e6
+            
+            def write():
+                for member_id, isbn in writes:
+                    if library.lend_book(member_id, isbn) is None:
+                        library.take_return(member_id, isbn)
+            
+            book_dict = best(lambda: [library.describe_book(isbn, 'dict') for isbn in isbns],
+                             requests)
+            book_text = best(lambda: [library.describe_book(isbn) for isbn in isbns], requests)
+            member = best(lambda: [library.describe_member(member_id, 'dict')
+                                   for member_id in member_ids], requests)
+            write_us = best(write, len(writes))
+            hit_rate = library.views.stats()['hit_rate'] if cache else 0.0
+            print(f"{size:>10} {cache:>6} {book_dict:>13.2f} {book_text:>13.2f} "
+                  f"{member:>10.2f} {write_us:>12.2f} {hit_rate:>9.1%}")
+
+
+def run_pages(sizes, page=20, seed=42):
+    """
+    Compare rendering the whole catalog with fetching one page of it.
+    
+    Pages are fetched from the start, from 90% of the way in (by
+    cursor), of available books only, of one author's books and of
+    the members holding loans, with the availability bitmap on and
+    one member in ten holding a loan.
+    """
+    print(f"{'records':>10} {'render all ms':>14} {'first us':>9} {'deep us':>8} "
+          f"{'avail us':>9} {'author us':>10} {'borrowers us':>13}")
+    for size in sizes:
+        catalog = generate_catalog(size, seed)
+        members = generate_members(max(size // 10, 1))
+        library = Library(compact_every=0, availability_bitmap=True, events=Events(sinks=[]))
+        library.add_books(catalog)
+        for name, member_id in members:
+            library.register_member(name, member_id)
+        rng = random.Random(seed)
+        for name, member_id in rng.sample(members, len(members) // 10):
+            library.lend_book(member_id, rng.choice(catalog)[2])
+        author = 'Author 0'  # the most prolific
+        
+        def timed(fetch, repeats=20):
+            start = time.perf_counter()
+            for _ in range(repeats):
+                rows = [str(row) for row in fetch()]
+            return (time.perf_counter() - start) / repeats * 1e6
+        
+        start = time.perf_counter()
+        rendered = [str(book) for book in library.books]
+        render_ms = (time.perf_counter() - start) * 1000
+        del rendered
+        
+        def borrowers():
+            return library.iter_members(with_loans=True, start_after=len(members) // 2,
+                                        limit=page)
+        
+        deep = int(size * 0.9)
+        figures = [timed(lambda: library.iter_books(limit=page)),
+                   timed(lambda: library.iter_books(start_after=deep, limit=page)),
+                   timed(lambda: library.iter_books(True, start_after=deep, limit=page)),
+                   timed(lambda: library.iter_books(author=author, start_after=deep, limit=page)),
+                   timed(borrowers)]
+        print(f"{size:>10} {render_ms:>14.1f} " + " ".join(
+            f"{figure:>{width}.1f}" for figure, width in zip(figures, (9, 8, 9, 10, 13))))
+
+
+def run_history(sizes, queries=1000, seed=42):
+    """
+    Time the loan history: appends, per-member and per-book queries, and disk use.
+    
+    The generated lend and return traffic is spread evenly over two years,
+    so the history seals a segment about every 30 days. A member's
+    events of the last year are fetched through the indexes and, for
+    comparison, by scanning every event in memory. Disk use is set
+    against the same events as journal lines.
+    """
+    print(f"{'events':>10} {'us/append':>10} {'bytes/event':>12} {'journal b/e':>12} "
+          f"{'segments':>9} {'member yr us':>13} {'scan ms':>8} {'last lend us':>13}")
+    span = 730 * 86400
+    for size in sizes:
+        catalog = generate_catalog(max(size // 10, 1), seed)
+        members = generate_members(max(size // 100, 1))
+        operations = generate_operations(catalog, members, size, seed)
+        start_time = 1_700_000_000.0
+        step = span / size
+        rng = random.Random(seed)
+        with tempfile.TemporaryDirectory() as directory:
+            history = LoanHistory(os.path.join(directory, 'history'))
+            start = time.perf_counter()
+            for n, (op, member_id, isbn) in enumerate(operations):
+                history.append(op, member_id, isbn, start_time + n * step, 0)
+            append_us = (time.perf_counter() - start) / size * 1e6
+            disk = history.disk_bytes() / size
+            journal = sum(len(json.dumps({'seq': n, 'ts': start_time + n * step, 'op': op,
+                                          'member_id': member_id, 'isbn': isbn, 'copy': 0}))
+                          + 1 for n, (op, member_id, isbn) in enumerate(operations[:10_000]))
+            journal /= min(size, 10_000)
+            
+            year_ago = start_time + span - 365 * 86400
+            member_ids = [rng.choice(members)[1] for _ in range(queries)]
+            start = time.perf_counter()
+            for member_id in member_ids:
+                history.query(member_id, since=year_ago)
+            member_us = (time.perf_counter() - start) / queries * 1e6
+            
+            events = [(start_time + n * step, op, member_id, isbn)
+                      for n, (op, member_id, isbn) in enumerate(operations)]
+            start = time.perf_counter()
+            for member_id in member_ids[:10]:
+                [event for event in events if event[2] == member_id and event[0] >= year_ago]
+            scan_ms = (time.perf_counter() - start) / 10 * 1000
+            
+            isbns = [rng.choice(catalog)[2] for _ in range(queries)]
+            start = time.perf_counter()
+            for isbn in isbns:
+                history.last_borrower(isbn)
+            last_us = (time.perf_counter() - start) / queries * 1e6
+            segments = len(history.segments)
+            history.close()
+        print(f"{size:>10} {append_us:>10.2f} {disk:>12.1f} {journal:>12.1f} {segments:>9} "
+              f"{member_us:>13.1f} {scan_ms:>8.1f} {last_us:>13.1f}")
+
+
+def summarize(latencies):
+    """
+    Summarize per-call latencies for the suite's JSON results.
+    
+    Args:
+        latencies (list): Seconds taken by each call
+        
+    Returns:
+        dict: operations, total seconds, operations per second, and the
+        mean, p50, p99 and max latency in microseconds
+    """
+    latencies = sorted(latencies)
+    count = len(latencies)
+    total = sum(latencies)
+    return {
+        'operations': count,
+        'seconds': total,
+        'ops_per_sec': count / total if total else 0.0,
+        'mean_us': total / count * 1e6,
+        'p50_us': latencies[count // 2] * 1e6,
+        'p99_us': latencies[min(int(count * 0.99), count - 1)] * 1e6,
+        'max_us': latencies[-1] * 1e6,
+    }
+
+
+def git_revision():
+    """Return the short git revision of the working tree, or None outside git."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def suite_size(size, operations, seed, reports=200, saves=3):
+    """
+    Run the suite's scenarios against one generated catalog.
+    
+    Each call is timed on its own, so the results carry percentiles as
+    well as throughput. The Library reports nothing while it is timed.
+    
+    Args:
+        size (int): Number of books; there is one member per ten books
+        operations (int): Number of lend and return operations to replay
+        seed (int): Seed of the catalog and the traffic
+        reports (int): Number of display_report calls to time
+        saves (int): Number of save_data and load_data calls to time
+        
+    Returns:
+        dict: Scenario name -> summarize() result
+    """
+    catalog = generate_catalog(size, seed)
+    members = generate_members(max(size // 10, 1))
+    traffic = generate_operations(catalog, members, operations, seed)
+    library = Library(compact_every=0, events=Events(sinks=[]))
+    clock = time.perf_counter
+    results = {}
+    
+    latencies = []
+    for title, author, isbn, copies in catalog:
+        start = clock()
+        library.add_book(title, author, isbn, copies)
+        latencies.append(clock() - start)
+    results['add_book'] = summarize(latencies)
+    for name, member_id in members:
+        library.register_member(name, member_id)
+    
+    timings = {'lend': [], 'return': []}
+    lend, take_return = library.lend_book, library.take_return
+    for op, member_id, isbn in traffic:
+        start = clock()
+        if op == 'lend':
+            lend(member_id, isbn)
+        else:
+            take_return(member_id, isbn)
+        timings[op].append(clock() - start)
+    results['lend_book'] = summarize(timings['lend'])
+    results['take_return'] = summarize(timings['return'])
+    
+    latencies = []
+    with quiet():
+        for _ in range(reports):
+            start = clock()
+            library.display_report()
+            latencies.append(clock() - start)
+    results['display_report'] = summarize(latencies)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        books_file = os.path.join(directory, 'books.json')
+        members_file = os.path.join(directory, 'members.json')
+        latencies = []
+        for _ in range(saves):
+            start = clock()
+            library.save_data(books_file, members_file)
+            latencies.append(clock() - start)
+        results['save_data'] = summarize(latencies)
+        
+        latencies = []
+        for _ in range(saves):
+            loaded = Library(compact_every=0, events=Events(sinks=[]))
+            start = clock()
+            loaded.load_data(books_file, members_file)
+            latencies.append(clock() - start)
+        results['load_data'] = summarize(latencies)
+    return results
+
+
+def run_suite(sizes, operations=100_000, seed=42):
+    """
+    Run the regression suite and print its results as one JSON document.
+    
+    The catalog and the Zipf-distributed lend/return traffic come from the
+    seeded workload generator, so two versions of the library run exactly
+    the same operations. Save the output of each version and compare them
+    with `python benchmark.py compare old.json new.json`.
+    """
+    results = {str(size): suite_size(size, operations, seed) for size in sizes}
+    print(json.dumps({
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'seed': seed,
+        'operations': operations,
+        'results': results,
+    }, indent=2))
+
+
+def compare(old_path, new_path, threshold=0.1):
+    """
+    Compare two suite results and flag regressions.
+    
+    Args:
+        old_path (str): JSON output of the earlier run
+        new_path (str): JSON output of the later run
+        threshold (float): Relative slowdown in mean or p99 latency flagged
+            as a regression
+            
+    Returns:
+        int: Number of regressions found
+    """
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+    
+    print(f"{old.get('revision')} -> {new.get('revision')}")
+    print(f"{'records':>10} {'scenario':>15} {'old mean us':>12} {'new mean us':>12} "
+          f"{'change':>8} {'p99 change':>11}")
+    regressions = 0
+    for size, scenarios in new['results'].items():
+        for scenario, figures in scenarios.items():
+            before = old['results'].get(size, {}).get(scenario)
+            if before is None:
+                continue
+            change = figures['mean_us'] / before['mean_us'] - 1
+            p99_change = figures['p99_us'] / before['p99_us'] - 1
+            flag = ''
+            if change > threshold or p99_change > threshold:
+                flag = '  REGRESSION'
+                regressions += 1
+            print(f"{size:>10} {scenario:>15} {before['mean_us']:>12.2f} "
+                  f"{figures['mean_us']:>12.2f} {change:>+8.1%} {p99_change:>+11.1%}{flag}")
+    return regressions
+
+
+SCENARIOS = {
+    'lookups': run_lookups,
+    'journal': run_journal,
+    'load': run_load,
+    'coldstart': run_coldstart,
+    'memory': run_memory,
+    'report': run_report,
+    'search': run_search,
+    'batch': run_batch,
+    'copies': run_copies,
+    'holds': run_holds,
+    'dues': run_dues,
+    'institution': run_institution,
+    'import': run_import,
+    'stress': run_stress,
+    'server': run_server,
+    'events': run_events,
+    'suite': run_suite,
+    'shards': run_shards,
+    'versions': run_versions,
+    'views': run_views,
+    'pages': run_pages,
+    'history': run_history,
+}
+
+# Scenarios that need a different default catalog size; small catalogs
+# make threads collide on the same books more often
+SCENARIO_SIZES = {
+    'coldstart': [100_000, 1_000_000],
+    'copies': [1, 10, 1000, 100_000],
+    'holds': [10, 1000, 100_000],
+    'institution': [100, 1000, 10_000, 100_000],
+    'import': [10_000, 100_000, 1_000_000],
+    'stress': [100, 10_000],
+    'server': [10_000, 100_000],
+    'suite': [10_000, 100_000],
+    'shards': [100_000],
+    'versions': [10_000, 100_000],
+    'views': [10_000, 100_000],
+    'pages': [100_000, 1_000_000],
+    'history': [100_000, 1_000_000],
+}
+
+
+def main():
+    """
+    Benchmark entry point.
+    
+    Usage: python benchmark.py [scenario] [size ...]
+           python benchmark.py compare old.json new.json [threshold]
+    """
+    args = sys.argv[1:]
+    if args[:1] == ['load-worker']:
+        load_worker(*args[1:3])
+        return
+    if args[:1] == ['compare']:
+        if len(args) not in (3, 4):
+            print("Usage: python benchmark.py compare old.json new.json [threshold]")
+            sys.exit(2)
+        threshold = float(args[3]) if len(args) == 4 else 0.1
+        sys.exit(1 if compare(args[1], args[2], threshold) else 0)
+    scenario = args.pop(0) if args and args[0] in SCENARIOS else 'lookups'
+    sizes = [int(arg) for arg in args] or SCENARIO_SIZES.get(scenario, DEFAULT_SIZES)
+    SCENARIOS[scenario](sizes)
+
+
+if __name__ == "__main__":
+    main()
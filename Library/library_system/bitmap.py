@@ -0,0 +1,98 @@
+"""
+Library Inventory System - Bitmap Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Compact availability bitmap keyed by book slot
+"""
+
+
+class AvailabilityBitmap:
+    """
+    One bit per book slot recording whether that book is available.
+    
+    Slots are handed out in insertion order and never reused, so a slot
+    number is also a stable position in the catalog. A removed book simply
+    leaves a cleared bit behind.
+    
+    Attributes:
+        size (int): Number of slots handed out
+        count (int): Number of set (available) bits
+    """
+    
+    def __init__(self):
+        """Initialize an empty bitmap."""
+        self._bits = bytearray()
+        self.size = 0
+        self.count = 0
+    
+    def append(self, available=True):
+        """
+        Allocate the next slot.
+        
+        Args:
+            available (bool): Initial value of the new slot's bit
+            
+        Returns:
+            int: The new slot number
+        """
+        slot = self.size
+        if slot >> 3 >= len(self._bits):
+            self._bits.append(0)
+        self.size += 1
+        if available:
+            self.set(slot, True)
+        return slot
+    
+    def get(self, slot):
+        """
+        Read one slot's bit.
+        
+        Args:
+            slot (int): Slot number
+            
+        Returns:
+            bool: True if the book in that slot is available
+        """
+        return bool(self._bits[slot >> 3] & (1 << (slot & 7)))
+    
+    def set(self, slot, available):
+        """
+        Write one slot's bit, keeping the set-bit count up to date.
+        
+        Args:
+            slot (int): Slot number
+            available (bool): New value of the bit
+        """
+        mask = 1 << (slot & 7)
+        byte = self._bits[slot >> 3]
+        if available and not byte & mask:
+            self._bits[slot >> 3] = byte | mask
+            self.count += 1
+        elif not available and byte & mask:
+            self._bits[slot >> 3] = byte & ~mask
+            self.count -= 1
+    
+    def iter_set(self, start=0):
+        """
+        Yield the set slots from `start` onward, skipping empty bytes.
+        
+        Args:
+            start (int): First slot to consider
+            
+        Yields:
+            int: Slot numbers whose bit is set, in increasing order
+        """
+        bits = self._bits
+        for index in range(start >> 3, len(bits)):
+            byte = bits[index]
+            if not byte:
+                continue
+            base = index << 3
+            for offset in range(8):
+                if byte & (1 << offset) and base + offset >= start:
+                    yield base + offset
+    
+    def nbytes(self):
+        """Return the number of bytes used to store the bits."""
+        return len(self._bits)
@@ -3,25 +3,39 @@ Library Inventory System - Book Module
 Author: Student Name
 Date: November 21, 2025
 Assignment: Programming for Problem Solving Using Python - Assignment 3
-Description: Book class to represent library books with borrow/return functionality
+Description: Book class to represent library titles and their copies
 """
 
+import sys
+
 
 class Book:
     """
-    Represents a book in the library inventory.
+    Represents a title in the library inventory and the copies held of it.
+    
+    Copies are numbered from 0. Their status is kept as a bitmask with one
+    bit per copy, set while that copy is on the shelf, so the next free copy
+    is found with a couple of integer operations whatever the copy count.
     
     Attributes:
         title (str): The title of the book
         author (str): The author of the book
         isbn (str): The ISBN number of the book
-        available (bool): The availability status of the book (default: True)
+        copies (int): Number of copies held
+        free (int): Bitmask of the copies on the shelf
+        available (bool): True if at least one copy is on the shelf (read-only)
+        slot (int): Position assigned by the Library, in insertion order (-1 if none)
+        
+    Books use __slots__ and interned author strings, since a large catalog
+    holds millions of them and most share a few thousand authors.
     """
     
+    __slots__ = ('title', 'author', 'isbn', 'copies', 'free', 'slot')
+    
     # Class variable to track total books created
     total_books = 0
     
-    def __init__(self, title, author, isbn, available=True):
+    def __init__(self, title, author, isbn, available=True, copies=1):
         """
         Initialize a Book object.
         
@@ -29,39 +43,108 @@ class Book:
             title (str): The title of the book
             author (str): The author of the book
             isbn (str): The ISBN number of the book
-            available (bool): The availability status (default: True)
+            available (bool): Whether the copies start on the shelf (default: True)
+            copies (int): Number of copies held (default: 1)
         """
+        free = (1 << copies) - 1 if available else 0
+        self._set_fields(title, author, isbn, copies, free)
+        Book.total_books += 1
+    
+    def _set_fields(self, title, author, isbn, copies, free):
+        """Assign the instance attributes shared by __init__ and from_dict."""
         self.title = title
-        self.author = author
+        self.author = sys.intern(author)
         self.isbn = isbn
-        self.available = available
-        Book.total_books += 1
+        self.copies = copies
+        self.free = free
+        self.slot = -1
+    
+    @property
+    def available(self):
+        """True if at least one copy is on the shelf."""
+        return self.free != 0
+    
+    @property
+    def available_copies(self):
+        """Number of copies on the shelf."""
+        return bin(self.free).count('1')
     
     def borrow(self):
         """
-        Mark the book as borrowed (not available).
+        Borrow a copy of the book.
         
         Returns:
-            bool: True if book was successfully borrowed, False if already borrowed
+            bool: True if a copy was available and is now taken, False otherwise
         """
-        if self.available:
-            self.available = False
-            return True
-        else:
+        return self.borrow_copy() is not None
+    
+    def borrow_copy(self):
+        """
+        Take the lowest-numbered copy on the shelf.
+        
+        Returns:
+            int: The copy number taken, or None if every copy is out
+        """
+        free = self.free
+        if not free:
+            return None
+        lowest = free & -free
+        self.free = free ^ lowest
+        return lowest.bit_length() - 1
+    
+    def take(self, copy):
+        """
+        Take a particular copy, e.g. when restoring a saved loan.
+        
+        Args:
+            copy (int): Copy number
+            
+        Returns:
+            bool: True if the copy was on the shelf and is now taken
+        """
+        bit = 1 << copy
+        if not self.free & bit:
             return False
+        self.free ^= bit
+        return True
     
-    def return_book(self):
+    def return_book(self, copy=0):
         """
-        Mark the book as returned (available).
+        Put a copy back on the shelf.
         
+        Args:
+            copy (int): Copy number being returned (default: 0)
+            
         Returns:
-            bool: True if book was successfully returned, False if already available
+            bool: True if the copy was out and is now back, False otherwise
         """
-        if not self.available:
-            self.available = True
-            return True
-        else:
+        bit = 1 << copy
+        if copy >= self.copies or self.free & bit:
             return False
+        self.free |= bit
+        return True
+    
+    def add_copies(self, count):
+        """
+        Add new copies, all on the shelf.
+        
+        Args:
+            count (int): Number of copies to add
+        """
+        self.free |= ((1 << count) - 1) << self.copies
+        self.copies += count
+    
+    def copy(self):
+        """
+        Copy the book as it is now, e.g. for a snapshot of the library.
+        
+        Returns:
+            Book: A new Book with the same fields and slot
+        """
+        book = Book.__new__(Book)
+        book._set_fields(self.title, self.author, self.isbn, self.copies, self.free)
+        book.slot = self.slot
+        return book
     
     def to_dict(self):
         """
@@ -74,7 +157,9 @@ class Book:
             'title': self.title,
             'author': self.author,
             'isbn': self.isbn,
-            'available': self.available
+            'available': self.available,
+            'copies': self.copies,
+            'free': self.free
         }
     
     @classmethod
@@ -82,24 +167,38 @@ class Book:
         """
         Create a Book object from dictionary.
         
+        Restoring a saved book does not count towards total_books, so
+        reloading the library does not inflate it. Books saved before
+        copies were tracked are restored as a single copy.
+        
         Args:
             data (dict): Dictionary containing book data
             
         Returns:
             Book: A new Book object
         """
-        return cls(
+        copies = data.get('copies', 1)
+        free = data.get('free')
+        if free is None:
+            free = (1 << copies) - 1 if data['available'] else 0
+        book = cls.__new__(cls)
+        book._set_fields(
             title=data['title'],
             author=data['author'],
             isbn=data['isbn'],
-            available=data['available']
+            copies=copies,
+            free=free
         )
+        return book
     
     def __str__(self):
         """String representation of the book."""
-        status = "Available" if self.available else "Borrowed"
+        if self.copies == 1:
+            status = "Available" if self.available else "Borrowed"
+        else:
+            status = f"{self.available_copies} of {self.copies} copies available"
         return f"'{self.title}' by {self.author} (ISBN: {self.isbn}) - {status}"
     
     def __repr__(self):
         """Developer-friendly representation of the book."""
-        return f"Book(title='{self.title}', author='{self.author}', isbn='{self.isbn}', available={self.available})"
\ No newline at end of file
+        return f"Book(title='{self.title}', author='{self.author}', isbn='{self.isbn}', copies={self.copies}, available={self.available_copies})"
\ No newline at end of file
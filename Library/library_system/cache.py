@@ -0,0 +1,145 @@
+"""
+Library Inventory System - Cache Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Bounded LRU cache with expiry, used for rendered book and member views
+"""
+
+import collections
+import threading
+import time
+
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry and expires old ones.
+    
+    Entries are invalidated explicitly when what they were built from
+    changes; the time to live only bounds how long an entry may outlive
+    a change made some other way. The cache may be shared by threads:
+    changes take one short lock, while lookups rely on each dict
+    operation being atomic, and their statistics may miss the odd count.
+    
+    Attributes:
+        capacity (int): Most entries kept
+        ttl (float): Seconds an entry stays valid (None = until invalidated)
+        hits (int): Lookups answered from the cache
+        misses (int): Lookups not found, or found expired
+        evictions (int): Entries dropped to make room
+        expirations (int): Entries dropped because they were too old
+        invalidations (int): Calls to invalidate; also a stamp for `put`
+    """
+    
+    def __init__(self, capacity, ttl=None, clock=time.monotonic):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            capacity (int): Most entries kept
+            ttl (float): Seconds an entry stays valid (None = until invalidated)
+            clock (callable): Returns the current time in seconds
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = collections.OrderedDict()  # key -> (value, expiry time or None)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+    
+    def get(self, key, default=None):
+        """
+        Look up an entry, marking it as the most recently used.
+        
+        Args:
+            key: Entry key
+            default: Returned if there is no valid entry
+            
+        Returns:
+            The cached value, or `default`
+        """
+        entries = self._entries
+        entry = entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        value, expires = entry
+        if expires is not None and self._clock() >= expires:
+            with self._lock:
+                if entries.get(key) is entry:
+                    del entries[key]
+                    self.expirations += 1
+            self.misses += 1
+            return default
+        try:
+            entries.move_to_end(key)
+        except KeyError:
+            pass  # invalidated meanwhile; the value was valid when looked up
+        self.hits += 1
+        return value
+    
+    def put(self, key, value, since=None):
+        """
+        Add or replace an entry, evicting the least recently used if the cache is full.
+        
+        A value built from records read while another thread changed them
+        may already be out of date when it is added. Passing the value of
+        `invalidations` from before the records were read skips the put if
+        anything has been invalidated since.
+        
+        Args:
+            key: Entry key
+            value: Value to cache
+            since (int): `invalidations` when the value started being built
+            
+        Returns:
+            bool: True if the entry was added
+        """
+        with self._lock:
+            if since is not None and since != self.invalidations:
+                return False
+            expires = self._clock() + self.ttl if self.ttl is not None else None
+            entries = self._entries
+            entries[key] = (value, expires)
+            entries.move_to_end(key)
+            if len(entries) > self.capacity:
+                entries.popitem(last=False)
+                self.evictions += 1
+            return True
+    
+    def invalidate(self, *keys):
+        """Drop the entries with these keys, if cached."""
+        with self._lock:
+            self.invalidations += 1
+            for key in keys:
+                self._entries.pop(key, None)
+    
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self.invalidations += 1
+            self._entries.clear()
+    
+    def __len__(self):
+        """Return the number of entries, including any that have expired."""
+        return len(self._entries)
+    
+    def stats(self):
+        """
+        Collect the cache statistics for scraping.
+        
+        Returns:
+            dict: size, capacity, hits, misses, hit_rate, evictions,
+            expirations and invalidations
+        """
+        lookups = self.hits + self.misses
+        return {'size': len(self._entries), 'capacity': self.capacity, 'hits': self.hits,
+                'misses': self.misses, 'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions, 'expirations': self.expirations,
+                'invalidations': self.invalidations}
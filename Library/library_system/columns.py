@@ -0,0 +1,532 @@
+"""
+Library Inventory System - Columns Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Binary columnar book snapshots, memory-mapped for fast startup
+"""
+
+import bisect
+import hashlib
+import json
+import mmap
+import struct
+from array import array
+from operator import attrgetter
+from book import Book
+from snapshot import SnapshotError
+
+
+MAGIC = b'LIBCOLS1'
+
+# Magic, generation, journal sequence, number of books, total copies,
+# copies off the shelf, and the SHA-256 of everything after the header
+HEADER = struct.Struct('<8sQQQQQ32s')
+
+# Sections in file order. Numbers are fixed-width little-endian columns
+# indexed by slot; each string column is an offsets column (one more entry
+# than there are books) into a blob of UTF-8 text.
+SECTIONS = ('copies', 'free', 'borrows', 'title_offsets', 'titles', 'author_offsets',
+            'authors', 'isbn_offsets', 'isbns', 'isbn_order', 'extra')
+TYPECODES = {'copies': 'I', 'free': 'Q', 'borrows': 'Q', 'title_offsets': 'Q',
+             'author_offsets': 'Q', 'isbn_offsets': 'Q', 'isbn_order': 'I'}
+
+# (offset, length) of each section
+DIRECTORY = struct.Struct('<' + 'QQ' * len(SECTIONS))
+
+# Free-copy masks too wide for the free column (books with over 64 copies)
+# are stored in the 'extra' section instead
+WIDE = 1 << 64
+
+
+def _strings(values):
+    """Encode strings as an offsets column, a UTF-8 blob and the encoded strings."""
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = array('Q', [0])
+    end = 0
+    for data in encoded:
+        end += len(data)
+        offsets.append(end)
+    return offsets, b''.join(encoded), encoded
+
+
+def encode(books, borrow_history, popularity, generation, journal_seq):
+    """
+    Serialize books as a columnar snapshot.
+    
+    Args:
+        books (iterable): Book objects, in slot order
+        borrow_history (dict): ISBN -> borrow count
+        popularity (dict): Daily borrow counts, as from PopularityTracker.to_dict
+        generation (int): Snapshot generation number
+        journal_seq (int): Sequence number of the last journaled operation included
+        
+    Returns:
+        bytes: The file content
+    """
+    copies = array('I')
+    free = array('Q')
+    borrows = array('Q')
+    titles = []
+    authors = []
+    isbns = []
+    wide = {}
+    total_copies = 0
+    off_shelf = 0
+    for slot, book in enumerate(books):
+        copies.append(book.copies)
+        if book.free < WIDE:
+            free.append(book.free)
+        else:
+            free.append(0)
+            wide[slot] = book.free
+        borrows.append(borrow_history.get(book.isbn, 0))
+        titles.append(book.title)
+        authors.append(book.author)
+        isbns.append(book.isbn)
+        total_copies += book.copies
+        off_shelf += book.copies - book.available_copies
+    
+    columns = {'copies': copies, 'free': free, 'borrows': borrows}
+    columns['title_offsets'], columns['titles'], _ = _strings(titles)
+    columns['author_offsets'], columns['authors'], _ = _strings(authors)
+    columns['isbn_offsets'], columns['isbns'], keys = _strings(isbns)
+    # UTF-8 bytes sort in the same order as the strings they encode
+    columns['isbn_order'] = array('I', sorted(range(len(keys)), key=keys.__getitem__))
+    columns['extra'] = json.dumps({'wide': wide, 'popularity': popularity}).encode('utf-8')
+    
+    # Sections start on 8-byte boundaries so every column can be cast in place
+    body = bytearray(DIRECTORY.size)
+    directory = []
+    for name in SECTIONS:
+        body.extend(b'\0' * (-len(body) % 8))
+        data = columns[name]
+        data = data.tobytes() if isinstance(data, array) else data
+        directory.extend((HEADER.size + len(body), len(data)))
+        body.extend(data)
+    DIRECTORY.pack_into(body, 0, *directory)
+    
+    header = HEADER.pack(MAGIC, generation, journal_seq, len(copies), total_copies,
+                         off_shelf, hashlib.sha256(body).digest())
+    return header + bytes(body)
+
+
+def peek_generation(path):
+    """
+    Read the generation number from a columnar snapshot's header.
+    
+    Args:
+        path (str): File to inspect
+        
+    Returns:
+        int: Generation number
+        
+    Raises:
+        ValueError: If the file is not a columnar snapshot
+    """
+    with open(path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size or not header.startswith(MAGIC):
+        raise ValueError(f"{path} is not a columnar snapshot")
+    return HEADER.unpack(header)[1]
+
+
+class ColumnReader:
+    """
+    Memory-mapped columnar books snapshot.
+    
+    Opening the file verifies its checksum with ordinary reads and then maps
+    it, so no record is decoded up front: a book's columns are read, and
+    its Book created, only when it is asked for. ISBNs are found by binary
+    search over the ISBN-sorted slot column.
+    
+    Attributes:
+        path (str): File being read
+        generation (int): Generation number, from the header
+        values (dict): 'journal_seq' once the file is opened
+        total_copies (int): Copies of all books in the snapshot
+        off_shelf (int): Copies not on the shelf when the snapshot was taken
+        extra (dict): Popularity data and the wide free-copy masks
+    """
+    
+    def __init__(self, path):
+        """
+        Prepare to open a columnar snapshot.
+        
+        Args:
+            path (str): File to read
+        """
+        self.path = path
+        self.generation = peek_generation(path)
+        self.values = {}
+        self._map = None
+    
+    def open(self, verify=True):
+        """
+        Verify and map the file.
+        
+        Args:
+            verify (bool): Check the SHA-256 of the file body first
+            
+        Raises:
+            SnapshotError: If the file is truncated or corrupted
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                magic, generation, journal_seq, size, total_copies, off_shelf, digest = \
+                    HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC:
+                    raise ValueError("not a columnar snapshot")
+                if verify:
+                    body = hashlib.sha256()
+                    for chunk in iter(lambda: f.read(1 << 20), b''):
+                        body.update(chunk)
+                    if body.digest() != digest:
+                        raise SnapshotError(f"{self.path} failed its checksum")
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            
+            view = memoryview(self._map)
+            directory = DIRECTORY.unpack_from(self._map, HEADER.size)
+            sections = {}
+            for n, name in enumerate(SECTIONS):
+                offset, length = directory[2 * n], directory[2 * n + 1]
+                if offset + length > len(self._map):
+                    raise ValueError(f"section {name} runs past the end of the file")
+                if name in TYPECODES:
+                    sections[name] = view[offset:offset + length].cast(TYPECODES[name])
+                else:
+                    sections[name] = offset
+            extra = json.loads(self._map[directory[-2]:directory[-2] + directory[-1]])
+        except (OSError, ValueError, TypeError, struct.error) as e:
+            raise SnapshotError(f"{self.path} is corrupted - {e}")
+        
+        self.values = {'journal_seq': journal_seq}
+        self._size = size
+        self.total_copies = total_copies
+        self.off_shelf = off_shelf
+        self.copies = sections['copies']
+        self.free = sections['free']
+        self.borrows = sections['borrows']
+        self._title_offsets = sections['title_offsets']
+        self._titles = sections['titles']
+        self._author_offsets = sections['author_offsets']
+        self._authors = sections['authors']
+        self._isbn_offsets = sections['isbn_offsets']
+        self._isbns = sections['isbns']
+        self._isbn_order = sections['isbn_order']
+        self._wide = {int(slot): free for slot, free in extra.pop('wide').items()}
+        self.extra = extra
+    
+    def __len__(self):
+        """Return the number of books in the snapshot."""
+        return self._size
+    
+    def _string(self, offsets, base, slot):
+        """Decode one entry of a string column."""
+        return self._map[base + offsets[slot]:base + offsets[slot + 1]].decode('utf-8')
+    
+    def isbn(self, slot):
+        """Return the ISBN of the book in a slot."""
+        return self._string(self._isbn_offsets, self._isbns, slot)
+    
+    def find(self, isbn):
+        """
+        Find the slot of a book by ISBN.
+        
+        Args:
+            isbn (str): ISBN to look for
+            
+        Returns:
+            int: The book's slot, or None if it is not in the snapshot
+        """
+        key = isbn.encode('utf-8')
+        offsets = self._isbn_offsets
+        base = self._isbns
+        order = self._isbn_order
+        data = self._map
+        low, high = 0, self._size
+        while low < high:
+            middle = (low + high) // 2
+            slot = order[middle]
+            found = data[base + offsets[slot]:base + offsets[slot + 1]]
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return slot
+        return None
+    
+    def free_mask(self, slot):
+        """Return the free-copy mask of the book in a slot."""
+        return self._wide.get(slot, self.free[slot]) if self._wide else self.free[slot]
+    
+    def book(self, slot):
+        """
+        Create the Book stored in a slot.
+        
+        Args:
+            slot (int): Slot to read
+            
+        Returns:
+            Book: A new Book object, with its slot set
+        """
+        book = Book.__new__(Book)
+        book._set_fields(
+            title=self._string(self._title_offsets, self._titles, slot),
+            author=self._string(self._author_offsets, self._authors, slot),
+            isbn=self.isbn(slot),
+            copies=self.copies[slot],
+            free=self.free_mask(slot)
+        )
+        book.slot = slot
+        return book
+
+
+class ColumnarBooks:
+    """
+    ISBN -> Book mapping over a ColumnReader, creating Books on first use.
+    
+    Stands in for the Library's dict of books. A Book looked up is kept, so
+    the same object is handed out every time and changes to it stick;
+    books added since the snapshot and removals are kept alongside it.
+    Iterating creates the Books not yet looked up without keeping them,
+    so saving or listing the catalog does not pull it all into memory.
+    """
+    
+    def __init__(self, reader):
+        """
+        Initialize the mapping.
+        
+        Args:
+            reader (ColumnReader): Opened snapshot
+        """
+        self._reader = reader
+        self._books = {}  # ISBN -> Book looked up, or added since the snapshot
+        self._added = []  # Books added since the snapshot, in slot order; some since removed
+        self._removed = set()  # snapshot ISBNs removed since
+        self._size = len(reader)
+    
+    def get(self, isbn, default=None):
+        """Return the Book with an ISBN, or `default`."""
+        book = self._books.get(isbn)
+        if book is not None:
+            return book
+        if isbn in self._removed:
+            return default
+        slot = self._reader.find(isbn)
+        if slot is None:
+            return default
+        book = self._books[isbn] = self._reader.book(slot)
+        return book
+    
+    def peek(self, isbn):
+        """Return the Book with an ISBN, or None, without keeping a Book created for it."""
+        book = self._books.get(isbn)
+        if book is not None or isbn in self._removed:
+            return book
+        slot = self._reader.find(isbn)
+        return self._reader.book(slot) if slot is not None else None
+    
+    def __getitem__(self, isbn):
+        """Return the Book with an ISBN, raising KeyError if there is none."""
+        book = self.get(isbn)
+        if book is None:
+            raise KeyError(isbn)
+        return book
+    
+    def __contains__(self, isbn):
+        """Return True if there is a book with the ISBN."""
+        if isbn in self._books:
+            return True
+        return isbn not in self._removed and self._reader.find(isbn) is not None
+    
+    def __setitem__(self, isbn, book):
+        """Add a book."""
+        if isbn not in self:
+            self._size += 1
+        if book.slot >= len(self._reader) and self._books.get(isbn) is not book:
+            self._added.append(book)
+        self._books[isbn] = book
+        self._removed.discard(isbn)
+    
+    def __delitem__(self, isbn):
+        """Remove a book."""
+        if isbn not in self:
+            raise KeyError(isbn)
+        self._books.pop(isbn, None)
+        if self._reader.find(isbn) is not None:
+            self._removed.add(isbn)
+        self._size -= 1
+    
+    def __len__(self):
+        """Return the number of books."""
+        return self._size
+    
+    def __iter__(self):
+        """Yield every ISBN in slot order."""
+        for book in self._iter_books():
+            yield book.isbn
+    
+    def fetch_all(self):
+        """Create and keep every snapshot Book not looked up yet, in slot order."""
+        reader = self._reader
+        books = self._books
+        removed = self._removed
+        for slot in range(len(reader)):
+            isbn = reader.isbn(slot)
+            if isbn not in books and isbn not in removed:
+                books[isbn] = reader.book(slot)
+    
+    def values(self):
+        """Return a sized view of every Book in slot order, like dict.values()."""
+        return BooksView(self)
+    
+    def iter_from(self, start):
+        """Yield every Book from slot `start` on, in slot order."""
+        return self._iter_books(start)
+    
+    def _iter_books(self, start=0):
+        """Yield every Book in slot order: the snapshot's, then those added since."""
+        reader = self._reader
+        books = self._books
+        removed = self._removed
+        for slot in range(start, len(reader)):
+            isbn = reader.isbn(slot)
+            book = books.get(isbn)
+            if book is None:
+                if isbn not in removed:
+                    yield reader.book(slot)
+            elif book.slot == slot:
+                yield book
+        # Added books have slots after the snapshot's; one removed or
+        # replaced since is no longer the mapping's book for its ISBN
+        added = self._added
+        first = bisect.bisect_left(added, start, key=attrgetter('slot'))
+        for index in range(first, len(added)):
+            book = added[index]
+            if books.get(book.isbn) is book:
+                yield book
+
+
+class BooksView:
+    """Iterable, sized view of the Books in a ColumnarBooks mapping."""
+    
+    def __init__(self, books):
+        """
+        Initialize the view.
+        
+        Args:
+            books (ColumnarBooks): Mapping to view
+        """
+        self._books = books
+    
+    def __iter__(self):
+        """Yield every Book in slot order."""
+        return self._books._iter_books()
+    
+    def __len__(self):
+        """Return the number of books."""
+        return len(self._books)
+
+
+class ColumnarCounts:
+    """
+    ISBN -> borrow count mapping over a ColumnReader's borrows column.
+    
+    Stands in for the Library's borrow_history; counts changed since the
+    snapshot are kept in a dict in front of the column.
+    """
+    
+    def __init__(self, reader):
+        """
+        Initialize the mapping.
+        
+        Args:
+            reader (ColumnReader): Opened snapshot
+        """
+        self._reader = reader
+        self._counts = {}  # ISBN -> count changed or added since the snapshot
+        self._removed = set()  # snapshot ISBNs removed since
+    
+    def get(self, isbn, default=None):
+        """Return the borrow count of an ISBN, or `default`."""
+        count = self._counts.get(isbn)
+        if count is not None:
+            return count
+        if isbn in self._removed:
+            return default
+        slot = self._reader.find(isbn)
+        return default if slot is None else self._reader.borrows[slot]
+    
+    def __getitem__(self, isbn):
+        """Return the borrow count of an ISBN, raising KeyError if there is none."""
+        count = self.get(isbn)
+        if count is None:
+            raise KeyError(isbn)
+        return count
+    
+    def __contains__(self, isbn):
+        """Return True if a count is held for the ISBN."""
+        return self.get(isbn) is not None
+    
+    def __setitem__(self, isbn, count):
+        """Set the borrow count of an ISBN."""
+        self._counts[isbn] = count
+        self._removed.discard(isbn)
+    
+    def pop(self, isbn, default=None):
+        """Remove and return the borrow count of an ISBN, or `default`."""
+        count = self.get(isbn)
+        if count is None:
+            return default
+        self._counts.pop(isbn, None)
+        if self._reader.find(isbn) is not None:
+            self._removed.add(isbn)
+        return count
+    
+    def items(self):
+        """Yield (ISBN, count) pairs: the snapshot's, then those set since."""
+        reader = self._reader
+        counts = self._counts
+        removed = self._removed
+        borrows = reader.borrows
+        for slot in range(len(reader)):
+            isbn = reader.isbn(slot)
+            if isbn not in counts and isbn not in removed:
+                yield isbn, borrows[slot]
+        yield from list(counts.items())
+    
+    def ranked(self, books):
+        """
+        List a most-borrowed heap entry for every book borrowed at least once.
+        
+        Snapshot counts are read straight from the column, so no Book is
+        created for them.
+        
+        Args:
+            books (ColumnarBooks): The Library's books, for the slots of
+                books whose count changed since the snapshot
+                
+        Returns:
+            list: (-count, slot, ISBN) tuples, not yet heapified
+        """
+        reader = self._reader
+        counts = self._counts
+        removed = self._removed
+        borrows = reader.borrows
+        entries = []
+        for slot in range(len(reader)):
+            count = borrows[slot]
+            if count > 0:
+                isbn = reader.isbn(slot)
+                if isbn not in counts and isbn not in removed:
+                    entries.append((-count, slot, isbn))
+        entries.extend((-count, books[isbn].slot, isbn)
+                       for isbn, count in counts.items() if count > 0 and isbn in books)
+        return entries
+    
+    def values(self):
+        """Yield every borrow count."""
+        for isbn, count in self.items():
+            yield count
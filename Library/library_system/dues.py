@@ -0,0 +1,104 @@
+"""
+Library Inventory System - Due Dates Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Time-bucketed index of loan due dates for overdue queries
+"""
+
+import bisect
+import math
+
+
+class DueIndex:
+    """
+    Index of loans by due date, in fixed-width time buckets.
+    
+    Each bucket maps the loans due within it to their due time, and the
+    bucket numbers in use are kept sorted. A query for a time range only
+    visits the buckets it overlaps, so listing the overdue loans, or those
+    due in the next day, costs time in proportion to the answer rather
+    than to the number of loans. Adding and removing a loan is O(1),
+    except when it opens or empties a bucket.
+    
+    Attributes:
+        bucket_seconds (int): Width of a bucket in seconds
+    """
+    
+    def __init__(self, bucket_seconds=3600):
+        """
+        Initialize an empty index.
+        
+        Args:
+            bucket_seconds (int): Width of a bucket in seconds (default: one hour)
+        """
+        self.bucket_seconds = bucket_seconds
+        self._buckets = {}  # bucket number -> {(member ID, ISBN): due time}
+        self._numbers = []  # sorted bucket numbers in use
+        self._size = 0
+    
+    def __len__(self):
+        """Return the number of loans indexed."""
+        return self._size
+    
+    def _bucket(self, due):
+        """Return the bucket number a due time falls in."""
+        return math.floor(due / self.bucket_seconds)
+    
+    def add(self, member_id, isbn, due):
+        """
+        Index a loan.
+        
+        Args:
+            member_id (str): Borrowing member
+            isbn (str): Book borrowed
+            due (float): Due time
+        """
+        number = self._bucket(due)
+        bucket = self._buckets.get(number)
+        if bucket is None:
+            bucket = self._buckets[number] = {}
+            bisect.insort(self._numbers, number)
+        if (member_id, isbn) not in bucket:
+            self._size += 1
+        bucket[(member_id, isbn)] = due
+    
+    def remove(self, member_id, isbn, due):
+        """
+        Remove a loan indexed with the given due time, if present.
+        
+        Args:
+            member_id (str): Borrowing member
+            isbn (str): Book borrowed
+            due (float): Due time it was indexed with
+        """
+        number = self._bucket(due)
+        bucket = self._buckets.get(number)
+        if bucket is None or bucket.pop((member_id, isbn), None) is None:
+            return
+        self._size -= 1
+        if not bucket:
+            del self._buckets[number]
+            del self._numbers[bisect.bisect_left(self._numbers, number)]
+    
+    def between(self, start, end):
+        """
+        List the loans due in a time range.
+        
+        Args:
+            start (float): Start of the range, inclusive (None = no limit)
+            end (float): End of the range, exclusive
+            
+        Returns:
+            list: (due time, member ID, ISBN) tuples, earliest due first
+        """
+        numbers = self._numbers
+        first = 0 if start is None else bisect.bisect_left(numbers, self._bucket(start))
+        last = bisect.bisect_right(numbers, self._bucket(end))
+        loans = []
+        for number in numbers[first:last]:
+            for (member_id, isbn), due in self._buckets[number].items():
+                if (start is None or due >= start) and due < end:
+                    loans.append((due, member_id, isbn))
+        loans.sort()
+        return loans
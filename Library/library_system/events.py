@@ -0,0 +1,330 @@
+"""
+Library Inventory System - Events Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Structured events, counters and latency histograms for the Library
+"""
+
+import collections
+import contextlib
+import functools
+import json
+import time
+
+
+class Event:
+    """
+    One outcome reported by the Library.
+    
+    The message is only formatted when a sink asks for it, so events
+    nobody listens to cost no string formatting.
+    
+    Attributes:
+        time (float): When the event was emitted
+        level (str): 'Success', 'Error', 'Warning' or 'Info'
+        name (str): What happened, e.g. 'lend' or 'book_not_found'
+        template (str): Message template, formatted with the fields
+        fields (dict): Structured details, e.g. the ISBN and member ID
+    """
+    
+    __slots__ = ('time', 'level', 'name', 'template', 'fields')
+    
+    def __init__(self, time, level, name, template, fields):
+        """
+        Initialize an Event object.
+        
+        Args:
+            time (float): When the event was emitted
+            level (str): 'Success', 'Error', 'Warning' or 'Info'
+            name (str): What happened
+            template (str): Message template, formatted with the fields
+            fields (dict): Structured details
+        """
+        self.time = time
+        self.level = level
+        self.name = name
+        self.template = template
+        self.fields = fields
+    
+    @property
+    def message(self):
+        """The human-readable message."""
+        return self.template.format_map(self.fields)
+    
+    def to_dict(self):
+        """
+        Convert the event to a dictionary for structured logs.
+        
+        Returns:
+            dict: time, level, event name, message and the fields
+        """
+        return {'time': self.time, 'level': self.level, 'event': self.name,
+                'message': self.message, **self.fields}
+
+
+def console_sink(event):
+    """Print an event the way the Library always has, e.g. "Success: ..."."""
+    print(f"{event.level}: {event.template.format_map(event.fields)}")
+
+
+class JSONLinesSink:
+    """
+    Writes each event to a file as one JSON object per line.
+    
+    Attributes:
+        file: Text file to write to
+    """
+    
+    def __init__(self, file):
+        """
+        Initialize the sink.
+        
+        Args:
+            file: Text file (or anything with write) to write to
+        """
+        self.file = file
+    
+    def __call__(self, event):
+        """Write one event."""
+        self.file.write(json.dumps(event.to_dict(), default=str) + '\n')
+
+
+class Histogram:
+    """
+    Latency histogram with power-of-two microsecond buckets.
+    
+    Bucket n counts latencies from 2**(n-1) up to 2**n microseconds
+    (bucket 0 is under a microsecond), so adding a sample is a few integer
+    operations and percentiles are accurate to within a factor of two.
+    
+    Attributes:
+        counts (list): Samples per bucket
+        count (int): Number of samples
+        total (float): Sum of the samples in seconds
+        max (float): Largest sample in seconds
+    """
+    
+    __slots__ = ('counts', 'count', 'total', 'max')
+    
+    BUCKETS = 40  # the last bucket takes everything from about 6 days up
+    
+    def __init__(self):
+        """Initialize an empty histogram."""
+        self.counts = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def add(self, seconds):
+        """
+        Record one sample.
+        
+        Args:
+            seconds (float): Latency to record
+        """
+        self.counts[min(int(seconds * 1_000_000).bit_length(), self.BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+    
+    def percentile(self, fraction):
+        """
+        Estimate a percentile.
+        
+        Args:
+            fraction (float): Percentile as a fraction, e.g. 0.99
+            
+        Returns:
+            float: Upper bound in seconds of the bucket the percentile falls in
+        """
+        rank = fraction * self.count
+        seen = 0
+        for bucket, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min((1 << bucket) / 1_000_000, self.max)
+        return self.max
+    
+    def to_dict(self):
+        """
+        Summarize the histogram for scraping.
+        
+        Returns:
+            dict: count, mean, p50, p90, p99 and max in seconds, and the
+            non-empty buckets keyed by their upper bound in microseconds
+        """
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(0.5),
+            'p90': self.percentile(0.9),
+            'p99': self.percentile(0.99),
+            'max': self.max,
+            'buckets': {1 << bucket: count for bucket, count in enumerate(self.counts) if count}
+        }
+
+
+class Events:
+    """
+    Event, counter and latency surface of a Library.
+    
+    Every outcome the Library reports is an Event handed to each sink;
+    the console sink prints it as before, and removing it silences the
+    Library without formatting a single message. Each event also bumps a
+    counter by name. Operations such as lend and save record their
+    latency in a histogram. Lends, returns and lookups take a few
+    microseconds, so reading the clock around every one would cost more
+    than the few percent monitoring may; one call in `sample_every` is
+    timed instead. Lookups are the cheapest of all, so they are counted
+    and sampled only when `time_lookups` is set.
+    
+    Counters and histograms are updated without a lock, so with several
+    threads an occasional sample may be lost; they are meant for
+    monitoring, not accounting.
+    
+    Attributes:
+        sinks (list): Callables given each Event (default: console_sink only)
+        counters (Counter): Events emitted, by name
+        histograms (dict): Operation name -> Histogram of its latency
+        tracer (callable): Optional hook called as tracer(operation, start,
+            seconds) for each timed operation, with start from time.perf_counter
+        sample_every (int): Time one call in this many for sampled operations
+        calls (Counter): Calls made to each sampled operation
+        time_lookups (bool): Whether book lookups are counted and sampled
+        lookups (int): Lookups made while time_lookups is set
+    """
+    
+    def __init__(self, sinks=None, tracer=None, sample_every=16, time_lookups=False):
+        """
+        Initialize the surface.
+        
+        Args:
+            sinks (list): Event sinks (default: [console_sink]; [] for none)
+            tracer (callable): Optional tracing hook
+            sample_every (int): Time one call in this many for sampled operations
+                (1 times every call)
+            time_lookups (bool): Count book lookups and time a sample of them
+            
+        Raises:
+            ValueError: If sample_every is not a positive whole number
+        """
+        if isinstance(sample_every, bool) or not isinstance(sample_every, int) \
+                or sample_every < 1:
+            raise ValueError(f"sample_every must be a positive whole number, "
+                             f"not {sample_every!r}")
+        self.sinks = [console_sink] if sinks is None else list(sinks)
+        self.counters = collections.Counter()
+        self.histograms = {}
+        self.tracer = tracer
+        self.sample_every = sample_every
+        self.calls = collections.Counter()
+        self.time_lookups = time_lookups
+        self.lookups = 0
+    
+    def emit(self, level, name, template, /, **fields):
+        """
+        Report an outcome.
+        
+        Args:
+            level (str): 'Success', 'Error', 'Warning' or 'Info'
+            name (str): What happened, e.g. 'lend' or 'book_not_found'
+            template (str): Message template, formatted with the fields
+            **fields: Structured details
+        """
+        self.counters[name] += 1
+        if self.sinks:
+            event = Event(time.time(), level, name, template, fields)
+            for sink in self.sinks:
+                sink(event)
+    
+    def timed(self, operation, start):
+        """
+        Record the latency of an operation.
+        
+        Args:
+            operation (str): Operation name, e.g. 'lend'
+            start (float): When it began, from time.perf_counter
+        """
+        seconds = time.perf_counter() - start
+        histogram = self.histograms.get(operation)
+        if histogram is None:
+            histogram = self.histograms[operation] = Histogram()
+        histogram.add(seconds)
+        if self.tracer is not None:
+            self.tracer(operation, start, seconds)
+    
+    @contextlib.contextmanager
+    def muted(self):
+        """Detach every sink for the duration of a with block."""
+        sinks = self.sinks
+        self.sinks = []
+        try:
+            yield
+        finally:
+            self.sinks = sinks
+    
+    @contextlib.contextmanager
+    def capture(self):
+        """
+        Collect events in a list instead of sending them to the sinks.
+        
+        Yields:
+            list: Events emitted inside the with block
+        """
+        sinks = self.sinks
+        events = []
+        self.sinks = [events.append]
+        try:
+            yield events
+        finally:
+            self.sinks = sinks
+    
+    def snapshot(self):
+        """
+        Collect the counters and latency summaries for scraping.
+        
+        Returns:
+            dict: 'counters' (event name -> count, plus 'lookups') and
+            'latency' (operation -> Histogram.to_dict summary)
+        """
+        counters = dict(self.counters)
+        counters['lookups'] = self.lookups
+        return {'counters': counters,
+                'latency': {name: histogram.to_dict()
+                            for name, histogram in self.histograms.items()}}
+    
+    def reset(self):
+        """Zero every counter and histogram."""
+        self.counters.clear()
+        self.histograms.clear()
+        self.calls.clear()
+        self.lookups = 0
+
+
+def timed(operation, sampled=False):
+    """
+    Decorate a Library method to record its latency under `operation`.
+    
+    Args:
+        operation (str): Operation name, e.g. 'lend'
+        sampled (bool): Time only one call in the library's `sample_every`,
+            counting calls in the library's Events
+    """
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            events = self.events
+            if sampled:
+                calls = events.calls
+                calls[operation] += 1
+                if calls[operation] % events.sample_every:
+                    return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                events.timed(operation, start)
+        return wrapper
+    return decorate
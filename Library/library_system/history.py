@@ -0,0 +1,620 @@
+"""
+Library Inventory System - History Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Append-only loan history in time-partitioned segments, indexed by member and book
+"""
+
+import bisect
+import heapq
+import itertools
+import mmap
+import os
+import struct
+import time
+from array import array
+from events import Events
+from popularity import SECONDS_PER_DAY
+
+
+OPS = ('lend', 'return')
+
+# Records of the open log file: a name (member ID or ISBN), numbered in
+# order of appearance within the file and followed by its UTF-8 bytes, or
+# an event: op (1 = lend, 2 = return), time, member and ISBN name numbers,
+# and the copy number (-1 = not known)
+NAME = struct.Struct('<BH')
+EVENT = struct.Struct('<BdIIi')
+
+MAGIC = b'LIBHIST1'
+
+# Magic, number of events, and the times of the first and last event
+HEADER = struct.Struct('<8sQdd')
+
+# Sections of a sealed segment, in file order. Events are sorted by time
+# and stored as columns indexed by event number. Names are an offsets
+# column into a blob of UTF-8 text, plus the name numbers in byte order for
+# binary search. For members and for ISBNs, a starts column (one more
+# entry than there are names) gives each name's run of event numbers in
+# the matching events column.
+SECTIONS = ('times', 'ops', 'members', 'isbns', 'copies', 'name_offsets', 'names',
+            'name_order', 'member_starts', 'member_events', 'isbn_starts', 'isbn_events')
+TYPECODES = {'times': 'd', 'ops': 'B', 'members': 'I', 'isbns': 'I', 'copies': 'i',
+             'name_offsets': 'Q', 'name_order': 'I', 'member_starts': 'Q',
+             'member_events': 'I', 'isbn_starts': 'Q', 'isbn_events': 'I'}
+
+# (offset, length) of each section
+DIRECTORY = struct.Struct('<' + 'QQ' * len(SECTIONS))
+
+
+def _event(op, timestamp, member_id, isbn, copy):
+    """Build the dict a query returns for one event."""
+    return {'op': OPS[op - 1], 'ts': timestamp, 'member_id': member_id, 'isbn': isbn,
+            'copy': None if copy < 0 else copy}
+
+
+def _postings(keys, count):
+    """Group event numbers by key into a starts column and an events column."""
+    runs = [[] for _ in range(count)]
+    for number, key in enumerate(keys):
+        runs[key].append(number)
+    starts = array('Q', [0])
+    events = array('I')
+    for run in runs:
+        events.extend(run)
+        starts.append(len(events))
+    return starts, events
+
+
+def encode_segment(events):
+    """
+    Serialize events as a sealed segment.
+    
+    Args:
+        events (list): (time, op number, member ID, ISBN, copy) tuples, in time order
+        
+    Returns:
+        bytes: The file content
+    """
+    names = {}
+    columns = {name: array(code) for name, code in TYPECODES.items()}
+    for timestamp, op, member_id, isbn, copy in events:
+        columns['times'].append(timestamp)
+        columns['ops'].append(op)
+        columns['members'].append(names.setdefault(member_id, len(names)))
+        columns['isbns'].append(names.setdefault(isbn, len(names)))
+        columns['copies'].append(copy)
+    
+    encoded = [name.encode('utf-8') for name in names]
+    end = 0
+    for data in encoded:
+        end += len(data)
+        columns['name_offsets'].append(end)
+    columns['name_offsets'].insert(0, 0)
+    columns['names'] = b''.join(encoded)
+    # UTF-8 bytes sort in the same order as the strings they encode
+    columns['name_order'] = array('I', sorted(range(len(encoded)), key=encoded.__getitem__))
+    columns['member_starts'], columns['member_events'] = _postings(columns['members'],
+                                                                   len(names))
+    columns['isbn_starts'], columns['isbn_events'] = _postings(columns['isbns'], len(names))
+    
+    # Sections start on 8-byte boundaries so every column can be cast in place
+    body = bytearray(DIRECTORY.size)
+    directory = []
+    for name in SECTIONS:
+        body.extend(b'\0' * (-len(body) % 8))
+        data = columns[name]
+        data = data.tobytes() if isinstance(data, array) else data
+        directory.extend((HEADER.size + len(body), len(data)))
+        body.extend(data)
+    DIRECTORY.pack_into(body, 0, *directory)
+    
+    first = events[0][0] if events else 0.0
+    last = events[-1][0] if events else 0.0
+    return HEADER.pack(MAGIC, len(events), first, last) + bytes(body)
+
+
+class SegmentReader:
+    """
+    Memory-mapped sealed segment of the loan history.
+    
+    Only the header is read when the segment is opened; the file is
+    mapped on the first query. A member's or book's events are found by
+    binary search over the names and then over the times of that name's
+    events, so a query reads only the events it returns.
+    
+    Attributes:
+        path (str): File being read
+        count (int): Number of events
+        first (float): Time of the earliest event
+        last (float): Time of the latest event
+        size (int): Size of the file in bytes
+    """
+    
+    def __init__(self, path):
+        """
+        Read a sealed segment's header.
+        
+        Args:
+            path (str): File to read
+            
+        Raises:
+            ValueError: If the file is not a sealed history segment
+        """
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+        if len(header) < HEADER.size or not header.startswith(MAGIC):
+            raise ValueError(f"{path} is not a loan history segment")
+        _, self.count, self.first, self.last = HEADER.unpack(header)
+        self.size = os.path.getsize(path)
+        self._map = None
+    
+    def _open(self):
+        """Map the file and cast its columns."""
+        with open(self.path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        directory = DIRECTORY.unpack_from(self._map, HEADER.size)
+        for n, name in enumerate(SECTIONS):
+            offset, length = directory[2 * n], directory[2 * n + 1]
+            if offset + length > len(self._map):
+                raise ValueError(f"section {name} runs past the end of {self.path}")
+            if name in TYPECODES:
+                setattr(self, '_' + name, view[offset:offset + length].cast(TYPECODES[name]))
+            else:
+                setattr(self, '_' + name, offset)
+    
+    def _name(self, number):
+        """Decode one name."""
+        base = self._names
+        offsets = self._name_offsets
+        return self._map[base + offsets[number]:base + offsets[number + 1]].decode('utf-8')
+    
+    def _find(self, name):
+        """Return the number of a name, or None if it does not occur in the segment."""
+        key = name.encode('utf-8')
+        offsets = self._name_offsets
+        base = self._names
+        order = self._name_order
+        data = self._map
+        low, high = 0, len(order)
+        while low < high:
+            middle = (low + high) // 2
+            number = order[middle]
+            found = data[base + offsets[number]:base + offsets[number + 1]]
+            if found < key:
+                low = middle + 1
+            elif found > key:
+                high = middle
+            else:
+                return number
+        return None
+    
+    def _decode(self, number):
+        """Return one event as a dict."""
+        return _event(self._ops[number], self._times[number], self._name(self._members[number]),
+                      self._name(self._isbns[number]), self._copies[number])
+    
+    def events(self, member_id=None, isbn=None, since=None, until=None):
+        """
+        Yield the matching events, newest first.
+        
+        Args:
+            member_id (str): Only this member's events
+            isbn (str): Only this book's events
+            since (float): Only events at or after this time
+            until (float): Only events before this time
+        """
+        if self._map is None:
+            self._open()
+        if member_id is not None or isbn is not None:
+            # Follow the shorter of the two runs
+            runs = []
+            for name, starts, events in ((member_id, self._member_starts, self._member_events),
+                                         (isbn, self._isbn_starts, self._isbn_events)):
+                if name is not None:
+                    number = self._find(name)
+                    if number is None:
+                        return
+                    runs.append(events[starts[number]:starts[number + 1]])
+            numbers = min(runs, key=len)
+        else:
+            numbers = range(self.count)
+        times = self._times
+        low = 0 if since is None else bisect.bisect_left(numbers, since, key=times.__getitem__)
+        high = (len(numbers) if until is None else
+                bisect.bisect_left(numbers, until, key=times.__getitem__))
+        for index in range(high - 1, low - 1, -1):
+            number = numbers[index]
+            event = self._decode(number)
+            if ((member_id is None or event['member_id'] == member_id) and
+                    (isbn is None or event['isbn'] == isbn)):
+                yield event
+    
+    def all_events(self):
+        """Return every event as a (time, op number, member ID, ISBN, copy) tuple, oldest first."""
+        if self._map is None:
+            self._open()
+        names = [self._name(number) for number in range(len(self._name_offsets) - 1)]
+        return list(zip(self._times.tolist(), self._ops.tolist(),
+                        map(names.__getitem__, self._members.tolist()),
+                        map(names.__getitem__, self._isbns.tolist()), self._copies.tolist()))
+    
+    def close(self):
+        """Unmap the file."""
+        if self._map is not None:
+            for name in SECTIONS:
+                view = getattr(self, '_' + name)
+                if isinstance(view, memoryview):
+                    view.release()
+            self._map.close()
+            self._map = None
+
+
+class LoanHistory:
+    """
+    Append-only log of every lend and return, queried by member or by book.
+    
+    Events are appended to an open log file, in compact fixed-width records
+    that refer to member IDs and ISBNs by number, and are indexed in memory
+    as they arrive. The open log covers one partition of `segment_days`
+    days. When an event from a later partition arrives, the log is sealed:
+    rewritten as a columnar segment sorted by time, with the events of
+    each member and of each book listed together, and then memory-mapped
+    rather than held in memory. A query skips the segments whose time
+    range it does not overlap and, within a segment, reads only the events
+    of the member or book asked about.
+    
+    Sealing is followed by the retention and compaction policies: segments
+    older than `retention_days` are deleted, then the oldest segments are
+    deleted while the history takes more than `max_bytes`, and finally
+    neighbouring segments smaller than `merge_bytes` are merged, so a
+    quiet period does not leave many small files.
+    
+    The library is recovered from its snapshots and journal, not from
+    here. Appends are flushed to the operating system but only fsynced
+    when a segment is sealed, when the library saves, or on close, so a
+    crash may lose the last events; a torn trailing record is dropped
+    when the log is reopened, and the library logs the lost events again
+    as it replays its journal.
+    
+    Attributes:
+        directory (str): Directory holding the segment files
+        segment_days (int): Days covered by the open log before it is sealed
+        retention_days (float): Age after which segments are deleted (None = kept)
+        max_bytes (int): Size the history is trimmed to (None = unbounded)
+        merge_bytes (int): Neighbouring segments below this size are merged
+        segments (list): SegmentReader of each sealed segment, oldest first
+        events (Events): Where a torn tail dropped on opening is reported
+    """
+    
+    def __init__(self, directory='history', segment_days=30, retention_days=None,
+                 max_bytes=None, merge_bytes=1 << 20, events=None):
+        """
+        Open (or create) a loan history.
+        
+        Args:
+            directory (str): Directory holding the segment files
+            segment_days (int): Days covered by the open log before it is sealed
+            retention_days (float): Age after which segments are deleted (None = kept)
+            max_bytes (int): Size the history is trimmed to (None = unbounded)
+            merge_bytes (int): Neighbouring segments below this size are merged (0 = never)
+            events (Events): Event sinks and counters, usually the Library's
+                (default: messages printed to the console)
+        """
+        self.directory = directory
+        self.events = events if events is not None else Events()
+        self.segment_days = segment_days
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        self.merge_bytes = merge_bytes
+        self.segments = []
+        self._sequence = 0
+        self._file = None
+        os.makedirs(directory, exist_ok=True)
+        
+        logs = []
+        for name in sorted(os.listdir(directory)):
+            stem, extension = os.path.splitext(name)
+            if not stem.isdigit() or extension not in ('.seg', '.log'):
+                continue
+            self._sequence = max(self._sequence, int(stem) + 1)
+            path = os.path.join(directory, name)
+            if extension == '.seg':
+                self.segments.append(SegmentReader(path))
+            else:
+                logs.append(path)
+        sealed = {os.path.splitext(segment.path)[0] for segment in self.segments}
+        for path in logs:
+            if os.path.splitext(path)[0] in sealed:
+                os.remove(path)  # sealing finished, but the log was not removed
+        logs = [path for path in logs if os.path.splitext(path)[0] not in sealed]
+        # Only the newest log can still be open; any other was being sealed
+        for path in logs[:-1]:
+            self._recover(path)
+            self._seal()
+        if logs:
+            self._recover(logs[-1])
+        else:
+            self._start_log()
+    
+    def _start_log(self):
+        """Start a new, empty open log."""
+        self._path = os.path.join(self.directory, f"{self._sequence:08d}.log")
+        self._sequence += 1
+        self._file = open(self._path, 'ab')
+        self._reset()
+    
+    def _reset(self):
+        """Empty the in-memory index of the open log."""
+        self._names = []  # name number -> member ID or ISBN
+        self._numbers = {}  # member ID or ISBN -> name number
+        self._events = []  # (time, op number, member ID, ISBN, copy), in arrival order
+        self._by_member = {}  # member ID -> event numbers
+        self._by_isbn = {}  # ISBN -> event numbers
+        self._newest = None
+    
+    def _recover(self, path):
+        """Reopen a log, indexing its events and dropping a torn trailing record."""
+        self._path = path
+        self._reset()
+        with open(path, 'rb') as f:
+            data = f.read()
+        position = 0
+        while position < len(data):
+            tag = data[position]
+            if tag == 0 and position + NAME.size <= len(data):
+                length = NAME.unpack_from(data, position)[1]
+                end = position + NAME.size + length
+                if end > len(data):
+                    break
+                name = data[position + NAME.size:end].decode('utf-8', errors='replace')
+                self._numbers[name] = len(self._names)
+                self._names.append(name)
+            elif tag in (1, 2) and position + EVENT.size <= len(data):
+                op, timestamp, member, isbn, copy = EVENT.unpack_from(data, position)
+                end = position + EVENT.size
+                if member >= len(self._names) or isbn >= len(self._names):
+                    break
+                self._index(timestamp, op, self._names[member], self._names[isbn], copy)
+            else:
+                break
+            position = end
+        if position != len(data):
+            self.events.emit('Warning', 'history_tail_discarded',
+                             "Discarding incomplete loan history tail in {path}", path=path,
+                             bytes=len(data) - position)
+            with open(path, 'r+b') as f:
+                f.truncate(position)
+        self._file = open(path, 'ab')
+    
+    def _index(self, timestamp, op, member_id, isbn, copy):
+        """Add an event to the in-memory index of the open log."""
+        number = len(self._events)
+        self._events.append((timestamp, op, member_id, isbn, copy))
+        self._by_member.setdefault(member_id, []).append(number)
+        self._by_isbn.setdefault(isbn, []).append(number)
+        if self._newest is None or timestamp > self._newest:
+            self._newest = timestamp
+    
+    def _partition(self, timestamp):
+        """Return the number of the partition a time falls in."""
+        return int(timestamp // (self.segment_days * SECONDS_PER_DAY))
+    
+    def append(self, op, member_id, isbn, timestamp=None, copy=None):
+        """
+        Record one lend or return.
+        
+        Args:
+            op (str): 'lend' or 'return'
+            member_id (str): Member who borrowed or returned the book
+            isbn (str): ISBN of the book
+            timestamp (float): When it happened (default: now)
+            copy (int): Copy number, if known
+        """
+        self.append_many(op, [(member_id, isbn, copy)], timestamp)
+    
+    def append_many(self, op, items, timestamp=None):
+        """
+        Record several lends or returns made at the same time, with one write.
+        
+        Args:
+            op (str): 'lend' or 'return'
+            items (list): (member ID, ISBN, copy number or None) tuples
+            timestamp (float): When they happened (default: now)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        if self._newest is not None and self._partition(timestamp) > self._partition(self._newest):
+            self._seal()
+            self._start_log()
+            self._maintain(timestamp)
+        code = OPS.index(op) + 1
+        out = bytearray()
+        for member_id, isbn, copy in items:
+            numbers = []
+            for name in (member_id, isbn):
+                number = self._numbers.get(name)
+                if number is None:
+                    data = name.encode('utf-8')
+                    out += NAME.pack(0, len(data)) + data
+                    number = self._numbers[name] = len(self._names)
+                    self._names.append(name)
+                numbers.append(number)
+            copy = -1 if copy is None else copy
+            out += EVENT.pack(code, timestamp, numbers[0], numbers[1], copy)
+            self._index(timestamp, code, member_id, isbn, copy)
+        self._file.write(out)
+        self._file.flush()
+    
+    def _seal(self):
+        """Rewrite the open log as a sealed segment and delete the log."""
+        self._file.close()
+        if self._events:
+            path = os.path.splitext(self._path)[0] + '.seg'
+            self._write_segment(path, sorted(self._events, key=lambda event: event[0]))
+            self.segments.append(SegmentReader(path))
+            self.segments.sort(key=lambda segment: segment.path)
+        os.remove(self._path)
+    
+    def _write_segment(self, path, events):
+        """Write a sealed segment atomically."""
+        temp = path + '.tmp'
+        with open(temp, 'wb') as f:
+            f.write(encode_segment(events))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, path)
+    
+    def _maintain(self, now):
+        """Apply the retention and compaction policies to the sealed segments."""
+        if self.retention_days is not None:
+            cutoff = now - self.retention_days * SECONDS_PER_DAY
+            for segment in [segment for segment in self.segments if segment.last < cutoff]:
+                self._drop(segment)
+        if self.max_bytes is not None:
+            while self.segments and self.disk_bytes() > self.max_bytes:
+                self._drop(self.segments[0])
+        if self.merge_bytes:
+            self.compact()
+    
+    def _drop(self, segment):
+        """Delete a sealed segment."""
+        segment.close()
+        os.remove(segment.path)
+        self.segments.remove(segment)
+    
+    def compact(self):
+        """
+        Merge runs of neighbouring sealed segments smaller than `merge_bytes`.
+        
+        A merged segment is written under the name of the first of its run
+        before the others are deleted, so a crash part way through leaves
+        events duplicated at worst, never lost.
+        """
+        merged = []
+        run = []
+        for segment in self.segments + [None]:
+            if segment is not None and segment.size < self.merge_bytes:
+                run.append(segment)
+                if sum(part.size for part in run) < self.merge_bytes:
+                    continue
+            if len(run) > 1:
+                events = list(heapq.merge(*(part.all_events() for part in run),
+                                          key=lambda event: event[0]))
+                for part in run:
+                    part.close()
+                self._write_segment(run[0].path, events)
+                for part in run[1:]:
+                    os.remove(part.path)
+                merged.append(SegmentReader(run[0].path))
+            else:
+                merged.extend(run)
+            run = []
+            if segment is not None and segment.size >= self.merge_bytes:
+                merged.append(segment)
+        self.segments = merged
+    
+    def query(self, member_id=None, isbn=None, since=None, until=None, limit=None):
+        """
+        Find lends and returns, newest first.
+        
+        With a member ID or an ISBN (or both) only that member's or book's
+        events are read. Segments outside the time range are not opened.
+        
+        Args:
+            member_id (str): Only this member's events
+            isbn (str): Only this book's events
+            since (float): Only events at or after this time
+            until (float): Only events before this time
+            limit (int): Most events to return (None = all)
+            
+        Returns:
+            list: Event dicts with op, ts, member_id, isbn and copy
+        """
+        sources = [self._open_events(member_id, isbn, since, until)]
+        for segment in reversed(self.segments):
+            if ((since is None or segment.last >= since) and
+                    (until is None or segment.first < until)):
+                sources.append(segment.events(member_id, isbn, since, until))
+        events = heapq.merge(*sources, key=lambda event: event['ts'], reverse=True)
+        return list(itertools.islice(events, limit))
+    
+    def _open_events(self, member_id, isbn, since, until):
+        """Return the matching events of the open log, newest first."""
+        if member_id is not None or isbn is not None:
+            runs = [index.get(key, ()) for key, index in ((member_id, self._by_member),
+                                                          (isbn, self._by_isbn))
+                    if key is not None]
+            numbers = min(runs, key=len)
+        else:
+            numbers = range(len(self._events))
+        events = []
+        for number in numbers:
+            timestamp, op, event_member, event_isbn, copy = self._events[number]
+            if ((since is None or timestamp >= since) and (until is None or timestamp < until) and
+                    (member_id is None or event_member == member_id) and
+                    (isbn is None or event_isbn == isbn)):
+                events.append(_event(op, timestamp, event_member, event_isbn, copy))
+        events.sort(key=lambda event: event['ts'], reverse=True)
+        return events
+    
+    def last_borrower(self, isbn, copy=None):
+        """
+        Find who borrowed a book (or one copy of it) most recently.
+        
+        Segments are searched from the newest, stopping at the first that
+        ends before the latest loan found so far.
+        
+        Args:
+            isbn (str): ISBN of the book
+            copy (int): Only loans of this copy
+            
+        Returns:
+            dict: The lend event, or None if it was never lent
+        """
+        found = None
+        sources = [(None, self._open_events(None, isbn, None, None))]
+        for segment in sorted(self.segments, key=lambda segment: segment.last, reverse=True):
+            sources.append((segment, None))
+        for segment, events in sources:
+            if segment is not None:
+                if found is not None and segment.last < found['ts']:
+                    break
+                events = segment.events(isbn=isbn)
+            for event in events:
+                if event['op'] == 'lend' and (copy is None or event['copy'] == copy):
+                    if found is None or event['ts'] > found['ts']:
+                        found = event
+                    break
+        return found
+    
+    def disk_bytes(self):
+        """Return the size of the history on disk."""
+        return sum(segment.size for segment in self.segments) + self._file.tell()
+    
+    def stats(self):
+        """
+        Collect the history's size for scraping.
+        
+        Returns:
+            dict: segments, sealed_events, open_events and bytes
+        """
+        return {'segments': len(self.segments),
+                'sealed_events': sum(segment.count for segment in self.segments),
+                'open_events': len(self._events), 'bytes': self.disk_bytes()}
+    
+    def sync(self):
+        """Force the open log to stable storage."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+    
+    def close(self):
+        """Sync and close the open log and unmap the sealed segments."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+        for segment in self.segments:
+            segment.close()
@@ -0,0 +1,186 @@
+"""
+Library Inventory System - Holds Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Hold queues that set returned copies aside for waiting members
+"""
+
+import heapq
+from collections import OrderedDict
+
+
+class HoldQueues:
+    """
+    First-come, first-served hold queues, one per title.
+    
+    A hold is either waiting in its title's queue or ready: a copy has been
+    set aside for the member, who has until a pickup deadline to collect it.
+    Queues are OrderedDicts, so taking the head and cancelling a hold
+    anywhere in the queue are both O(1). Pickup deadlines sit in a heap;
+    entries for holds collected or cancelled in the meantime are skipped
+    when they reach the top, so expiring holds never scans the queues.
+    
+    Attributes:
+        hold_days (int): Days a member has to collect a copy set aside for them
+    """
+    
+    def __init__(self, hold_days=7):
+        """
+        Initialize with no holds.
+        
+        Args:
+            hold_days (int): Days a member has to collect a copy set aside for them
+        """
+        self.hold_days = hold_days
+        self._waiting = {}  # ISBN -> OrderedDict of waiting member IDs, oldest first
+        self._ready = {}  # (ISBN, member ID) -> (copy set aside, pickup deadline)
+        self._deadlines = []  # heap of (pickup deadline, ISBN, member ID); stale entries skipped
+        self._by_member = {}  # member ID -> set of ISBNs held
+    
+    @property
+    def ready_count(self):
+        """Number of copies currently set aside."""
+        return len(self._ready)
+    
+    def has_hold(self, isbn, member_id):
+        """Return True if the member has a waiting or ready hold on the title."""
+        return isbn in self._by_member.get(member_id, ())
+    
+    def holds_of(self, member_id):
+        """Return the ISBNs the member has holds on."""
+        return set(self._by_member.get(member_id, ()))
+    
+    def ready_copy(self, isbn, member_id):
+        """Return the copy set aside for the member, or None if there is none."""
+        entry = self._ready.get((isbn, member_id))
+        return entry[0] if entry else None
+    
+    def waiting_count(self, isbn):
+        """Return the number of members waiting for the title."""
+        return len(self._waiting.get(isbn, ()))
+    
+    def position(self, isbn, member_id):
+        """
+        Return a member's place in a title's queue.
+        
+        Returns:
+            int: 0 if a copy is ready for them, 1 for the head of the queue,
+            and so on; None if they have no hold on the title
+        """
+        if (isbn, member_id) in self._ready:
+            return 0
+        for n, waiting in enumerate(self._waiting.get(isbn, ()), 1):
+            if waiting == member_id:
+                return n
+        return None
+    
+    def place(self, isbn, member_id):
+        """
+        Add a member to the end of a title's queue.
+        
+        Returns:
+            int: The member's place in the queue
+        """
+        queue = self._waiting.setdefault(isbn, OrderedDict())
+        queue[member_id] = None
+        self._by_member.setdefault(member_id, set()).add(isbn)
+        return len(queue)
+    
+    def next_waiting(self, isbn):
+        """Return the member at the head of a title's queue, or None."""
+        queue = self._waiting.get(isbn)
+        return next(iter(queue)) if queue else None
+    
+    def set_aside(self, isbn, member_id, copy, deadline):
+        """
+        Make a member's hold ready, with a copy set aside until the deadline.
+        
+        Args:
+            isbn (str): Title held
+            member_id (str): Member the copy is for
+            copy (int): Copy set aside
+            deadline (float): Time by which it must be collected
+        """
+        self._unqueue(isbn, member_id)
+        self._ready[(isbn, member_id)] = (copy, deadline)
+        self._by_member.setdefault(member_id, set()).add(isbn)
+        heapq.heappush(self._deadlines, (deadline, isbn, member_id))
+    
+    def cancel(self, isbn, member_id):
+        """
+        Drop a member's hold, waiting or ready.
+        
+        Returns:
+            int: The copy that was set aside for them, or None if the hold
+            was still waiting (or did not exist)
+        """
+        held = self._by_member.get(member_id)
+        if held is None or isbn not in held:
+            return None
+        held.discard(isbn)
+        if not held:
+            del self._by_member[member_id]
+        entry = self._ready.pop((isbn, member_id), None)
+        if entry is not None:
+            return entry[0]
+        self._unqueue(isbn, member_id)
+        return None
+    
+    def _unqueue(self, isbn, member_id):
+        """Remove a member from a title's waiting queue, if they are in it."""
+        queue = self._waiting.get(isbn)
+        if queue is not None:
+            queue.pop(member_id, None)
+            if not queue:
+                del self._waiting[isbn]
+    
+    def expired(self, now):
+        """
+        Pop the ready holds whose pickup deadline has passed.
+        
+        The holds themselves are left in place for the caller to cancel.
+        
+        Args:
+            now (float): Current time
+            
+        Returns:
+            list: (ISBN, member ID) pairs, earliest deadline first
+        """
+        expired = []
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            deadline, isbn, member_id = heapq.heappop(deadlines)
+            entry = self._ready.get((isbn, member_id))
+            if entry is not None and entry[1] == deadline:
+                expired.append((isbn, member_id))
+        return expired
+    
+    def to_list(self):
+        """
+        Convert the holds to a list for file storage.
+        
+        Returns:
+            list: [ISBN, member ID, copy, deadline] per hold, with copy and
+            deadline None while waiting; waiting holds in queue order
+        """
+        holds = [[isbn, member_id, copy, deadline]
+                 for (isbn, member_id), (copy, deadline) in self._ready.items()]
+        for isbn, queue in self._waiting.items():
+            holds.extend([isbn, member_id, None, None] for member_id in queue)
+        return holds
+    
+    def load(self, isbn, member_id, copy=None, deadline=None):
+        """
+        Restore one hold saved by to_list.
+        
+        Args:
+            isbn (str): Title held
+            member_id (str): Member holding it
+            copy (int): Copy set aside, or None if the hold is waiting
+            deadline (float): Pickup deadline, or None if the hold is waiting
+        """
+        if copy is None:
+            self.place(isbn, member_id)
+        else:
+            self.set_aside(isbn, member_id, copy, deadline)
@@ -0,0 +1,339 @@
+"""
+Library Inventory System - Importer Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Bulk catalog import from CSV and MARC-style files
+"""
+
+import collections
+import concurrent.futures
+import contextlib
+import csv
+import os
+import sys
+import time
+from events import Events
+from journal import Journal
+from library import Library
+from storage import SQLiteStorage
+
+
+# CSV columns read, by header name; copies is optional
+CSV_COLUMNS = ('title', 'author', 'isbn', 'copies')
+
+# MARC-style tags read: ISBN, main author, title, and copies held (local field)
+MARC_TAGS = {'020': 'isbn', '100': 'author', '245': 'title', '949': 'copies'}
+
+
+def normalize_isbn(text):
+    """
+    Strip an ISBN down to its digits and verify its check digit.
+    
+    Args:
+        text (str): ISBN-10 or ISBN-13, with or without hyphens and spaces
+        
+    Returns:
+        str: The normalized ISBN, or None if it is not a valid ISBN
+    """
+    isbn = text.replace('-', '').replace(' ', '').upper()
+    if len(isbn) == 13 and isbn.isdigit():
+        total = sum(map(int, isbn[::2])) + 3 * sum(map(int, isbn[1::2]))
+        return isbn if total % 10 == 0 else None
+    if len(isbn) == 10 and isbn[:9].isdigit() and (isbn[9].isdigit() or isbn[9] == 'X'):
+        total = sum((10 - i) * (10 if digit == 'X' else int(digit))
+                    for i, digit in enumerate(isbn))
+        return isbn if total % 11 == 0 else None
+    return None
+
+
+def validate(fields):
+    """
+    Check and clean one record's fields.
+    
+    Args:
+        fields (dict): Raw 'title', 'author', 'isbn' and optional 'copies' values
+        
+    Returns:
+        tuple: (title, author, isbn, copies)
+        
+    Raises:
+        ValueError: With the reason the record is rejected
+    """
+    title = ' '.join(fields.get('title', '').split())
+    author = ' '.join(fields.get('author', '').split())
+    raw_isbn = fields.get('isbn', '').strip()
+    copies = fields.get('copies', '').strip() or '1'
+    if not title:
+        raise ValueError("missing title")
+    if not author:
+        raise ValueError("missing author")
+    if not raw_isbn:
+        raise ValueError("missing ISBN")
+    isbn = normalize_isbn(raw_isbn)
+    if isbn is None:
+        raise ValueError(f"invalid ISBN {raw_isbn!r}")
+    if not copies.isdigit() or int(copies) < 1:
+        raise ValueError(f"invalid number of copies {copies!r}")
+    return title, author, isbn, int(copies)
+
+
+def parse_chunk(fmt, columns, first_line, lines):
+    """
+    Parse and validate a chunk of lines; runs in a worker process.
+    
+    Args:
+        fmt (str): 'csv' or 'marc'
+        columns (dict): CSV column name -> index (unused for MARC)
+        first_line (int): Line number of the chunk's first line
+        lines (list): Lines of the file, ending on a record boundary
+        
+    Returns:
+        tuple: (records, rejects) - records are (line, title, author, isbn,
+        copies) tuples, rejects are (line, reason, record text) tuples
+    """
+    records = []
+    rejects = []
+    
+    def check(line, fields, text):
+        try:
+            records.append((line,) + validate(fields))
+        except ValueError as e:
+            rejects.append((line, str(e), text))
+    
+    if fmt == 'csv':
+        reader = csv.reader(lines)
+        start = 0
+        for row in reader:
+            line = first_line + start
+            text = ''.join(lines[start:reader.line_num]).rstrip('\r\n')
+            start = reader.line_num
+            if row:
+                check(line, {name: row[index] if index < len(row) else ''
+                             for name, index in columns.items()}, text)
+        return records, rejects
+    
+    # MARC-style: one "TAG value" line per field, records separated by blank lines
+    fields = {}
+    text = []
+    line = first_line
+    for offset, raw in enumerate(lines + ['']):
+        stripped = raw.strip()
+        if not stripped:
+            if text:
+                check(line, fields, ' | '.join(text))
+            fields = {}
+            text = []
+            continue
+        if not text:
+            line = first_line + offset
+        text.append(stripped)
+        tag, _, value = stripped.partition(' ')
+        value = value.strip()
+        if value.startswith('$a'):
+            value = value[2:].strip()
+        name = MARC_TAGS.get(tag)
+        if name is not None and name not in fields:
+            fields[name] = value
+    return records, rejects
+
+
+def read_chunks(lines, fmt, first_line, chunk_lines):
+    """
+    Group a file's lines into chunks that end on a record boundary.
+    
+    CSV chunks only end where the quotes seen so far balance, so a quoted
+    field spanning lines is never split; MARC-style chunks end on blank lines.
+    
+    Args:
+        lines (iterable): Lines of the file, from `first_line` on
+        fmt (str): 'csv' or 'marc'
+        first_line (int): Line number of the first line
+        chunk_lines (int): Minimum number of lines per chunk
+        
+    Yields:
+        tuple: (line number of the chunk's first line, list of lines)
+    """
+    chunk = []
+    quotes = 0
+    for number, text in enumerate(lines, first_line):
+        chunk.append(text)
+        if fmt == 'csv':
+            quotes += text.count('"')
+            boundary = quotes % 2 == 0
+        else:
+            boundary = not text.strip()
+        if boundary and len(chunk) >= chunk_lines:
+            yield number - len(chunk) + 1, chunk
+            chunk = []
+            quotes = 0
+    if chunk:
+        yield number - len(chunk) + 1, chunk
+
+
+def parse_chunks(chunks, fmt, columns, workers):
+    """
+    Parse chunks in a process pool, yielding their results in file order.
+    
+    At most two chunks per worker are in flight, so memory stays bounded
+    however large the file is.
+    
+    Args:
+        chunks (iterable): (first line, lines) pairs from read_chunks
+        fmt (str): 'csv' or 'marc'
+        columns (dict): CSV column name -> index
+        workers (int): Worker processes (0 = parse in this process)
+        
+    Yields:
+        tuple: (records, rejects) per chunk, as returned by parse_chunk
+    """
+    if workers == 0:
+        for first_line, lines in chunks:
+            yield parse_chunk(fmt, columns, first_line, lines)
+        return
+    
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = collections.deque()
+        for first_line, lines in chunks:
+            pending.append(pool.submit(parse_chunk, fmt, columns, first_line, lines))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def import_catalog(library, path, fmt=None, rejects_path=None, workers=None,
+                   chunk_lines=5000):
+    """
+    Import books from a CSV or MARC-style catalog file.
+    
+    The file is streamed in chunks that are parsed and validated in a
+    process pool. Valid records are checked against ISBNs seen earlier in
+    the file and already in the library, then added through the Library's
+    bulk path, one chunk at a time. Rejected records are written to
+    `rejects_path` with their line number and the reason.
+    
+    CSV files need a header row naming the title, author and isbn columns
+    (and optionally copies). MARC-style files hold one field per line as
+    "TAG value" (020 ISBN, 100 author, 245 title, 949 copies), with a
+    blank line after each record; a "$a" before the value is ignored.
+    
+    Args:
+        library (Library): Library to add the books to
+        path (str): Catalog file
+        fmt (str): 'csv' or 'marc' (default: 'csv' unless the file ends in .mrk)
+        rejects_path (str): File to write rejected records to (default: none)
+        workers (int): Worker processes (default: one per CPU; 0 = none)
+        chunk_lines (int): Lines per chunk handed to a worker
+        
+    Returns:
+        dict: 'rows', 'added', 'rejected', 'seconds' and 'rows_per_sec',
+        or None if the file could not be read
+    """
+    fmt = fmt or ('marc' if path.lower().endswith('.mrk') else 'csv')
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    start = time.perf_counter()
+    rows = added = rejected = 0
+    seen = set()
+    
+    try:
+        with open(path, newline='', encoding='utf-8') as f, \
+                contextlib.ExitStack() as stack:
+            writer = None
+            if rejects_path:
+                rejects_file = stack.enter_context(open(rejects_path, 'w', newline='',
+                                                        encoding='utf-8'))
+                writer = csv.writer(rejects_file)
+                writer.writerow(['line', 'reason', 'record'])
+            
+            columns = None
+            first_line = 1
+            if fmt == 'csv':
+                header = next(csv.reader([f.readline()]), [])
+                names = {name.strip().lower(): index for index, name in enumerate(header)}
+                missing = [name for name in CSV_COLUMNS[:3] if name not in names]
+                if missing:
+                    print(f"Error: {path} has no {', '.join(missing)} column in its header!")
+                    return None
+                columns = {name: names[name] for name in CSV_COLUMNS if name in names}
+                first_line = 2
+            
+            chunks = read_chunks(f, fmt, first_line, chunk_lines)
+            for records, rejects in parse_chunks(chunks, fmt, columns, workers):
+                rows += len(records) + len(rejects)
+                batch = []
+                lines = {}
+                for line, title, author, isbn, copies in records:
+                    if isbn in seen:
+                        rejects.append((line, f"duplicate ISBN {isbn} in file",
+                                        ','.join((title, author, isbn, str(copies)))))
+                        continue
+                    seen.add(isbn)
+                    lines[isbn] = (line, title, author, copies)
+                    batch.append((title, author, isbn, copies))
+                
+                with library.events.muted():
+                    existing = library.add_books(batch)
+                for isbn in existing:
+                    line, title, author, copies = lines[isbn]
+                    rejects.append((line, f"ISBN {isbn} is already in the library",
+                                    ','.join((title, author, isbn, str(copies)))))
+                added += len(batch) - len(existing)
+                rejected += len(rejects)
+                if writer is not None:
+                    writer.writerows(sorted(rejects))
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Error: Failed to import {path} - {e}")
+        return None
+    
+    seconds = time.perf_counter() - start
+    stats = {'rows': rows, 'added': added, 'rejected': rejected, 'seconds': seconds,
+             'rows_per_sec': rows / seconds if seconds else 0.0}
+    print(f"Success: Imported {added} of {rows} records from {path} in {seconds:.1f}s "
+          f"({stats['rows_per_sec']:.0f} rows/sec)")
+    if rejected:
+        where = f" - see {rejects_path}" if rejects_path else ""
+        print(f"Warning: {rejected} records were rejected{where}")
+    return stats
+
+
+def main():
+    """
+    Importer entry point.
+    
+    Usage: python importer.py FILE [--format csv|marc] [--rejects rejects.csv]
+           [--workers N] [--db library.db]
+    Without --db the books are added to books.json with a journal.
+    """
+    usage = ("Usage: python importer.py FILE [--format csv|marc] [--rejects rejects.csv] "
+             "[--workers N] [--db library.db]")
+    options = {'--format': None, '--rejects': None, '--workers': None, '--db': None}
+    args = sys.argv[1:]
+    path = args.pop(0) if args and not args[0].startswith('--') else None
+    while args:
+        option = args.pop(0)
+        if option not in options or not args:
+            path = None
+            break
+        options[option] = args.pop(0)
+    if path is None or options['--format'] not in (None, 'csv', 'marc'):
+        print(usage)
+        sys.exit(2)
+    
+    events = Events()
+    if options['--db']:
+        library = Library(storage=SQLiteStorage(options['--db']), events=events)
+    else:
+        library = Library(journal=Journal('journal.log', events=events), events=events)
+    library.load_data()
+    
+    workers = int(options['--workers']) if options['--workers'] is not None else None
+    stats = import_catalog(library, path, options['--format'], options['--rejects'], workers)
+    library.save_data()
+    library.close()
+    if stats is None:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Library Inventory System - Journal Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Append-only write-ahead journal of library operations
+"""
+
+import json
+import os
+import time
+from events import Events
+
+
+class Journal:
+    """
+    Append-only log of library operations, one JSON record per line.
+    
+    Every record carries a sequence number so that replay can skip the
+    operations already folded into a snapshot. Records are flushed to the
+    operating system on every append, but fsync is batched: the file is
+    synced once `sync_every` records are pending or `sync_interval`
+    seconds have passed, whichever comes first. With sync_every set to 0
+    the journal never syncs by itself, leaving it to the caller.
+    
+    Attributes:
+        path (str): Path of the journal file
+        seq (int): Sequence number of the last record written
+        sync_every (int): Maximum number of records between fsync calls (0 = caller syncs)
+        sync_interval (float): Maximum seconds between fsync calls
+        records (int): Number of records currently in the file
+        events (Events): Where a torn tail dropped on opening is reported
+    """
+    
+    def __init__(self, path='journal.log', sync_every=32, sync_interval=1.0, events=None):
+        """
+        Open (or create) a journal file.
+        
+        Args:
+            path (str): Path of the journal file
+            sync_every (int): Maximum number of records between fsync calls (0 = caller syncs)
+            sync_interval (float): Maximum seconds between fsync calls
+            events (Events): Event sinks and counters, usually the Library's
+                (default: messages printed to the console)
+        """
+        self.path = path
+        self.events = events if events is not None else Events()
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.seq = 0
+        self.records = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self._recover()
+        self._file = open(self.path, 'a', encoding='utf-8')
+    
+    def _recover(self):
+        """Find the last sequence number and drop a torn trailing record."""
+        if not os.path.exists(self.path):
+            return
+        
+        good_size = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self.seq = record['seq']
+                self.records += 1
+                good_size += len(line)
+        
+        size = os.path.getsize(self.path)
+        if good_size != size:
+            self.events.emit('Warning', 'journal_tail_discarded',
+                             "Discarding incomplete journal tail in {path}", path=self.path,
+                             bytes=size - good_size)
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_size)
+    
+    def append(self, op, **fields):
+        """
+        Append one operation to the journal.
+        
+        Args:
+            op (str): Operation name, e.g. 'lend' or 'add_book'
+            **fields: Operation arguments
+            
+        Returns:
+            int: Sequence number assigned to the record
+        """
+        self.seq += 1
+        record = {'seq': self.seq, 'ts': time.time(), 'op': op}
+        record.update(fields)
+        self._file.write(json.dumps(record) + '\n')
+        self._file.flush()
+        self.records += 1
+        self._pending += 1
+        
+        if self.sync_every and (self._pending >= self.sync_every or
+                                time.monotonic() - self._last_sync >= self.sync_interval):
+            self.sync()
+        return self.seq
+    
+    def sync(self):
+        """Force all appended records to stable storage."""
+        if self._pending:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = 0
+        self._last_sync = time.monotonic()
+    
+    def flush(self):
+        """
+        Hand appended records to the operating system without waiting for the disk.
+        
+        For a caller that fsyncs the file itself, e.g. on a worker thread so
+        that an event loop is not blocked. The file must not be rotated or
+        closed until that fsync has finished.
+        
+        Returns:
+            int: File descriptor to pass to os.fsync, or None if nothing was pending
+        """
+        if not self._pending:
+            return None
+        self._file.flush()
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        return self._file.fileno()
+    
+    def replay(self, after_seq=0):
+        """
+        Iterate over journal records newer than a snapshot.
+        
+        The journal rotated out by the last compaction is read first, so a
+        fallback to the previous snapshot generation loses no operations.
+        
+        Args:
+            after_seq (int): Sequence number already contained in the snapshot
+            
+        Yields:
+            dict: Journal records with seq greater than after_seq, in order
+        """
+        self._file.flush()
+        for path in (self.path + '.prev', self.path):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    if record['seq'] > after_seq:
+                        yield record
+    
+    def rotate(self):
+        """
+        Start a new journal once its records are folded into a snapshot.
+        
+        The old file is kept as `<path>.prev` until the next rotation, which
+        is exactly as long as the previous snapshot generation is kept.
+        """
+        self.sync()
+        self._file.close()
+        os.replace(self.path, self.path + '.prev')
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self.records = 0
+        self._pending = 0
+        self._last_sync = time.monotonic()
+    
+    def close(self):
+        """Sync and close the journal file."""
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
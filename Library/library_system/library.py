@@ -6,10 +6,27 @@ Assignment: Programming for Problem Solving Using Python - Assignment 3
 Description: Library class to manage books, members, and borrowing operations
 """
 
-import json
-import os
+import collections
+import contextlib
+import heapq
+import itertools
+import math
+import threading
+import time
+from bitmap import AvailabilityBitmap
 from book import Book
+from cache import LRUCache
+from columns import ColumnarBooks, ColumnarCounts, ColumnReader
+from dues import DueIndex
+from events import Events, timed
+from holds import HoldQueues
+from locks import StripedLocks
 from member import Member
+from popularity import SECONDS_PER_DAY, PopularityTracker
+from search import SearchIndex
+from snapshot import SnapshotError
+from storage import JSONStorage
+from versions import Snapshot, VersionStore
 
 
 class Library:
@@ -17,18 +34,232 @@ class Library:
     Represents the library management system.
     
     Attributes:
-        books (list): List of all Book objects in the library
-        members (list): List of all Member objects registered
+        books: All Book objects in the library, in insertion order
+        members: All Member objects registered, in insertion order
         borrow_history (dict): Track borrow count for each ISBN
+        popularity (PopularityTracker): Borrow counts over recent time windows
+        storage: Storage backend (JSONStorage by default, ColumnarStorage or SQLiteStorage)
+        availability (AvailabilityBitmap): Optional availability bit per book slot
+        search_index (SearchIndex): Title and author words of every book; None
+            until the first search after opening a columnar snapshot, and with
+            a lazy backend
+        holds (HoldQueues): Members waiting for titles, and copies set aside for them
+        dues (DueIndex): Loans by due date
+        loan_days (int): Length of a loan in days
+        fine_per_day (float): Fine for each day (or part day) a loan is overdue
+        events (Events): Where outcomes are reported, with counters and latencies
+        versions (VersionStore): Earlier states of the books and members that
+            open snapshots still need
+        views (LRUCache): Rendered book and member views, or None if not cached
+        
+    The report figures are maintained incrementally as books are lent and
+    returned, so display_report does not scan the catalog; check_counters
+    verifies them against a full recount.
+    
+    With a lazy backend such as SQLiteStorage, the book and member indexes
+    and borrow_history only cache records fetched from it; lookups that
+    miss the cache and the report figures are answered by the backend.
+    Books with copies out and members with loans stay cached, since loans
+    and holds point at them, and at most `lazy_cache` others of each kind
+    are kept, the longest cached being dropped first.
+    With ColumnarStorage, books and borrow_history are read from the
+    memory-mapped snapshot as they are looked up, and the search index and
+    most-borrowed heap are only built when first needed.
+    
+    With lock_stripes set, the Library may be shared by several threads,
+    such as circulation desks. Each operation locks the stripes of the
+    member and book it touches, so operations on different books run
+    side by side. The shared counters and the journal are updated under
+    one short-lived lock, and saving locks every stripe. Reports and
+    listings can read a snapshot instead, which writers do not wait for.
     """
     
-    def __init__(self):
-        """Initialize the Library with empty books and members lists."""
-        self.books = []
-        self.members = []
+    def __init__(self, journal=None, compact_every=1000, storage=None,
+                 availability_bitmap=False, lock_stripes=0, hold_days=7,
+                 loan_days=14, fine_per_day=0.25, events=None, view_cache=0, view_ttl=None,
+                 history=None, lazy_cache=10_000):
+        """
+        Initialize the Library with empty book and member indexes.
+        
+        Args:
+            journal (Journal): Optional journal for the default JSON storage
+            compact_every (int): Journal length that triggers a snapshot (0 = never)
+            storage: Storage backend to use instead of JSON files
+            availability_bitmap (bool): Also keep availability as a bitmap by slot
+            lock_stripes (int): Number of locks for sharing between threads (0 = none)
+            hold_days (int): Days a member has to collect a copy set aside for them
+            loan_days (int): Length of a loan in days
+            fine_per_day (float): Fine for each day (or part day) a loan is overdue
+            events (Events): Event sinks, counters and latency histograms
+                (default: messages printed to the console)
+            view_cache (int): Rendered book and member views to cache (0 = none)
+            view_ttl (float): Seconds a cached view may be served (None = until it changes)
+            history (LoanHistory): Optional log of every lend and return, for
+                get_loan_history and get_last_borrower
+            lazy_cache (int): With a lazy backend, books and members each kept
+                in memory besides those that loans and holds need
+                
+        Raises:
+            ValueError: If lock_stripes or availability_bitmap is used with a
+                lazy storage backend
+        """
+        self._books = {}  # ISBN -> Book
+        self._members = {}  # member ID -> Member
+        self._holders = {}  # ISBN -> {member ID: Member} for every copy on loan
         self.borrow_history = {}  # ISBN -> borrow count
+        self._next_slot = 0
+        self._slots = []  # slot -> Book, or None once removed; None with a columnar
+        # snapshot or a lazy backend
+        self._member_slots = []  # slot -> Member, or None once removed; None with a lazy backend
+        self._borrowers = AvailabilityBitmap()  # bit per member slot: holds a loan
+        self.availability = AvailabilityBitmap() if availability_bitmap else None
+        self._borrowed_count = 0  # copies on loan
+        self._total_copies = 0
+        self._active_members = 0
+        self._popular = []  # heap of (-borrow count, slot, ISBN); stale entries skipped
+        self.popularity = PopularityTracker()
+        self.holds = HoldQueues(hold_days)
+        self.dues = DueIndex()
+        self.loan_days = loan_days
+        self.fine_per_day = fine_per_day
+        if storage is None:
+            storage = JSONStorage(journal=journal, compact_every=compact_every)
+        self.storage = storage
+        self.search_index = None if storage.lazy else SearchIndex()
+        if lock_stripes and storage.lazy:
+            raise ValueError("lock_stripes needs an in-memory storage backend")
+        if availability_bitmap and storage.lazy:
+            raise ValueError("availability_bitmap needs an in-memory storage backend")
+        self.lazy_cache = lazy_cache
+        self._book_queue = None  # ISBN -> None, oldest cached first; lazy backends only
+        self._member_queue = None  # member ID -> None, likewise
+        self._busy = 0  # operations in progress; the cache is trimmed between them
+        if storage.lazy:
+            # Records come and go from the backend, so they get no slots to page by
+            self._slots = None
+            self._member_slots = None
+            self._book_queue = collections.OrderedDict()
+            self._member_queue = collections.OrderedDict()
+        self._locks = StripedLocks(lock_stripes) if lock_stripes else None
+        self._state_lock = threading.Lock()  # counters, indexes and storage
+        self._compact_due = False
+        self.events = events if events is not None else Events()
+        self.versions = VersionStore()
+        self.views = LRUCache(view_cache, view_ttl) if view_cache else None
+        self.history = history
+    
+    @contextlib.contextmanager
+    def _locked(self, *keys):
+        """
+        Hold the stripes of the given ISBNs and member IDs, if locking is on.
+        
+        With no keys every stripe is held, which shuts out all other
+        operations. A compaction that came due while the stripes were
+        held is run once they are released.
+        
+        Args:
+            *keys: ISBNs and member IDs the operation reads or changes
+        """
+        if self._locks is None:
+            self._busy += 1
+            try:
+                yield
+            finally:
+                self._busy -= 1
+            if not self._busy and self._book_queue is not None:
+                self._trim_cache()
+            return
+        with self._locks.hold(keys or None):
+            yield
+        if self._compact_due:
+            self._compact_due = False
+            self.compact()
     
-    def add_book(self, title, author, isbn):
+    @property
+    def books(self):
+        """All Book objects in the library, in insertion order."""
+        if self.storage.lazy:
+            return StorageView(self.storage.iter_isbns, self.find_book_by_isbn,
+                               self.storage.count_books)
+        return self._books.values()
+    
+    @property
+    def members(self):
+        """All Member objects registered, in insertion order."""
+        if self.storage.lazy:
+            return StorageView(self.storage.iter_member_ids, self.find_member_by_id,
+                               self.storage.count_members)
+        return self._members.values()
+    
+    def iter_books(self, available=False, author=None, start_after=None, limit=None):
+        """
+        List books a page at a time, in the order they were added.
+        
+        Each filter is answered from an index: available books from the
+        availability bitmap if there is one (otherwise the books are read
+        in order until the page is full), and an author's books from the
+        search index. A page costs about its own length, however deep
+        into the catalog it starts. Books are read live, so a book added
+        or lent between pages shows up as it is when its page is read.
+        
+        Args:
+            available (bool): Only books with a copy on the shelf
+            author (str): Only books by this author, ignoring case
+            start_after (int): Cursor: the slot of the last book already
+                listed (book.slot), or None to start at the beginning
+            limit (int): Most books to list (None = no limit)
+            
+        Returns:
+            iterator: Book objects, generated as they are consumed
+            
+        Raises:
+            ValueError: With a lazy storage backend
+        """
+        if self.storage.lazy:
+            raise ValueError("paged listings need an in-memory storage backend")
+        start = 0 if start_after is None else start_after + 1
+        if author is not None:
+            books = self._search_index().by_author(author, start)
+        elif available and self.availability is not None and self._slots is not None:
+            books = map(self._slots.__getitem__, self.availability.iter_set(start))
+            available = False  # the bitmap has done it
+        elif self._slots is None:
+            books = self._books.iter_from(start)
+        else:
+            books = _occupied(self._slots, start)
+        if available:
+            books = (book for book in books if book.available)
+        return itertools.islice(books, limit)
+    
+    def iter_members(self, with_loans=False, start_after=None, limit=None):
+        """
+        List members a page at a time, in the order they registered.
+        
+        Members holding loans are found from a bitmap with a bit per
+        member, so that filter does not read the other members.
+        
+        Args:
+            with_loans (bool): Only members with a book on loan
+            start_after (int): Cursor: the slot of the last member already
+                listed (member.slot), or None to start at the beginning
+            limit (int): Most members to list (None = no limit)
+            
+        Returns:
+            iterator: Member objects, generated as they are consumed
+            
+        Raises:
+            ValueError: With a lazy storage backend
+        """
+        if self.storage.lazy:
+            raise ValueError("paged listings need an in-memory storage backend")
+        start = 0 if start_after is None else start_after + 1
+        if with_loans:
+            members = map(self._member_slots.__getitem__, self._borrowers.iter_set(start))
+        else:
+            members = _occupied(self._member_slots, start)
+        return itertools.islice(members, limit)
+    
+    def add_book(self, title, author, isbn, copies=1):
         """
         Add a new book to the library.
         
@@ -36,21 +267,164 @@ class Library:
             title (str): The title of the book
             author (str): The author of the book
             isbn (str): The ISBN number of the book
+            copies (int): Number of copies held (default: 1)
             
         Returns:
-            Book: The newly created Book object, or None if ISBN already exists
+            Book: The newly created Book object, or None if ISBN already
+            exists or the copy count is not positive
         """
-        # Check if book with same ISBN already exists
-        if self.find_book_by_isbn(isbn):
-            print(f"Warning: Book with ISBN {isbn} already exists!")
-            return None
+        with self._locked(isbn):
+            # Check if book with same ISBN already exists
+            if self.find_book_by_isbn(isbn):
+                self.events.emit('Warning', 'book_exists', "Book with ISBN {isbn} already exists!",
+                                 isbn=isbn)
+                return None
+            
+            if copies < 1:
+                self.events.emit('Error', 'invalid_copies', "A book needs at least one copy!",
+                                 isbn=isbn)
+                return None
+            
+            book = self._insert_book(title, author, isbn, copies)
+            self._record('add_book', title=title, author=author, isbn=isbn, copies=copies)
+            self.events.emit('Success', 'add_book', "Book added - {title}", isbn=isbn,
+                             title=book.title)
+            return book
+    
+    def add_copies(self, isbn, count=1):
+        """
+        Add more copies of a book already in the library.
         
-        book = Book(title, author, isbn)
-        self.books.append(book)
-        self.borrow_history[isbn] = 0
-        print(f"Success: Book added - {book.title}")
+        Args:
+            isbn (str): The ISBN of the book
+            count (int): Number of copies to add (default: 1)
+            
+        Returns:
+            Book: The updated Book object, or None if not found or count is not positive
+        """
+        with self._locked(isbn):
+            book = self.find_book_by_isbn(isbn)
+            if not book:
+                self.events.emit('Error', 'book_not_found', "Book with ISBN {isbn} not found!",
+                                 isbn=isbn)
+                return None
+            
+            if count < 1:
+                self.events.emit('Error', 'invalid_copies',
+                                 "Number of copies to add must be positive!", isbn=isbn)
+                return None
+            
+            self._add_copies(book, count)
+            self._record('add_copies', isbn=isbn, count=count)
+            self.events.emit('Success', 'add_copies',
+                             "Added {count} copies of '{title}' ({copies} in total)", isbn=isbn,
+                             title=book.title, count=count, copies=book.copies)
+            self._fill_holds(book)
+            return book
+    
+    def _add_copies(self, book, count):
+        """Add copies to a Book and update the indexes."""
+        with self._state_lock:
+            if self.versions.readers:
+                self._keep_book(book.isbn)
+            book.add_copies(count)
+            if self.views is not None:
+                self._changed(isbn=book.isbn)
+            self._total_copies += count
+            if self.availability is not None:
+                self.availability.set(book.slot, True)
+    
+    def add_books(self, records):
+        """
+        Add many books at once, printing one summary line instead of one per book.
+        
+        This is the bulk path used by catalog imports. Books whose ISBN is
+        already in the library are skipped, and the rest are persisted as
+        one storage record.
+        
+        Args:
+            records (iterable): (title, author, isbn, copies) tuples with
+                distinct ISBNs
+                
+        Returns:
+            list: ISBNs skipped because the library already has them
+        """
+        records = list(records)
+        with self._locked(*(isbn for title, author, isbn, copies in records)):
+            new = []
+            existing = []
+            for record in records:
+                if self.find_book_by_isbn(record[2]):
+                    existing.append(record[2])
+                else:
+                    new.append(record)
+            
+            self._insert_books(new)
+            if new:
+                self._record('add_books', items=[list(record) for record in new])
+            self.events.emit('Success', 'add_books', "Added {count} books", count=len(new))
+            if existing:
+                self.events.emit('Warning', 'books_exist',
+                                 "{count} books were already in the library", count=len(existing))
+            return existing
+    
+    def _insert_books(self, records):
+        """Create Books in bulk, indexing their words once at the end."""
+        with self._state_lock:
+            books = []
+            for title, author, isbn, copies in records:
+                book = Book(title, author, isbn, copies=copies)
+                self._index_book(book, search=False)
+                self.borrow_history[isbn] = 0
+                books.append(book)
+            if self.search_index is not None:
+                self.search_index.add_many(books)
+    
+    def _insert_book(self, title, author, isbn, copies=1):
+        """Create a Book and add it to the indexes."""
+        book = Book(title, author, isbn, copies=copies)
+        with self._state_lock:
+            self._index_book(book)
+            self.borrow_history[isbn] = 0
         return book
     
+    def _index_book(self, book, search=True):
+        """Give a Book the next slot and add it to the indexes (search=False: all but search)."""
+        if self.versions.readers:
+            self._keep_book(book.isbn)
+        book.slot = self._next_slot
+        self._next_slot += 1
+        if self._slots is not None:
+            self._slots.append(book)
+        if self.availability is not None:
+            self.availability.append(book.available)
+        self._borrowed_count += book.copies - book.available_copies
+        self._total_copies += book.copies
+        if search and self.search_index is not None:
+            self.search_index.add(book)
+        if self._book_queue is not None:
+            self._book_queue[book.isbn] = None
+        self._books[book.isbn] = book
+        if self.views is not None:
+            self._changed(isbn=book.isbn)
+    
+    def _unindex_book(self, book):
+        """Remove a Book from the indexes and its borrow history."""
+        with self._state_lock:
+            if self.versions.readers:
+                self._keep_book(book.isbn)
+            del self._books[book.isbn]
+            if self._slots is not None:
+                self._slots[book.slot] = None
+            if self.views is not None:
+                self._changed(isbn=book.isbn)
+            self.borrow_history.pop(book.isbn, None)
+            self._total_copies -= book.copies
+            if self.availability is not None:
+                self.availability.set(book.slot, False)
+            if self.search_index is not None:
+                self.search_index.remove(book)
+    
     def register_member(self, name, member_id):
         """
         Register a new member to the library.
@@ -62,19 +436,116 @@ class Library:
         Returns:
             Member: The newly created Member object, or None if ID already exists
         """
-        # Check if member with same ID already exists
-        if self.find_member_by_id(member_id):
-            print(f"Warning: Member with ID {member_id} already exists!")
-            return None
-        
+        with self._locked(member_id):
+            # Check if member with same ID already exists
+            if self.find_member_by_id(member_id):
+                self.events.emit('Warning', 'member_exists',
+                                 "Member with ID {member_id} already exists!", member_id=member_id)
+                return None
+            
+            member = self._insert_member(name, member_id)
+            self._record('register_member', name=name, member_id=member_id)
+            self.events.emit('Success', 'register_member', "Member registered - {name}",
+                             member_id=member_id, name=member.name)
+            return member
+    
+    def _insert_member(self, name, member_id):
+        """Create a Member and add it to the index."""
         member = Member(name, member_id)
-        self.members.append(member)
-        print(f"Success: Member registered - {member.name}")
+        with self._state_lock:
+            if self.versions.readers:
+                self._keep_member(member_id)
+            if self._member_slots is not None:
+                member.slot = len(self._member_slots)
+                self._member_slots.append(member)
+                self._borrowers.append(False)
+            else:
+                self._member_queue[member_id] = None
+            self._members[member_id] = member
+        if self.views is not None:
+            self._changed(member_id=member_id)
+        return member
+    
+    def _delete_member(self, member_id):
+        """Remove a Member from the index, returning it, or None if there is none."""
+        with self._state_lock:
+            if self.versions.readers:
+                self._keep_member(member_id)
+            member = self._members.pop(member_id, None)
+            if member is not None and member.slot >= 0:
+                self._member_slots[member.slot] = None
+        if self.views is not None:
+            self._changed(member_id=member_id)
         return member
     
+    def remove_book(self, isbn):
+        """
+        Remove a book from the library.
+        
+        Args:
+            isbn (str): The ISBN of the book
+            
+        Returns:
+            bool: True if removed, False if not found or any copy is borrowed
+        """
+        with self._locked(isbn):
+            book = self.find_book_by_isbn(isbn)
+            if not book:
+                self.events.emit('Error', 'book_not_found', "Book with ISBN {isbn} not found!",
+                                 isbn=isbn)
+                return False
+            
+            if book.available_copies != book.copies:
+                self.events.emit('Error', 'book_on_loan',
+                                 "'{title}' is currently borrowed and cannot be removed!",
+                                 isbn=isbn, title=book.title)
+                return False
+            
+            self._unindex_book(book)
+            self._record('remove_book', isbn=isbn)
+            self.events.emit('Success', 'remove_book', "Book removed - {title}", isbn=isbn,
+                             title=book.title)
+            return True
+    
+    def remove_member(self, member_id):
+        """
+        Remove a member from the library.
+        
+        Args:
+            member_id (str): The member ID
+            
+        Returns:
+            bool: True if removed, False if not found or still holding books
+        """
+        with self._locked(member_id):
+            member = self.find_member_by_id(member_id)
+            if not member:
+                self.events.emit('Error', 'member_not_found',
+                                 "Member with ID {member_id} not found!", member_id=member_id)
+                return False
+            
+            if member.loans:
+                self.events.emit('Error', 'member_has_loans',
+                                 "{name} still has borrowed books and cannot be removed!",
+                                 member_id=member_id, name=member.name)
+                return False
+            
+            if self.holds.holds_of(member_id):
+                self.events.emit('Error', 'member_has_holds',
+                                 "{name} still has holds and cannot be removed!",
+                                 member_id=member_id, name=member.name)
+                return False
+            
+            self._delete_member(member_id)
+            self._record('remove_member', member_id=member_id)
+            self.events.emit('Success', 'remove_member', "Member removed - {name}",
+                             member_id=member_id, name=member.name)
+            return True
+    
+    @timed('lend', sampled=True)
     def lend_book(self, member_id, isbn):
         """
-        Lend a book to a member.
+        Lend the next free copy of a book to a member.
         
         Args:
             member_id (str): The member ID
@@ -83,25 +554,42 @@ class Library:
         Returns:
             bool: True if successful, False otherwise
         """
-        member = self.find_member_by_id(member_id)
-        book = self.find_book_by_isbn(isbn)
-        
-        if not member:
-            print(f"Error: Member with ID {member_id} not found!")
-            return False
-        
-        if not book:
-            print(f"Error: Book with ISBN {isbn} not found!")
-            return False
-        
-        if member.borrow_book(book):
-            self.borrow_history[isbn] += 1
-            print(f"Success: '{book.title}' borrowed by {member.name}")
-            return True
-        else:
-            print(f"Error: '{book.title}' is currently not available!")
-            return False
+        self._expire_holds()
+        with self._locked(member_id, isbn):
+            member = self.find_member_by_id(member_id)
+            book = self.find_book_by_isbn(isbn)
+            
+            if not member:
+                self.events.emit('Error', 'member_not_found',
+                                 "Member with ID {member_id} not found!", member_id=member_id)
+                return False
+            
+            if not book:
+                self.events.emit('Error', 'book_not_found', "Book with ISBN {isbn} not found!",
+                                 isbn=isbn)
+                return False
+            
+            if isbn in member.loans:
+                self.events.emit('Error', 'already_has_copy',
+                                 "{name} already has a copy of '{title}'!", member_id=member_id,
+                                 isbn=isbn, name=member.name, title=book.title)
+                return False
+            
+            copy = self._lend(member, book)
+            if copy is not None:
+                self._record('lend', member_id=member_id, isbn=isbn, copy=copy,
+                             due=member.loans[isbn].due_at)
+                self.events.emit('Success', 'lend', "'{title}' borrowed by {name}",
+                                 member_id=member_id, isbn=isbn, name=member.name,
+                                 title=book.title, copy=copy)
+                return True
+            else:
+                self.events.emit('Error', 'not_available',
+                                 "'{title}' is currently not available - place a hold to join "
+                                 "the queue!", isbn=isbn, title=book.title)
+                return False
     
+    @timed('return', sampled=True)
     def take_return(self, member_id, isbn):
         """
         Accept a book return from a member.
@@ -113,23 +601,611 @@ class Library:
         Returns:
             bool: True if successful, False otherwise
         """
-        member = self.find_member_by_id(member_id)
-        book = self.find_book_by_isbn(isbn)
+        self._expire_holds()
+        with self._locked(member_id, isbn):
+            member = self.find_member_by_id(member_id)
+            book = self.find_book_by_isbn(isbn)
+            
+            if not member:
+                self.events.emit('Error', 'member_not_found',
+                                 "Member with ID {member_id} not found!", member_id=member_id)
+                return False
+            
+            if not book:
+                self.events.emit('Error', 'book_not_found', "Book with ISBN {isbn} not found!",
+                                 isbn=isbn)
+                return False
+            
+            loan = member.loans.get(isbn)
+            if self._return(member, book):
+                self._record('return', member_id=member_id, isbn=isbn, copy=loan.copy)
+                self.events.emit('Success', 'return', "'{title}' returned by {name}",
+                                 member_id=member_id, isbn=isbn, name=member.name,
+                                 title=book.title)
+                fine = self._fine(loan.due_at, time.time())
+                if fine:
+                    self.events.emit('Warning', 'late_return',
+                                     "'{title}' was returned late - fine {fine:.2f}",
+                                     member_id=member_id, isbn=isbn, title=book.title, fine=fine)
+                self._fill_holds(book)
+                return True
+            else:
+                self.events.emit('Error', 'not_borrowed', "'{title}' was not borrowed by {name}!",
+                                 member_id=member_id, isbn=isbn, name=member.name,
+                                 title=book.title)
+                return False
+    
+    def place_hold(self, member_id, isbn):
+        """
+        Put a member in the queue for a book with no copy on the shelf.
         
-        if not member:
-            print(f"Error: Member with ID {member_id} not found!")
-            return False
+        When a copy comes back it is set aside for the member at the head
+        of the queue, who can then borrow it with lend_book as usual.
         
-        if not book:
-            print(f"Error: Book with ISBN {isbn} not found!")
-            return False
+        Args:
+            member_id (str): The member ID
+            isbn (str): The ISBN of the book
+            
+        Returns:
+            int: The member's place in the queue, or None if no hold was placed
+        """
+        self._expire_holds()
+        with self._locked(member_id, isbn):
+            member = self.find_member_by_id(member_id)
+            book = self.find_book_by_isbn(isbn)
+            
+            if not member:
+                self.events.emit('Error', 'member_not_found',
+                                 "Member with ID {member_id} not found!", member_id=member_id)
+                return None
+            
+            if not book:
+                self.events.emit('Error', 'book_not_found', "Book with ISBN {isbn} not found!",
+                                 isbn=isbn)
+                return None
+            
+            if isbn in member.loans:
+                self.events.emit('Error', 'already_has_copy',
+                                 "{name} already has a copy of '{title}'!", member_id=member_id,
+                                 isbn=isbn, name=member.name, title=book.title)
+                return None
+            
+            if self.holds.has_hold(isbn, member_id):
+                self.events.emit('Warning', 'hold_exists',
+                                 "{name} already has a hold on '{title}'!", member_id=member_id,
+                                 isbn=isbn, name=member.name, title=book.title)
+                return None
+            
+            if book.available:
+                self.events.emit('Error', 'book_available',
+                                 "'{title}' is available - borrow it instead!", isbn=isbn,
+                                 title=book.title)
+                return None
+            
+            with self._state_lock:
+                position = self.holds.place(isbn, member_id)
+            self._record('place_hold', member_id=member_id, isbn=isbn)
+            self.events.emit('Success', 'place_hold',
+                             "Hold placed on '{title}' for {name} (position {position})",
+                             member_id=member_id, isbn=isbn, name=member.name, title=book.title,
+                             position=position)
+            return position
+    
+    def cancel_hold(self, member_id, isbn):
+        """
+        Withdraw a member's hold, passing any copy set aside on to the next in line.
         
-        if member.return_book(book):
-            print(f"Success: '{book.title}' returned by {member.name}")
+        Args:
+            member_id (str): The member ID
+            isbn (str): The ISBN of the book
+            
+        Returns:
+            bool: True if a hold was cancelled, False otherwise
+        """
+        self._expire_holds()
+        with self._locked(member_id, isbn):
+            book = self.find_book_by_isbn(isbn)
+            if not book or not self.holds.has_hold(isbn, member_id):
+                self.events.emit('Error', 'no_hold',
+                                 "Member {member_id} has no hold on ISBN {isbn}!",
+                                 member_id=member_id, isbn=isbn)
+                return False
+            
+            self._release_hold(book, member_id)
+            self._record('cancel_hold', member_id=member_id, isbn=isbn)
+            self.events.emit('Success', 'cancel_hold',
+                             "Hold on '{title}' cancelled for member {member_id}",
+                             member_id=member_id, isbn=isbn, title=book.title)
+            self._fill_holds(book)
             return True
+    
+    @timed('lend_many')
+    def lend_many(self, pairs, atomic=False):
+        """
+        Lend many books at once, e.g. for a self-checkout kiosk.
+        
+        See _batch for how the pairs are validated, applied and persisted.
+        
+        Args:
+            pairs (iterable): (member_id, isbn) pairs
+            atomic (bool): Lend nothing unless every pair is valid
+            
+        Returns:
+            list: One result dict per pair, in input order (see _batch)
+        """
+        return self._batch('lend', pairs, atomic)
+    
+    @timed('return_many')
+    def return_many(self, pairs, atomic=False):
+        """
+        Accept many returns at once, e.g. when emptying the drop box.
+        
+        See _batch for how the pairs are validated, applied and persisted.
+        
+        Args:
+            pairs (iterable): (member_id, isbn) pairs
+            atomic (bool): Return nothing unless every pair is valid
+            
+        Returns:
+            list: One result dict per pair, in input order (see _batch)
+        """
+        return self._batch('return', pairs, atomic)
+    
+    def check_many(self, op, pairs):
+        """
+        Check a batch of lends or returns without applying any of it.
+        
+        Args:
+            op (str): 'lend' or 'return'
+            pairs (iterable): (member_id, isbn) pairs
+            
+        Returns:
+            list: The result dicts lend_many or return_many would give if
+            every pair were applied (see _batch)
+        """
+        pairs = list(pairs)
+        self._expire_holds()
+        with self._locked(*(key for pair in pairs for key in pair)):
+            return self._check_batch(op, pairs)[0]
+    
+    def _batch(self, op, pairs, atomic):
+        """
+        Validate a batch of lends or returns in one pass, then apply it.
+        
+        Each pair is checked against the library as the earlier pairs of
+        the batch would leave it, so repeating a pair or lending more
+        copies of a title than are on the shelf is caught. Nothing is applied until every pair
+        has been checked; with `atomic`, nothing is applied at all if any
+        pair is invalid, otherwise the valid pairs are. The applied pairs
+        are persisted as one storage record and one summary line is printed.
+        
+        Args:
+            op (str): 'lend' or 'return'
+            pairs (iterable): (member_id, isbn) pairs
+            atomic (bool): All-or-nothing instead of best-effort
+            
+        Returns:
+            list: Dicts with 'member_id', 'isbn', 'success' (bool) and
+            'error' (str, or None on success), in input order
+        """
+        pairs = list(pairs)
+        self._expire_holds()
+        with self._locked(*(key for pair in pairs for key in pair)):
+            results, valid = self._check_batch(op, pairs)
+            failed = len(results) - len(valid)
+            if atomic and failed:
+                for result in results:
+                    if result['success']:
+                        result['success'] = False
+                        result['error'] = "Batch aborted"
+                self.events.emit('Error', 'batch_aborted',
+                                 "Batch not applied - {failed} of {count} items are invalid!",
+                                 failed=failed, count=len(results))
+                return results
+            
+            fields = {}
+            if op == 'lend':
+                now = time.time()
+                due = fields['due'] = now + self.loan_days * SECONDS_PER_DAY
+                items = [[member.member_id, book.isbn, self._lend(member, book, now, None, due)]
+                         for member, book in valid]
+            else:
+                items = [[member.member_id, book.isbn, member.loans[book.isbn].copy]
+                         for member, book in valid]
+                for member, book in valid:
+                    self._return(member, book)
+            if items:
+                self._record(op + '_many', items=items, **fields)
+            if op == 'return':
+                for book in {id(book): book for member, book in valid}.values():
+                    self._fill_holds(book)
+            
+            verb = 'Lent' if op == 'lend' else 'Returned'
+            self.events.emit('Success', op + '_many', "{verb} {applied} of {count} books",
+                             verb=verb, applied=len(valid), count=len(results))
+            if failed:
+                self.events.emit('Warning', 'batch_failures',
+                                 "{failed} items failed; see the results for details",
+                                 failed=failed)
+            return results
+    
+    def _check_batch(self, op, pairs):
+        """
+        Check each pair of a batch against the library as the earlier pairs would leave it.
+        
+        The caller holds the locks of every member and book in the batch.
+        
+        Returns:
+            tuple: (result dict per pair, (Member, Book) of each valid pair)
+        """
+        results = []
+        valid = []
+        claimed = set()  # (member ID, ISBN) pairs already in this batch
+        taken = {}  # ISBN -> copies lent by this batch
+        for member_id, isbn in pairs:
+            member = self.find_member_by_id(member_id)
+            book = self.find_book_by_isbn(isbn)
+            if not member:
+                error = f"Member with ID {member_id} not found"
+            elif not book:
+                error = f"Book with ISBN {isbn} not found"
+            elif (member_id, isbn) in claimed:
+                error = f"'{book.title}' appears twice in this batch"
+            elif op == 'lend' and isbn in member.loans:
+                error = f"{member.name} already has a copy of '{book.title}'"
+            elif (op == 'lend' and self.holds.ready_copy(isbn, member_id) is None
+                  and taken.get(isbn, 0) >= book.available_copies):
+                error = f"'{book.title}' is currently not available"
+            elif op == 'return' and isbn not in member.loans:
+                error = f"'{book.title}' was not borrowed by {member.name}"
+            else:
+                error = None
+                claimed.add((member_id, isbn))
+                if op == 'lend' and self.holds.ready_copy(isbn, member_id) is None:
+                    taken[isbn] = taken.get(isbn, 0) + 1
+                valid.append((member, book))
+            results.append({'member_id': member_id, 'isbn': isbn,
+                            'success': error is None, 'error': error})
+        return results, valid
+    
+    def _lend(self, member, book, timestamp=None, copy=None, due=None):
+        """
+        Move a copy of a book to a member and update every index that tracks loans.
+        
+        A copy set aside for the member is the one they get, and their hold
+        on the book ends.
+        
+        Args:
+            member (Member): Borrowing member
+            book (Book): Book to lend
+            timestamp (float): When the loan happened (default: now)
+            copy (int): Particular copy to lend (default: the next free one)
+            due (float): When the book is due back (default: loan_days after the loan)
+            
+        Returns:
+            int: The copy number lent, or None if no copy could be lent
+        """
+        if book.isbn in member.loans:
+            return None
+        if self.holds.ready_copy(book.isbn, member.member_id) is not None:
+            copy = self._release_hold(book, member.member_id)
+        if timestamp is None:
+            timestamp = time.time()
+        if due is None:
+            due = timestamp + self.loan_days * SECONDS_PER_DAY
+        if self.versions.readers:
+            with self._state_lock:
+                self._keep_book(book.isbn)
+                self._keep_member(member.member_id)
+        copy = member.borrow_copy(book, copy, timestamp, due)
+        if copy is None:
+            return None
+        if self.views is not None:
+            self._changed(book.isbn, member.member_id)
+        with self._state_lock:
+            self.dues.add(member.member_id, book.isbn, due)
+            self._holders.setdefault(book.isbn, {})[member.member_id] = member
+            if self.holds.has_hold(book.isbn, member.member_id):
+                self.holds.cancel(book.isbn, member.member_id)
+            count = self.borrow_history[book.isbn] = self.borrow_history[book.isbn] + 1
+            if self._popular is not None:
+                heapq.heappush(self._popular, (-count, book.slot, book.isbn))
+                if len(self._popular) > 2 * len(self._books) + 64:
+                    self._rebuild_popular()
+            self._borrowed_count += 1
+            if len(member.loans) == 1:
+                self._active_members += 1
+                if member.slot >= 0:
+                    self._borrowers.set(member.slot, True)
+            if self.availability is not None and not book.available:
+                self.availability.set(book.slot, False)
+            self.popularity.record(book.isbn, book.author, timestamp)
+        return copy
+    
+    def _return(self, member, book):
+        """
+        Take a copy back from a member and update every index that tracks loans.
+        
+        Returns:
+            bool: True if the member held the book and has returned it
+        """
+        loan = member.loans.get(book.isbn)
+        if loan is None:
+            return False
+        if self.versions.readers:
+            with self._state_lock:
+                self._keep_book(book.isbn)
+                self._keep_member(member.member_id)
+        if not member.return_book(book):
+            return False
+        if self.views is not None:
+            self._changed(book.isbn, member.member_id)
+        with self._state_lock:
+            if loan.due_at is not None:
+                self.dues.remove(member.member_id, book.isbn, loan.due_at)
+            holders = self._holders.get(book.isbn)
+            if holders is not None:
+                holders.pop(member.member_id, None)
+                if not holders:
+                    del self._holders[book.isbn]
+            self._borrowed_count -= 1
+            if not member.loans:
+                self._active_members -= 1
+                if member.slot >= 0:
+                    self._borrowers.set(member.slot, False)
+            if self.availability is not None:
+                self.availability.set(book.slot, True)
+            if self._book_queue is not None:
+                # Both may be unneeded now; see _trim_cache
+                self._book_queue[book.isbn] = None
+                self._member_queue[member.member_id] = None
+        return True
+    
+    def _release_hold(self, book, member_id):
+        """
+        End a member's hold, putting a copy set aside for them back on the shelf.
+        
+        Returns:
+            int: The copy that was set aside, or None if the hold was waiting
+        """
+        with self._state_lock:
+            copy = self.holds.cancel(book.isbn, member_id)
+            if copy is not None:
+                if self.versions.readers:
+                    self._keep_book(book.isbn)
+                book.return_book(copy)
+                if self.views is not None:
+                    self._changed(isbn=book.isbn)
+                if self.availability is not None:
+                    self.availability.set(book.slot, True)
+                if self._book_queue is not None:
+                    self._book_queue[book.isbn] = None
+        return copy
+    
+    def _set_aside(self, book, member_id, copy, deadline):
+        """Take a copy off the shelf and hold it for a member."""
+        with self._state_lock:
+            if self.versions.readers:
+                self._keep_book(book.isbn)
+            if not book.take(copy):
+                return False
+            if self.views is not None:
+                self._changed(isbn=book.isbn)
+            self.holds.set_aside(book.isbn, member_id, copy, deadline)
+            if self.availability is not None and not book.available:
+                self.availability.set(book.slot, False)
+        return True
+    
+    def _keep_book(self, isbn):
+        """Save a book's state for the open snapshots before it changes; hold _state_lock."""
+        self.versions.keep(self.versions.books, isbn, self._books.get(isbn))
+    
+    def _keep_member(self, member_id):
+        """Save a member's state for the open snapshots before it changes; hold _state_lock."""
+        self.versions.keep(self.versions.members, member_id, self._members.get(member_id))
+    
+    def _changed(self, isbn=None, member_id=None):
+        """Drop the cached views of a book and/or member, once it has changed."""
+        if member_id is None:
+            self.views.invalidate(('book', isbn))
+        elif isbn is None:
+            self.views.invalidate(('member', member_id))
+        else:
+            self.views.invalidate(('book', isbn), ('member', member_id))
+    
+    def _fill_holds(self, book):
+        """
+        Set copies on the shelf aside for the members waiting longest for them.
+        
+        Called whenever copies of a book may have come free, with its
+        stripe held. Each step is O(1): the free copy comes from the
+        book's bitmask and the member from the head of the queue.
+        """
+        while book.free:
+            member_id = self.holds.next_waiting(book.isbn)
+            if member_id is None:
+                return
+            copy = (book.free & -book.free).bit_length() - 1
+            deadline = time.time() + self.holds.hold_days * SECONDS_PER_DAY
+            self._set_aside(book, member_id, copy, deadline)
+            self._record('hold_ready', member_id=member_id, isbn=book.isbn,
+                         copy=copy, deadline=deadline)
+            self.events.emit('Info', 'hold_ready',
+                             "A copy of '{title}' is set aside for member {member_id}",
+                             member_id=member_id, isbn=book.isbn, title=book.title, copy=copy)
+    
+    def _expire_holds(self, now=None):
+        """
+        End the ready holds whose pickup deadline has passed.
+        
+        Only the top of the deadline heap is looked at, so this costs
+        nothing when no hold is due; expiring holds is done lazily by
+        the operations that could be affected, not by a periodic scan.
+        
+        Args:
+            now (float): Current time (default: now)
+        """
+        if not self.holds.ready_count:
+            return
+        with self._state_lock:
+            expired = self.holds.expired(time.time() if now is None else now)
+        for isbn, member_id in expired:
+            with self._locked(member_id, isbn):
+                book = self.find_book_by_isbn(isbn)
+                # The copy may have been collected since the deadline was popped
+                if book is None or self.holds.ready_copy(isbn, member_id) is None:
+                    continue
+                self._release_hold(book, member_id)
+                self._record('expire_hold', member_id=member_id, isbn=isbn)
+                self.events.emit('Info', 'expire_hold',
+                                 "Hold on '{title}' for member {member_id} has expired",
+                                 member_id=member_id, isbn=isbn, title=book.title)
+                self._fill_holds(book)
+    
+    def _record(self, op, **fields):
+        """
+        Pass a completed operation to the storage backend, and lends and returns to the history.
+        
+        Args:
+            op (str): Operation name
+            **fields: Operation arguments needed to replay it
+        """
+        with self._state_lock:
+            logged = (self.history is not None and
+                      op in ('lend', 'return', 'lend_many', 'return_many'))
+            if logged:
+                # The journal record gets the same time, so a replay can tell
+                # which of its lends and returns the history already has
+                fields.setdefault('ts', time.time())
+            due = self.storage.record(op, **fields)
+            if logged:
+                if op in ('lend', 'return'):
+                    self.history.append(op, fields['member_id'], fields['isbn'], fields['ts'],
+                                        fields.get('copy'))
+                else:
+                    self.history.append_many(op.split('_')[0], fields['items'], fields['ts'])
+        if due:
+            # A compaction saves, which must wait until this operation's
+            # stripes are released
+            if self._locks is None:
+                self.compact()
+            else:
+                self._compact_due = True
+    
+    def _apply(self, record):
+        """
+        Re-apply one journal record to the in-memory state.
+        
+        Args:
+            record (dict): Journal record produced by _record
+            
+        Returns:
+            bool: True if the record applied cleanly, False otherwise
+        """
+        op = record['op']
+        if op == 'add_book':
+            if record['isbn'] in self._books:
+                return False
+            self._insert_book(record['title'], record['author'], record['isbn'],
+                              record.get('copies', 1))
+        elif op == 'add_books':
+            self._insert_books([item for item in record['items'] if item[2] not in self._books])
+        elif op == 'add_copies':
+            book = self._books.get(record['isbn'])
+            if book is None:
+                return False
+            self._add_copies(book, record['count'])
+        elif op == 'register_member':
+            if record['member_id'] in self._members:
+                return False
+            self._insert_member(record['name'], record['member_id'])
+        elif op == 'remove_book':
+            book = self._books.get(record['isbn'])
+            if book is None:
+                return False
+            self._unindex_book(book)
+        elif op == 'remove_member':
+            if self._delete_member(record['member_id']) is None:
+                return False
+        elif op in ('lend', 'return'):
+            member = self.find_member_by_id(record['member_id'])
+            book = self.find_book_by_isbn(record['isbn'])
+            if not member or not book:
+                return False
+            if op == 'return':
+                applied = self._return(member, book)
+            else:
+                applied = self._lend(member, book, record.get('ts'), record.get('copy'),
+                                     record.get('due')) is not None
+            if applied and self.history is not None and record.get('ts') is not None:
+                self._log_replayed(op, record)
+            return applied
+        elif op == 'place_hold':
+            if self.holds.has_hold(record['isbn'], record['member_id']):
+                return False
+            self.holds.place(record['isbn'], record['member_id'])
+        elif op in ('cancel_hold', 'expire_hold'):
+            book = self.find_book_by_isbn(record['isbn'])
+            if not book or not self.holds.has_hold(record['isbn'], record['member_id']):
+                return False
+            self._release_hold(book, record['member_id'])
+        elif op == 'hold_ready':
+            book = self.find_book_by_isbn(record['isbn'])
+            if not book:
+                return False
+            return self._set_aside(book, record['member_id'], record['copy'], record['deadline'])
+        elif op in ('lend_many', 'return_many'):
+            single = 'lend' if op == 'lend_many' else 'return'
+            ok = True
+            for item in record['items']:
+                # Items journaled before copies were tracked have no copy number
+                copy = item[2] if len(item) > 2 else None
+                ok = self._apply({'op': single, 'ts': record.get('ts'), 'member_id': item[0],
+                                  'isbn': item[1], 'copy': copy, 'due': record.get('due')}) and ok
+            return ok
         else:
-            print(f"Error: '{book.title}' was not borrowed by {member.name}!")
             return False
+        return True
+    
+    def _log_replayed(self, op, record):
+        """
+        Add a replayed lend or return to the history, unless it got there before the crash.
+        
+        The history is only synced now and then, so the journal may hold
+        operations it lost. _record gave both the same time, which is how
+        one the history kept is recognised.
+        
+        Args:
+            op (str): 'lend' or 'return'
+            record (dict): Journal record of the single lend or return
+        """
+        ts = record['ts']
+        member_id, isbn = record['member_id'], record['isbn']
+        events = self.history.query(member_id, isbn, since=ts, until=math.nextafter(ts, math.inf))
+        if not any(event['op'] == op for event in events):
+            self.history.append(op, member_id, isbn, ts, record.get('copy'))
+    
+    def _replay_journal(self):
+        """Apply journaled operations newer than the loaded snapshot."""
+        applied = skipped = 0
+        for record in self.storage.replay():
+            if self._apply(record):
+                applied += 1
+            else:
+                skipped += 1
+        
+        if applied or skipped:
+            self.events.emit('Info', 'journal_replayed', "Replayed {count} journal operations",
+                             count=applied)
+        if skipped:
+            self.events.emit('Warning', 'journal_skipped',
+                             "Skipped {count} journal operations that no longer apply",
+                             count=skipped)
+    
+    def compact(self):
+        """Fold the journal into a fresh snapshot and empty it."""
+        self.events.emit('Info', 'compact', "Compacting journal into snapshot")
+        self.save_data()
     
     def find_book_by_isbn(self, isbn):
         """
@@ -141,10 +1217,36 @@ class Library:
         Returns:
             Book: The Book object if found, None otherwise
         """
-        for book in self.books:
-            if book.isbn == isbn:
-                return book
-        return None
+        if self.events.time_lookups:
+            return self._timed_lookup(isbn)
+        book = self._books.get(isbn)
+        if book is None and self.storage.lazy:
+            book = self._fetch_book(isbn)
+        return book
+    
+    def _timed_lookup(self, isbn):
+        """Find a book as find_book_by_isbn does, counting it and timing a sample."""
+        events = self.events
+        events.lookups += 1
+        start = None if events.lookups % events.sample_every else time.perf_counter()
+        book = self._books.get(isbn)
+        if book is None and self.storage.lazy:
+            book = self._fetch_book(isbn)
+        if start is not None:
+            events.timed('lookup', start)
+        return book
+    
+    def _fetch_book(self, isbn):
+        """Load a book from lazy storage into the indexes, or return None."""
+        data, count = self.storage.fetch_book(isbn)
+        if data is None:
+            return None
+        book = Book.from_dict(data)
+        self._index_book(book)
+        self.borrow_history[isbn] = count
+        if not self._busy:
+            self._trim_cache()
+        return book
     
     def find_member_by_id(self, member_id):
         """
@@ -156,10 +1258,188 @@ class Library:
         Returns:
             Member: The Member object if found, None otherwise
         """
-        for member in self.members:
-            if member.member_id == member_id:
-                return member
-        return None
+        member = self._members.get(member_id)
+        if member is None and self.storage.lazy:
+            data = self.storage.fetch_member(member_id)
+            if data is not None:
+                member = self._members[member_id] = Member.from_dict(data)
+                self._member_queue[member_id] = None
+                for isbn, copy, borrowed_at, due in zip(
+                        data['borrowed_books'], data['borrowed_copies'],
+                        data['borrowed_at'], data['due_at']):
+                    book = self.find_book_by_isbn(isbn)
+                    if book:
+                        member.restore_loan(book, copy, borrowed_at, due)
+                if not self._busy:
+                    self._trim_cache()
+        return member
+    
+    def _trim_cache(self):
+        """
+        Drop the longest cached books and members a lazy backend can fetch again.
+        
+        A book with copies out on loan or set aside, or a member with
+        loans, is shared with loans and holds, so it stays and leaves the
+        queue; _return and _release_hold queue it again. Trimming waits
+        until no operation is in progress, so none loses a record midway.
+        """
+        queue = self._book_queue
+        while len(queue) > self.lazy_cache:
+            isbn, _ = queue.popitem(last=False)
+            book = self._books.get(isbn)
+            if book is not None and book.available_copies == book.copies:
+                del self._books[isbn]
+                self.borrow_history.pop(isbn, None)
+                self._total_copies -= book.copies
+        queue = self._member_queue
+        while len(queue) > self.lazy_cache:
+            member_id, _ = queue.popitem(last=False)
+            member = self._members.get(member_id)
+            if member is not None and not member.loans:
+                del self._members[member_id]
+    
+    def describe_book(self, isbn, form='text'):
+        """
+        Render a book, from the view cache if it is on.
+        
+        Args:
+            isbn (str): The ISBN of the book
+            form (str): 'text', the line listings show, or 'dict', as from to_dict
+            
+        Returns:
+            str or dict: The rendered book, or None if not found; a cached
+            dict is shared, so it must not be changed
+        """
+        return self._describe('book', isbn, form)
+    
+    def describe_member(self, member_id, form='text'):
+        """
+        Render a member, from the view cache if it is on.
+        
+        Args:
+            member_id (str): The member ID
+            form (str): 'text', the member and the books they hold as
+                listings show them, or 'dict', as from to_dict
+                
+        Returns:
+            str or dict: The rendered member, or None if not found; a cached
+            dict is shared, so it must not be changed
+        """
+        return self._describe('member', member_id, form)
+    
+    def _describe(self, kind, key, form):
+        """
+        Render a book or member, caching the result if the view cache is on.
+        
+        Each cache entry holds the forms rendered so far of one record,
+        so a change drops them all at once.
+        """
+        views = self.views
+        if views is not None:
+            forms = views.get((kind, key))
+            if forms is not None and form in forms:
+                return forms[form]
+            since = views.invalidations
+        
+        record = self.find_book_by_isbn(key) if kind == 'book' else self.find_member_by_id(key)
+        if record is None:
+            return None
+        if form == 'dict':
+            view = record.to_dict()
+        else:
+            view = str(record) if kind == 'book' else record.summary()
+        if views is not None:
+            # Skipped if a change may have been caught halfway through
+            views.put((kind, key), {**forms, form: view} if forms else {form: view}, since)
+        return view
+    
+    def get_holders(self, isbn):
+        """
+        Find the members currently holding a copy of a book.
+        
+        Args:
+            isbn (str): The ISBN of the book
+            
+        Returns:
+            list: Member objects, in the order they borrowed it
+        """
+        if self.storage.lazy:
+            return [self.find_member_by_id(member_id)
+                    for member_id in self.storage.iter_holders(isbn)]
+        return list(self._holders.get(isbn, {}).values())
+    
+    def get_loan_history(self, member_id=None, isbn=None, since=None, until=None, limit=None):
+        """
+        List past lends and returns, newest first.
+        
+        Given a member ID or an ISBN, only that member's or book's events
+        are read from the history, e.g. everything a member has borrowed
+        this year, or everyone who has had a book.
+        
+        Args:
+            member_id (str): Only this member's lends and returns
+            isbn (str): Only this book's lends and returns
+            since (float): Only events at or after this time
+            until (float): Only events before this time
+            limit (int): Most events to list (None = all)
+            
+        Returns:
+            list: Dicts with op ('lend' or 'return'), ts, member_id, isbn and copy
+            
+        Raises:
+            ValueError: If the library keeps no loan history
+        """
+        if self.history is None:
+            raise ValueError("this library keeps no loan history")
+        with self._state_lock:
+            return self.history.query(member_id, isbn, since, until, limit)
+    
+    def get_last_borrower(self, isbn, copy=None):
+        """
+        Find the most recent loan of a book, or of one copy of it.
+        
+        Args:
+            isbn (str): The ISBN of the book
+            copy (int): Only loans of this copy
+            
+        Returns:
+            dict: The lend event (as from get_loan_history), or None if never lent
+            
+        Raises:
+            ValueError: If the library keeps no loan history
+        """
+        if self.history is None:
+            raise ValueError("this library keeps no loan history")
+        with self._state_lock:
+            return self.history.last_borrower(isbn, copy)
+    
+    def search_books(self, query, limit=10):
+        """
+        Find books by words (or the start of words) in their title or author.
+        
+        Args:
+            query (str): Words to search for, e.g. "gand dream"
+            limit (int): Maximum number of results
+            
+        Returns:
+            list: Matching Book objects, best match first
+        """
+        if self.storage.lazy:
+            return [book for book in map(self.find_book_by_isbn, self.storage.search(query, limit))
+                    if book is not None]
+        return [book for book, score in self._search_index().search(query, limit)]
+    
+    def _search_index(self):
+        """Return the search index, building it on first use after a columnar load."""
+        if self.search_index is None:
+            with self._state_lock:
+                if self.search_index is None:
+                    # Searching touches every book, so create them all at once
+                    self._books.fetch_all()
+                    search_index = SearchIndex()
+                    search_index.add_many(self._books.values())
+                    self.search_index = search_index
+        return self.search_index
     
     def get_most_borrowed_book(self):
         """
@@ -168,13 +1448,162 @@ class Library:
         Returns:
             tuple: (Book, count) or (None, 0) if no books borrowed
         """
-        if not self.borrow_history or max(self.borrow_history.values()) == 0:
-            return None, 0
+        if self.storage.lazy:
+            isbn, count = self.storage.most_borrowed()
+            return (self.find_book_by_isbn(isbn), count) if isbn else (None, 0)
         
-        most_borrowed_isbn = max(self.borrow_history, key=self.borrow_history.get)
-        book = self.find_book_by_isbn(most_borrowed_isbn)
-        count = self.borrow_history[most_borrowed_isbn]
-        return book, count
+        # Every lend pushes a fresh entry, so drop entries whose count is
+        # out of date or whose book has been removed until the top is current
+        with self._state_lock:
+            if self._popular is None:
+                self._rebuild_popular()
+            heap = self._popular
+            while heap:
+                count, slot, isbn = heap[0]
+                book = self._books.get(isbn)
+                if book is not None and book.slot == slot and self.borrow_history.get(isbn) == -count:
+                    return book, -count
+                heapq.heappop(heap)
+        return None, 0
+    
+    def snapshot(self):
+        """
+        Take a consistent, read-only snapshot of the books, members and report figures.
+        
+        Taking it only waits for the operations in progress and copies
+        nothing; writers then carry on, saving the old state of what they
+        change while the snapshot is open. Close it when done, or use it
+        in a with block.
+        
+        Returns:
+            Snapshot: The library as it is now
+            
+        Raises:
+            ValueError: With a lazy storage backend
+        """
+        if self.storage.lazy:
+            raise ValueError("snapshots need an in-memory storage backend")
+        with self._locked():
+            book, count = self.get_most_borrowed_book()
+            with self._state_lock:
+                version = self.versions.open()
+                figures = {
+                    'total_books': len(self._books),
+                    'total_copies': self._total_copies,
+                    'total_members': len(self._members),
+                    'borrowed_books': self._borrowed_count,
+                    'active_members': self._active_members,
+                    'most_borrowed': (book.copy(), count) if book else (None, 0),
+                }
+            return Snapshot(self, version, figures)
+    
+    def _close_snapshot(self, versions, version):
+        """Release a snapshot taken of `versions`, reclaiming the states it alone needed."""
+        with self._state_lock:
+            versions.close(version)
+    
+    def _rebuild_popular(self):
+        """Rebuild the most-borrowed heap from borrow_history in O(n)."""
+        if isinstance(self.borrow_history, ColumnarCounts):
+            self._popular = self.borrow_history.ranked(self._books)
+        else:
+            self._popular = [(-count, self._books[isbn].slot, isbn)
+                             for isbn, count in self.borrow_history.items()
+                             if count > 0 and isbn in self._books]
+        heapq.heapify(self._popular)
+    
+    def get_top_books(self, k=5, days=30):
+        """
+        Get the most borrowed books over a recent time window.
+        
+        Args:
+            k (int): Number of books to return
+            days (int): Window length in days (7, 30 or 365)
+            
+        Returns:
+            list: (Book, count) pairs, most borrowed first; books removed
+            since they were borrowed are left out
+        """
+        with self._state_lock:
+            ranked = self.popularity.top_titles(k, days)
+        top = []
+        for isbn, count in ranked:
+            book = self.find_book_by_isbn(isbn)
+            if book is not None:
+                top.append((book, count))
+        return top
+    
+    def get_top_authors(self, k=5, days=30):
+        """
+        Get the most borrowed authors over a recent time window.
+        
+        Args:
+            k (int): Number of authors to return
+            days (int): Window length in days (7, 30 or 365)
+            
+        Returns:
+            list: (author, count) pairs, most borrowed first
+        """
+        with self._state_lock:
+            return self.popularity.top_authors(k, days)
+    
+    def get_overdue_loans(self, now=None):
+        """
+        Get the loans past their due date.
+        
+        Args:
+            now (float): Time to check against (default: now)
+            
+        Returns:
+            list: (due time, member ID, ISBN) tuples, most overdue first
+        """
+        now = time.time() if now is None else now
+        if self.storage.lazy:
+            return list(self.storage.iter_due(None, now))
+        with self._state_lock:
+            return self.dues.between(None, now)
+    
+    def get_loans_due(self, hours=24, now=None):
+        """
+        Get the loans falling due within the next few hours.
+        
+        Args:
+            hours (float): How far ahead to look
+            now (float): Time to look ahead from (default: now)
+            
+        Returns:
+            list: (due time, member ID, ISBN) tuples, soonest first
+        """
+        now = time.time() if now is None else now
+        end = now + hours * 3600
+        if self.storage.lazy:
+            return list(self.storage.iter_due(now, end))
+        with self._state_lock:
+            return self.dues.between(now, end)
+    
+    def _fine(self, due, now):
+        """Return the fine for a loan due at `due` as of `now` (0 if not overdue)."""
+        if due is None or now <= due:
+            return 0
+        return round(math.ceil((now - due) / SECONDS_PER_DAY) * self.fine_per_day, 2)
+    
+    def compute_fines(self, now=None):
+        """
+        Work out every member's fines for overdue loans, e.g. at the end of the day.
+        
+        Only the overdue loans are visited, not every member.
+        
+        Args:
+            now (float): Time to compute fines as of (default: now)
+            
+        Returns:
+            dict: Member ID -> total fine, for members with overdue loans
+        """
+        now = time.time() if now is None else now
+        fines = {}
+        for due, member_id, isbn in self.get_overdue_loans(now):
+            fines[member_id] = round(fines.get(member_id, 0) + self._fine(due, now), 2)
+        return fines
     
     def get_active_members_count(self):
         """
@@ -183,29 +1612,120 @@ class Library:
         Returns:
             int: Number of active members
         """
-        return sum(1 for member in self.members if len(member.borrowed_books) > 0)
+        if self.storage.lazy:
+            return self.storage.count_active_members()
+        return self._active_members
     
     def get_borrowed_books_count(self):
         """
-        Get the total number of books currently borrowed.
+        Get the total number of copies currently borrowed.
         
         Returns:
-            int: Number of books currently borrowed
+            int: Number of copies currently borrowed
         """
-        return sum(1 for book in self.books if not book.available)
+        if self.storage.lazy:
+            return self.storage.count_borrowed()
+        return self._borrowed_count
     
-    def display_report(self):
-        """Display library analytics report."""
+    def get_total_copies_count(self):
+        """
+        Get the total number of copies of all books.
+        
+        Returns:
+            int: Number of copies held
+        """
+        if self.storage.lazy:
+            return self.storage.count_copies()
+        return self._total_copies
+    
+    def check_counters(self):
+        """
+        Verify the incrementally maintained report figures against a full recount.
+        
+        Returns:
+            bool: True if every figure matches, False otherwise
+        """
+        if self.storage.lazy:
+            self.events.emit('Info', 'counters_from_storage',
+                             "Report figures come from storage queries; nothing to check")
+            return True
+        
+        ok = True
+        expected = {
+            'Total Copies': (
+                self._total_copies, sum(book.copies for book in self.books)),
+            'Copies Currently Borrowed': (
+                self._borrowed_count,
+                sum(book.copies - book.available_copies for book in self.books)
+                - self.holds.ready_count),
+            'Copies Held by Members': (
+                self._borrowed_count, sum(len(member.loans) for member in self.members)),
+            'Holders Index': (
+                sum(len(holders) for holders in self._holders.values()), self._borrowed_count),
+            'Active Members': (
+                self._active_members, sum(1 for member in self.members if member.loans)),
+            'Loans with Due Dates': (
+                len(self.dues), sum(1 for member in self.members
+                                    for loan in member.loans.values()
+                                    if loan.due_at is not None)),
+        }
+        if self.availability is not None:
+            expected['Available Books (bitmap)'] = (
+                self.availability.count, sum(1 for book in self.books if book.available))
+        
+        book, count = self.get_most_borrowed_book()
+        top = max(self.borrow_history.values(), default=0)
+        expected['Most Borrowed Count'] = (count, top)
+        
+        for name, (maintained, recounted) in expected.items():
+            if maintained != recounted:
+                self.events.emit('Error', 'counter_mismatch',
+                                 "{counter} is {maintained} but a recount gives {recounted}!",
+                                 counter=name, maintained=maintained, recounted=recounted)
+                ok = False
+        if ok:
+            self.events.emit('Success', 'counters_ok', "Report counters match a full recount")
+        return ok
+    
+    def report(self):
+        """
+        Collect the report figures, all as of one moment.
+        
+        Returns:
+            dict: total_books, total_copies, total_members, borrowed_books,
+            active_members and most_borrowed, a (Book, count) pair
+        """
+        if not self.storage.lazy:
+            with self.snapshot() as snapshot:
+                return snapshot.figures
+        return {
+            'total_books': len(self.books),
+            'total_copies': self.get_total_copies_count(),
+            'total_members': len(self.members),
+            'borrowed_books': self.get_borrowed_books_count(),
+            'active_members': self.get_active_members_count(),
+            'most_borrowed': self.get_most_borrowed_book(),
+        }
+    
+    def display_report(self, check=False):
+        """
+        Display library analytics report.
+        
+        Args:
+            check (bool): Also verify the counters against a full recount
+        """
         print("\n" + "=" * 60)
         print("LIBRARY ANALYTICS REPORT")
         print("=" * 60)
         
-        print(f"\nTotal Books in Library: {len(self.books)}")
-        print(f"Total Registered Members: {len(self.members)}")
-        print(f"Books Currently Borrowed: {self.get_borrowed_books_count()}")
-        print(f"Active Members: {self.get_active_members_count()}")
+        figures = self.report()
+        print(f"\nTotal Books in Library: {figures['total_books']}")
+        print(f"Total Copies: {figures['total_copies']}")
+        print(f"Total Registered Members: {figures['total_members']}")
+        print(f"Copies Currently Borrowed: {figures['borrowed_books']}")
+        print(f"Active Members: {figures['active_members']}")
         
-        most_borrowed, count = self.get_most_borrowed_book()
+        most_borrowed, count = figures['most_borrowed']
         if most_borrowed:
             print(f"\nMost Borrowed Book:")
             print(f"   Title: {most_borrowed.title}")
@@ -214,77 +1734,329 @@ class Library:
         else:
             print(f"\nMost Borrowed Book: None (No books borrowed yet)")
         
+        if check:
+            print()
+            self.check_counters()
+        
         print("\n" + "=" * 60)
     
-    def save_data(self, books_file='books.json', members_file='members.json'):
+    def display_popularity_report(self, k=5):
         """
-        Save library data to JSON files.
+        Display the most borrowed titles and authors for each time window.
         
         Args:
-            books_file (str): Filename for books data
-            members_file (str): Filename for members data
+            k (int): Number of entries to show per list
         """
-        try:
-            # Save books
-            books_data = {
-                'books': [book.to_dict() for book in self.books],
-                'borrow_history': self.borrow_history
-            }
-            with open(books_file, 'w') as f:
-                json.dump(books_data, f, indent=4)
-            
-            # Save members
-            members_data = {
-                'members': [member.to_dict() for member in self.members]
-            }
-            with open(members_file, 'w') as f:
-                json.dump(members_data, f, indent=4)
-            
-            print(f"Success: Data saved successfully!")
-            
-        except Exception as e:
-            print(f"Error: Failed to save data - {e}")
+        print("\n" + "=" * 60)
+        print("POPULARITY REPORT")
+        print("=" * 60)
+        
+        for days in self.popularity.windows:
+            print(f"\nLast {days} Days:")
+            top_books = self.get_top_books(k, days)
+            if not top_books:
+                print("   No books borrowed")
+                continue
+            print("   Top Titles:")
+            for i, (book, count) in enumerate(top_books, 1):
+                print(f"   {i}. {book.title} by {book.author} ({count})")
+            print("   Top Authors:")
+            for i, (author, count) in enumerate(self.get_top_authors(k, days), 1):
+                print(f"   {i}. {author} ({count})")
+        
+        print("\n" + "=" * 60)
     
-    def load_data(self, books_file='books.json', members_file='members.json'):
+    def display_overdue_report(self, now=None):
         """
-        Load library data from JSON files.
+        Display the overdue loans with their fines, and the loans due in the next day.
         
         Args:
-            books_file (str): Filename for books data
-            members_file (str): Filename for members data
+            now (float): Time to report as of (default: now)
         """
-        try:
-            # Load books
-            if os.path.exists(books_file):
-                with open(books_file, 'r') as f:
-                    books_data = json.load(f)
-                    self.books = [Book.from_dict(book) for book in books_data.get('books', [])]
-                    self.borrow_history = books_data.get('borrow_history', {})
-                print(f"Info: Loaded {len(self.books)} books from file")
-            else:
-                print(f"Info: No existing books file found, starting fresh")
-            
-            # Load members
-            if os.path.exists(members_file):
-                with open(members_file, 'r') as f:
-                    members_data = json.load(f)
-                    self.members = [Member.from_dict(member) for member in members_data.get('members', [])]
-                
-                # Re-link borrowed books
-                for member_data in members_data.get('members', []):
-                    member = self.find_member_by_id(member_data['member_id'])
-                    for isbn in member_data.get('borrowed_books', []):
-                        book = self.find_book_by_isbn(isbn)
-                        if book and not book.available:
-                            member.borrowed_books.append(book)
+        now = time.time() if now is None else now
+        print("\n" + "=" * 60)
+        print("OVERDUE LOANS REPORT")
+        print("=" * 60)
+        
+        overdue = self.get_overdue_loans(now)
+        if not overdue:
+            print("\nNo loans are overdue")
+        else:
+            print(f"\nOverdue Loans: {len(overdue)}")
+            for due, member_id, isbn in overdue:
+                book = self.find_book_by_isbn(isbn)
+                title = book.title if book else isbn
+                days = math.ceil((now - due) / SECONDS_PER_DAY)
+                print(f"   {title} - member {member_id}, {days} days late, "
+                      f"fine {self._fine(due, now):.2f}")
+            fines = self.compute_fines(now)
+            print(f"\nTotal Fines: {sum(fines.values()):.2f} owed by {len(fines)} members")
+        
+        print(f"Loans Due in the Next 24 Hours: {len(self.get_loans_due(24, now))}")
+        print("\n" + "=" * 60)
+    
+    @timed('save')
+    def save_data(self, books_file=None, members_file=None):
+        """
+        Save library data through the storage backend.
+        
+        With JSON storage, both files are written as one snapshot
+        generation: each is written to a temporary file, fsynced and then
+        renamed over the old one, which is kept as a `.prev` backup.
+        
+        Args:
+            books_file (str): Filename for books data (JSON storage only)
+            members_file (str): Filename for members data (JSON storage only)
+        """
+        with self._locked():
+            try:
+                if self.history is not None:
+                    # The journal is emptied by the save, so it can no longer
+                    # restore lends and returns the history has not synced
+                    self.history.sync()
+                self.storage.save(self, books_file, members_file)
+                self.events.emit('Success', 'save', "Data saved successfully!")
                 
-                print(f"Info: Loaded {len(self.members)} members from file")
+            except Exception as e:
+                self.events.emit('Error', 'save_failed', "Failed to save data - {error}",
+                                 error=str(e))
+    
+    @timed('load')
+    def load_data(self, books_file=None, members_file=None, progress_every=100000):
+        """
+        Load library data through the storage backend.
+        
+        With JSON storage the snapshot files are streamed: each book and
+        member is built and indexed as soon as it is parsed, so the whole
+        file is never held in memory. The newest snapshot generation that
+        both files agree on is used, falling back to the `.prev` backups
+        if the current files are truncated or fail their checksum.
+        Operations journaled after that snapshot are then replayed on top.
+        
+        Args:
+            books_file (str): Filename for books data (JSON storage only)
+            members_file (str): Filename for members data (JSON storage only)
+            progress_every (int): Report progress every this many records (0 = never)
+        """
+        if self.views is not None:
+            self.views.clear()
+        if self.storage.lazy:
+            popularity = PopularityTracker(self.popularity.windows)
+            for day, isbn, author, count in self.storage.iter_daily_borrows(popularity.windows[-1]):
+                popularity.record(isbn, author, day * SECONDS_PER_DAY, count)
+            self.popularity = popularity
+            holds = HoldQueues(self.holds.hold_days)
+            for hold in self.storage.iter_holds():
+                holds.load(*hold)
+            self.holds = holds
+            self.events.emit('Info', 'opened',
+                             "Opened {books} books and {members} members from {path}",
+                             books=self.storage.count_books(),
+                             members=self.storage.count_members(), path=self.storage.path)
+            return
+        
+        try:
+            for books_reader, members_reader in self.storage.load(books_file, members_file):
+                try:
+                    self._load_snapshot(books_reader, members_reader, progress_every)
+                    break
+                except SnapshotError as e:
+                    self.events.emit('Warning', 'snapshot_unreadable', "{error}", error=str(e))
+                    self.events.emit('Warning', 'snapshot_fallback',
+                                     "Falling back to the previous snapshot generation")
             else:
-                print(f"Info: No existing members file found, starting fresh")
+                raise SnapshotError("no readable snapshot generation found")
                 
-        except json.JSONDecodeError as e:
-            print(f"Error: Corrupted JSON file - {e}")
-            print(f"Info: Starting with empty library")
+        except SnapshotError as e:
+            self.events.emit('Error', 'load_failed', "Corrupted snapshot - {error}", error=str(e))
+            self.events.emit('Info', 'start_empty', "Starting with empty library")
+            return
         except Exception as e:
-            print(f"Error: Failed to load data - {e}")
-            print(f"Info: Starting with empty library")
+            self.events.emit('Error', 'load_failed', "Failed to load data - {error}", error=str(e))
+            self.events.emit('Info', 'start_empty', "Starting with empty library")
+            return
+        
+        self.storage.accept(books_reader, members_reader)
+        self._replay_journal()
+    
+    def _load_snapshot(self, books_reader, members_reader, progress_every):
+        """
+        Build the library from streamed snapshot records.
+        
+        The new indexes are only installed once both files have been read
+        and verified, so a failed attempt leaves the library unchanged.
+        
+        Args:
+            books_reader: Books SnapshotReader or ColumnReader, or None if absent
+            members_reader (SnapshotReader): Members snapshot, or None if absent
+            progress_every (int): Report progress every this many records (0 = never)
+            
+        Raises:
+            SnapshotError: If either file fails verification
+        """
+        books = {}
+        borrow_history = {}
+        members = {}
+        availability = AvailabilityBitmap() if self.availability is not None else None
+        member_slots = []
+        borrowers = AvailabilityBitmap()
+        popularity = PopularityTracker(self.popularity.windows)
+        search_index = SearchIndex()
+        holds = HoldQueues(self.holds.hold_days)
+        dues = DueIndex(self.dues.bucket_seconds)
+        holders = {}
+        borrowed_count = 0
+        total_copies = 0
+        active_members = 0
+        
+        # Load books: a columnar snapshot is mapped rather than read, and its
+        # Books, search index and most-borrowed heap are built on demand
+        columnar = isinstance(books_reader, ColumnReader)
+        if columnar:
+            books_reader.open()
+            books = ColumnarBooks(books_reader)
+            borrow_history = ColumnarCounts(books_reader)
+            for day in books_reader.extra.get('popularity', {}).items():
+                popularity.load_day(*day)
+            borrowed_count = books_reader.off_shelf
+            total_copies = books_reader.total_copies
+            if availability is not None:
+                for slot in range(len(books_reader)):
+                    availability.append(books_reader.free_mask(slot) != 0)
+            search_index = None
+        elif books_reader is not None:
+            for key, value in books_reader:
+                if key == 'books':
+                    book = Book.from_dict(value)
+                    book.slot = len(books)
+                    borrowed_count += book.copies - book.available_copies
+                    total_copies += book.copies
+                    if availability is not None:
+                        availability.append(book.available)
+                    books[book.isbn] = book
+                    if progress_every and len(books) % progress_every == 0:
+                        self.events.emit('Info', 'load_progress', "Loading books... {count}",
+                                         count=len(books))
+                elif key == 'borrow_history':
+                    isbn, count = value
+                    borrow_history[isbn] = count
+                elif key == 'popularity':
+                    popularity.load_day(*value)
+        
+        if not columnar:
+            search_index.add_many(books.values())
+        
+        # Load members, re-linking borrowed books as each one arrives
+        if members_reader is not None:
+            for key, value in members_reader:
+                if key == 'holds':
+                    holds.load(*value)
+                    continue
+                if key != 'members':
+                    continue
+                member = Member.from_dict(value)
+                isbns = value.get('borrowed_books', [])
+                # Snapshots from before copies were tracked hold copy 0, and
+                # loans from before due dates were tracked have none
+                none = [None] * len(isbns)
+                for isbn, copy, borrowed_at, due in zip(
+                        isbns, value.get('borrowed_copies') or [0] * len(isbns),
+                        value.get('borrowed_at') or none, value.get('due_at') or none):
+                    book = books.get(isbn)
+                    if book and member.restore_loan(book, copy, borrowed_at, due):
+                        holders.setdefault(isbn, {})[member.member_id] = member
+                        if due is not None:
+                            dues.add(member.member_id, isbn, due)
+                members[member.member_id] = member
+                member.slot = len(member_slots)
+                member_slots.append(member)
+                borrowers.append(bool(member.loans))
+                if member.loans:
+                    active_members += 1
+                if progress_every and len(members) % progress_every == 0:
+                    self.events.emit('Info', 'load_progress', "Loading members... {count}",
+                                     count=len(members))
+        
+        self._books = books
+        self._next_slot = len(books)
+        self._slots = None if columnar else list(books.values())
+        self.availability = availability
+        self.borrow_history = borrow_history
+        self.popularity = popularity
+        self.search_index = search_index
+        self.holds = holds
+        self.dues = dues
+        self._holders = holders
+        self._members = members
+        self._member_slots = member_slots
+        self._borrowers = borrowers
+        # Open snapshots keep the indexes and versions they were taken of
+        self.versions = VersionStore()
+        # Copies set aside for holds are off the shelf but not on loan
+        self._borrowed_count = borrowed_count - holds.ready_count
+        self._total_copies = total_copies
+        self._active_members = active_members
+        if columnar:
+            self._popular = None
+        else:
+            self._rebuild_popular()
+        
+        if books_reader is not None:
+            self.events.emit('Info', 'books_loaded', "Loaded {count} books from file",
+                             count=len(self.books))
+        else:
+            self.events.emit('Info', 'no_books_file',
+                             "No existing books file found, starting fresh")
+        if members_reader is not None:
+            self.events.emit('Info', 'members_loaded', "Loaded {count} members from file",
+                             count=len(self.members))
+        else:
+            self.events.emit('Info', 'no_members_file',
+                             "No existing members file found, starting fresh")
+    
+    def close(self):
+        """Flush and close the storage backend and the loan history."""
+        self.storage.close()
+        if self.history is not None:
+            self.history.close()
+
+
+def _occupied(slots, start):
+    """Yield the records in a slot table from `start` on, skipping removed ones."""
+    index = start
+    while index < len(slots):
+        record = slots[index]
+        if record is not None:
+            yield record
+        index += 1
+
+
+class StorageView:
+    """
+    Iterable, sized view over records held by a lazy storage backend.
+    
+    Records are materialized through the Library's lookup methods, so the
+    objects yielded are the same ones the Library hands out elsewhere.
+    """
+    
+    def __init__(self, keys, lookup, count):
+        """
+        Initialize the view.
+        
+        Args:
+            keys (callable): Returns an iterator over record keys in order
+            lookup (callable): Maps a key to its object
+            count (callable): Returns the number of records
+        """
+        self._keys = keys
+        self._lookup = lookup
+        self._count = count
+    
+    def __iter__(self):
+        """Yield each record's object in order."""
+        for key in self._keys():
+            yield self._lookup(key)
+    
+    def __len__(self):
+        """Return the number of records."""
+        return self._count()
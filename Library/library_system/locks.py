@@ -0,0 +1,69 @@
+"""
+Library Inventory System - Locks Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Striped locks that let circulation desks work in parallel
+"""
+
+import contextlib
+import threading
+
+
+class StripedLocks:
+    """
+    A fixed pool of locks shared out among keys by hash.
+    
+    Operations on keys that fall in different stripes proceed in parallel,
+    while memory stays bounded however many books and members there are.
+    Several keys are always locked in increasing stripe order, so two
+    threads locking overlapping sets of keys can never deadlock.
+    
+    Attributes:
+        stripes (int): Number of locks in the pool
+    """
+    
+    def __init__(self, stripes=64):
+        """
+        Initialize the lock pool.
+        
+        Args:
+            stripes (int): Number of locks in the pool
+        """
+        self.stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+    
+    def stripe(self, key):
+        """
+        Return the stripe number that guards a key.
+        
+        Args:
+            key (str): ISBN or member ID
+            
+        Returns:
+            int: Index of the lock for this key
+        """
+        return hash(key) % self.stripes
+    
+    @contextlib.contextmanager
+    def hold(self, keys=None):
+        """
+        Hold the locks for a set of keys for the duration of a with block.
+        
+        Args:
+            keys (iterable): Keys to lock; None locks every stripe
+        """
+        if keys is None:
+            indexes = range(self.stripes)
+        else:
+            indexes = sorted({self.stripe(key) for key in keys})
+        
+        acquired = []
+        try:
+            for index in indexes:
+                self._locks[index].acquire()
+                acquired.append(index)
+            yield
+        finally:
+            for index in reversed(acquired):
+                self._locks[index].release()
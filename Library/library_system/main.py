@@ -6,7 +6,15 @@ Assignment: Programming for Problem Solving Using Python - Assignment 3
 Description: Main entry point for the library management system with interactive menu
 """
 
+import itertools
+import sys
+import time
+from events import Events
+from history import LoanHistory
+from journal import Journal
 from library import Library
+from popularity import SECONDS_PER_DAY
+from storage import ColumnarStorage, SQLiteStorage
 
 
 def display_menu():
@@ -21,7 +29,12 @@ def display_menu():
     print("5. View Library Report")
     print("6. View All Books")
     print("7. View All Members")
-    print("8. Exit")
+    print("8. View Popularity Rankings")
+    print("9. Search Books")
+    print("10. Place or Cancel Hold")
+    print("11. View Overdue Loans")
+    print("12. View Loan History")
+    print("13. Exit")
     print("=" * 60)
 
 
@@ -31,9 +44,18 @@ def add_book_menu(library):
     title = input("Enter book title: ").strip()
     author = input("Enter author name: ").strip()
     isbn = input("Enter ISBN: ").strip()
+    copies = input("Enter number of copies (default 1): ").strip() or "1"
     
-    if title and author and isbn:
-        library.add_book(title, author, isbn)
+    book = library.find_book_by_isbn(isbn) if isbn else None
+    if not copies.isdigit() or int(copies) < 1:
+        print("Error: Number of copies must be a positive whole number!")
+    elif book and (title, author) != (book.title, book.author):
+        print(f"Error: ISBN {isbn} is already used by '{book.title}' by {book.author}!")
+    elif book:
+        # Same book again means more copies of the title already held
+        library.add_copies(isbn, int(copies))
+    elif title and author and isbn:
+        library.add_book(title, author, isbn, int(copies))
     else:
         print("Error: All fields are required!")
 
@@ -74,32 +96,151 @@ def return_book_menu(library):
         print("Error: All fields are required!")
 
 
+def hold_menu(library):
+    """Handle placing or cancelling a hold."""
+    print("\n--- Place or Cancel Hold ---")
+    member_id = input("Enter member ID: ").strip()
+    isbn = input("Enter book ISBN: ").strip()
+    action = input("Place or cancel hold (p/c): ").strip().lower()
+    
+    if not (member_id and isbn):
+        print("Error: All fields are required!")
+    elif action == 'p':
+        library.place_hold(member_id, isbn)
+    elif action == 'c':
+        library.cancel_hold(member_id, isbn)
+    else:
+        print("Error: Please enter 'p' to place or 'c' to cancel!")
+
+
+PAGE_SIZE = 20  # records shown before asking whether to go on
+
+
+def show_pages(fetch, render, empty, cursor_of=lambda record: record.slot):
+    """
+    Print records a page at a time, fetching each page only when it is asked for.
+    
+    Args:
+        fetch (callable): Given the cursor of the last record shown (None at
+            first), returns at most PAGE_SIZE more records
+        render (callable): Formats one record
+        empty (str): Message printed if there are no records at all
+        cursor_of (callable): Gives a record's cursor (default: its slot)
+    """
+    shown = 0
+    cursor = None
+    while True:
+        page = list(fetch(cursor))
+        for record in page:
+            shown += 1
+            print(f"{shown}. {render(record)}")
+        if len(page) < PAGE_SIZE:
+            break
+        cursor = cursor_of(page[-1])
+        if input(f"-- {shown} shown; Enter for more, q to stop: ").strip().lower() == 'q':
+            break
+    if not shown:
+        print(empty)
+
+
 def view_all_books(library):
-    """Display all books in the library."""
+    """Display the books in the library, optionally only those available or by one author."""
     print("\n--- All Books in Library ---")
-    if not library.books:
-        print("No books in the library yet.")
+    available = input("Only books on the shelf? (y/n): ").strip().lower() == 'y'
+    author = input("Only books by author (Enter for all): ").strip() or None
+    
+    if library.storage.lazy:
+        # No slot indexes to page from; filter the books as they stream in
+        books = (book for book in library.books
+                 if (book.available or not available)
+                 and (author is None or book.author.casefold() == author.casefold()))
+        
+        def fetch(cursor):
+            return itertools.islice(books, PAGE_SIZE)
     else:
-        for i, book in enumerate(library.books, 1):
-            print(f"{i}. {book}")
+        # Pages come straight from the slot indexes; the menu is the only
+        # writer, so nothing changes between one page and the next
+        def fetch(cursor):
+            return library.iter_books(available, author, cursor, PAGE_SIZE)
+    
+    empty = "No matching books found." if available or author else "No books in the library yet."
+    show_pages(fetch, str, empty)
 
 
 def view_all_members(library):
-    """Display all registered members."""
+    """Display the registered members, optionally only those with books on loan."""
     print("\n--- All Registered Members ---")
-    if not library.members:
-        print("No members registered yet.")
+    with_loans = input("Only members with books on loan? (y/n): ").strip().lower() == 'y'
+    
+    if library.storage.lazy:
+        members = (member for member in library.members if member.loans or not with_loans)
+        
+        def fetch(cursor):
+            return itertools.islice(members, PAGE_SIZE)
+    else:
+        def fetch(cursor):
+            return library.iter_members(with_loans, cursor, PAGE_SIZE)
+    
+    empty = "No members have books on loan." if with_loans else "No members registered yet."
+    show_pages(fetch, lambda member: member.summary(), empty)
+
+
+def loan_history_menu(library):
+    """Display past lends and returns of a member or a book, newest first."""
+    print("\n--- Loan History ---")
+    member_id = input("Enter Member ID (Enter for any): ").strip() or None
+    isbn = input("Enter ISBN (Enter for any): ").strip() or None
+    days = input("Only the last how many days? (Enter for all): ").strip()
+    
+    if member_id is None and isbn is None:
+        print("Error: A member ID or an ISBN is required!")
+        return
+    try:
+        since = time.time() - float(days) * SECONDS_PER_DAY if days else None
+    except ValueError:
+        print("Error: Days must be a number!")
+        return
+    
+    events = iter(library.get_loan_history(member_id, isbn, since))
+    
+    def fetch(cursor):
+        return itertools.islice(events, PAGE_SIZE)
+    
+    def render(event):
+        book = library.find_book_by_isbn(event['isbn'])
+        title = book.title if book else event['isbn']
+        when = time.strftime('%Y-%m-%d %H:%M', time.localtime(event['ts']))
+        copy = f", copy {event['copy']}" if event['copy'] is not None else ""
+        return f"{when} {event['op']:<6} '{title}' - member {event['member_id']}{copy}"
+    
+    show_pages(fetch, render, "No loans found.", cursor_of=lambda event: None)
+
+
+def search_books_menu(library):
+    """Handle searching books by title or author."""
+    print("\n--- Search Books ---")
+    query = input("Enter words from the title or author: ").strip()
+    
+    if not query:
+        print("Error: Search text is required!")
+        return
+    
+    results = library.search_books(query)
+    if not results:
+        print("No matching books found.")
     else:
-        for i, member in enumerate(library.members, 1):
-            print(f"{i}. {member}")
-            if member.borrowed_books:
-                print("   Borrowed Books:")
-                for book in member.borrowed_books:
-                    print(f"   - {book.title} (ISBN: {book.isbn})")
+        for i, book in enumerate(results, 1):
+            print(f"{i}. {book}")
 
 
 def main():
-    """Main application entry point."""
+    """
+    Main application entry point.
+    
+    Usage: python main.py [--db library.db | --columns]
+    With --db the library is stored in SQLite instead of JSON files; with
+    --columns books are kept in a memory-mapped columnar file (books.col).
+    """
     # Display welcome message
     print("\n" + "=" * 60)
     print("WELCOME TO THE LIBRARY INVENTORY SYSTEM")
@@ -109,8 +250,19 @@ def main():
     print("MCA (AI & ML) - Semester I")
     print("=" * 60)
     
-    # Initialize library
-    library = Library()
+    # Initialize library with a journal so no transaction is lost on a crash,
+    # or on an SQLite database if one was requested; every lend and return
+    # is also logged to the loan history
+    events = Events()
+    history = LoanHistory('history', events=events)
+    if len(sys.argv) == 3 and sys.argv[1] == '--db':
+        library = Library(storage=SQLiteStorage(sys.argv[2]), history=history, events=events)
+    elif sys.argv[1:] == ['--columns']:
+        library = Library(storage=ColumnarStorage(journal=Journal('journal.log', events=events)),
+                          history=history, events=events)
+    else:
+        library = Library(journal=Journal('journal.log', events=events), history=history,
+                          events=events)
     
     # Load existing data
     print("\nLoading existing data...")
@@ -119,7 +271,7 @@ def main():
     # Main menu loop
     while True:
         display_menu()
-        choice = input("\nEnter your choice (1-8): ").strip()
+        choice = input("\nEnter your choice (1-13): ").strip()
         
         if choice == '1':
             add_book_menu(library)
@@ -136,13 +288,24 @@ def main():
         elif choice == '7':
             view_all_members(library)
         elif choice == '8':
+            library.display_popularity_report()
+        elif choice == '9':
+            search_books_menu(library)
+        elif choice == '10':
+            hold_menu(library)
+        elif choice == '11':
+            library.display_overdue_report()
+        elif choice == '12':
+            loan_history_menu(library)
+        elif choice == '13':
             print("\nSaving data...")
             library.save_data()
+            library.close()
             print("\nThank you for using the Library Management System!")
             print("=" * 60)
             break
         else:
-            print("\nError: Invalid choice! Please enter a number between 1 and 8.")
+            print("\nError: Invalid choice! Please enter a number between 1 and 13.")
     
     print("\nThanks!\n")
 
@@ -7,6 +7,35 @@ Description: Member class to represent library members and their borrowed books
 """
 
 
+class Loan:
+    """
+    One copy of a book held by a member.
+    
+    Attributes:
+        book (Book): The Book borrowed
+        copy (int): Number of the copy held
+        borrowed_at (float): When the loan was made (None if not tracked)
+        due_at (float): When the book is due back (None if not tracked)
+    """
+    
+    __slots__ = ('book', 'copy', 'borrowed_at', 'due_at')
+    
+    def __init__(self, book, copy, borrowed_at=None, due_at=None):
+        """
+        Initialize a Loan object.
+        
+        Args:
+            book (Book): The Book borrowed
+            copy (int): Number of the copy held
+            borrowed_at (float): When the loan was made
+            due_at (float): When the book is due back
+        """
+        self.book = book
+        self.copy = copy
+        self.borrowed_at = borrowed_at
+        self.due_at = due_at
+
+
 class Member:
     """
     Represents a library member.
@@ -14,9 +43,18 @@ class Member:
     Attributes:
         name (str): The name of the member
         member_id (str): The unique member ID
-        borrowed_books (list): List of Book objects currently borrowed by the member
+        loans (dict): ISBN -> Loan for each book the member holds, in the
+            order borrowed; loans made before due dates were tracked have none
+        borrowed_books (list): Book objects currently borrowed (read-only)
+        slot (int): Position assigned by the Library, in registration order (-1 if none)
+        
+    A member holds at most one copy of each title, so loans are keyed by
+    ISBN and borrowing, returning and checking a loan are O(1) however
+    many books the member has.
     """
     
+    __slots__ = ('name', 'member_id', 'loans', 'slot')
+    
     def __init__(self, name, member_id):
         """
         Initialize a Member object.
@@ -27,23 +65,75 @@ class Member:
         """
         self.name = name
         self.member_id = member_id
-        self.borrowed_books = []
+        self.loans = {}
+        self.slot = -1
+    
+    @property
+    def borrowed_books(self):
+        """Book objects currently borrowed, in the order borrowed."""
+        return [loan.book for loan in self.loans.values()]
     
-    def borrow_book(self, book):
+    def borrow_book(self, book, copy=None, borrowed_at=None, due_at=None):
         """
-        Borrow a book for the member.
+        Borrow a copy of a book for the member.
         
         Args:
             book (Book): The Book object to borrow
+            copy (int): Particular copy to take (default: the next free one)
+            borrowed_at (float): When the loan was made
+            due_at (float): When the book is due back
             
         Returns:
-            bool: True if successful, False if book is not available
+            bool: True if successful, False if no copy is available or the
+            member already holds one
         """
-        if book.borrow():
-            self.borrowed_books.append(book)
-            return True
-        else:
+        return self.borrow_copy(book, copy, borrowed_at, due_at) is not None
+    
+    def borrow_copy(self, book, copy=None, borrowed_at=None, due_at=None):
+        """
+        Borrow a copy of a book for the member and say which copy it was.
+        
+        Args:
+            book (Book): The Book object to borrow
+            copy (int): Particular copy to take (default: the next free one)
+            borrowed_at (float): When the loan was made
+            due_at (float): When the book is due back
+            
+        Returns:
+            int: The copy number borrowed, or None if no copy is available
+            or the member already holds one
+        """
+        if book.isbn in self.loans:
+            return None
+        if copy is None:
+            copy = book.borrow_copy()
+        elif not book.take(copy):
+            copy = None
+        if copy is not None:
+            self._hold(book, copy, borrowed_at, due_at)
+        return copy
+    
+    def restore_loan(self, book, copy=0, borrowed_at=None, due_at=None):
+        """
+        Re-link a saved loan to a book whose copy is already marked as out.
+        
+        Args:
+            book (Book): The Book object the member holds
+            copy (int): Copy number held
+            borrowed_at (float): When the loan was made
+            due_at (float): When the book is due back
+            
+        Returns:
+            bool: True if the loan is consistent with the book and was linked
+        """
+        if book.isbn in self.loans or copy >= book.copies or book.free & (1 << copy):
             return False
+        self._hold(book, copy, borrowed_at, due_at)
+        return True
+    
+    def _hold(self, book, copy, borrowed_at, due_at):
+        """Record that the member holds a copy of a book."""
+        self.loans[book.isbn] = Loan(book, copy, borrowed_at, due_at)
     
     def return_book(self, book):
         """
@@ -55,12 +145,27 @@ class Member:
         Returns:
             bool: True if successful, False if book was not borrowed by this member
         """
-        if book in self.borrowed_books:
-            if book.return_book():
-                self.borrowed_books.remove(book)
-                return True
+        loan = self.loans.get(book.isbn)
+        if loan is not None and book.return_book(loan.copy):
+            del self.loans[book.isbn]
+            return True
         return False
     
+    def copy(self):
+        """
+        Copy the member as they are now, e.g. for a snapshot of the library.
+        
+        The Loans are shared with the original, which never changes a
+        Loan once made.
+        
+        Returns:
+            Member: A new Member holding the same loans, in the same slot
+        """
+        member = Member(self.name, self.member_id)
+        member.loans = dict(self.loans)
+        member.slot = self.slot
+        return member
+    
     def to_dict(self):
         """
         Convert member object to dictionary for file storage.
@@ -68,10 +173,14 @@ class Member:
         Returns:
             dict: Dictionary representation of the member
         """
+        loans = self.loans.values()
         return {
             'name': self.name,
             'member_id': self.member_id,
-            'borrowed_books': [book.isbn for book in self.borrowed_books]
+            'borrowed_books': [loan.book.isbn for loan in loans],
+            'borrowed_copies': [loan.copy for loan in loans],
+            'borrowed_at': [loan.borrowed_at for loan in loans],
+            'due_at': [loan.due_at for loan in loans]
         }
     
     @classmethod
@@ -91,11 +200,25 @@ class Member:
         )
         return member
     
+    def summary(self):
+        """
+        Describe the member and the books they hold, as the member listing shows them.
+        
+        Returns:
+            str: One line for the member, then one per book borrowed
+        """
+        lines = [str(self)]
+        if self.loans:
+            lines.append("   Borrowed Books:")
+            lines.extend(f"   - {loan.book.title} (ISBN: {loan.book.isbn})"
+                         for loan in self.loans.values())
+        return "\n".join(lines)
+    
     def __str__(self):
         """String representation of the member."""
-        book_count = len(self.borrowed_books)
+        book_count = len(self.loans)
         return f"Member: {self.name} (ID: {self.member_id}) - Borrowed Books: {book_count}"
     
     def __repr__(self):
         """Developer-friendly representation of the member."""
-        return f"Member(name='{self.name}', member_id='{self.member_id}', borrowed_books={len(self.borrowed_books)})"
+        return f"Member(name='{self.name}', member_id='{self.member_id}', borrowed_books={len(self.loans)})"
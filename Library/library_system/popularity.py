@@ -0,0 +1,157 @@
+"""
+Library Inventory System - Popularity Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Time-windowed top-K rankings of borrowed titles and authors
+"""
+
+import heapq
+import time
+from operator import itemgetter
+
+
+SECONDS_PER_DAY = 86400
+
+
+class PopularityTracker:
+    """
+    Counts borrows in one bucket per day and keeps a running total per window.
+    
+    Only the buckets of the longest window are kept, so memory is bounded
+    by the number of titles and authors borrowed in that many days. Each
+    window (e.g. the last 7, 30 and 365 days) has its own running totals,
+    which are updated as borrows arrive and as old buckets fall out of the
+    window. A top-K query therefore only looks at the titles borrowed
+    within the window, never at the full history.
+    
+    Attributes:
+        windows (tuple): Window lengths in days
+        today (int): Day number (days since the epoch) of the newest bucket
+    """
+    
+    def __init__(self, windows=(7, 30, 365)):
+        """
+        Initialize an empty tracker.
+        
+        Args:
+            windows (tuple): Window lengths in days
+        """
+        self.windows = tuple(sorted(windows))
+        self.today = None
+        self._buckets = {}  # day -> (ISBN counts, author counts)
+        self._totals = {days: ({}, {}) for days in self.windows}
+    
+    def record(self, isbn, author, timestamp=None, count=1):
+        """
+        Count one or more borrows of a book.
+        
+        Args:
+            isbn (str): ISBN of the borrowed book
+            author (str): Author of the borrowed book
+            timestamp (float): When it was borrowed (default: now)
+            count (int): Number of borrows to count
+        """
+        day = int((time.time() if timestamp is None else timestamp) // SECONDS_PER_DAY)
+        self._add(day, 0, isbn, count)
+        self._add(day, 1, author, count)
+    
+    def _add(self, day, which, key, count):
+        """Add to one ISBN (which=0) or author (which=1) count for a day and its windows."""
+        if self.today is None or day > self.today:
+            self._advance(day)
+        if day <= self.today - self.windows[-1]:
+            return
+        
+        counts = self._buckets.setdefault(day, ({}, {}))[which]
+        counts[key] = counts.get(key, 0) + count
+        for days, totals in self._totals.items():
+            if day > self.today - days:
+                totals[which][key] = totals[which].get(key, 0) + count
+    
+    def _advance(self, day):
+        """Move `today` forward, retiring buckets that leave each window."""
+        old_today = self.today
+        self.today = day
+        if old_today is None:
+            return
+        
+        for days, totals in self._totals.items():
+            # Buckets in (old_today - days, day - days] have just left this window
+            first = old_today - days + 1
+            last = min(day - days, old_today)
+            if last - first > len(self._buckets):
+                expired = [d for d in self._buckets if first <= d <= last]
+            else:
+                expired = [d for d in range(first, last + 1) if d in self._buckets]
+            for expired_day in expired:
+                for counts, bucket in zip(totals, self._buckets[expired_day]):
+                    for key, n in bucket.items():
+                        remaining = counts[key] - n
+                        if remaining > 0:
+                            counts[key] = remaining
+                        else:
+                            del counts[key]
+        
+        horizon = day - self.windows[-1]
+        for old_day in [d for d in self._buckets if d <= horizon]:
+            del self._buckets[old_day]
+    
+    def _top(self, which, k, days, now):
+        """Return the k largest (key, count) pairs of one kind of total."""
+        if days not in self._totals:
+            raise ValueError(f"no {days}-day window; choose one of {self.windows}")
+        day = int((time.time() if now is None else now) // SECONDS_PER_DAY)
+        if self.today is None or day > self.today:
+            self._advance(day)
+        return heapq.nlargest(k, self._totals[days][which].items(), key=itemgetter(1))
+    
+    def top_titles(self, k=10, days=30, now=None):
+        """
+        Get the most borrowed ISBNs over the last `days` days.
+        
+        Args:
+            k (int): Number of results
+            days (int): Window length; must be one of `windows`
+            now (float): Time to measure the window back from (default: now)
+            
+        Returns:
+            list: (ISBN, count) pairs, most borrowed first
+        """
+        return self._top(0, k, days, now)
+    
+    def top_authors(self, k=10, days=30, now=None):
+        """
+        Get the most borrowed authors over the last `days` days.
+        
+        Args:
+            k (int): Number of results
+            days (int): Window length; must be one of `windows`
+            now (float): Time to measure the window back from (default: now)
+            
+        Returns:
+            list: (author, count) pairs, most borrowed first
+        """
+        return self._top(1, k, days, now)
+    
+    def to_dict(self):
+        """
+        Convert the daily buckets to a dictionary for file storage.
+        
+        Returns:
+            dict: Day number (as a string) -> {'titles': ..., 'authors': ...}
+        """
+        return {str(day): {'titles': titles, 'authors': authors}
+                for day, (titles, authors) in sorted(self._buckets.items())}
+    
+    def load_day(self, day, data):
+        """
+        Restore one daily bucket saved by to_dict.
+        
+        Args:
+            day (str): Day number, as saved
+            data (dict): {'titles': {ISBN: count}, 'authors': {author: count}}
+        """
+        for which, name in enumerate(('titles', 'authors')):
+            for key, count in data[name].items():
+                self._add(int(day), which, key, count)
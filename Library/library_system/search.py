@@ -0,0 +1,299 @@
+"""
+Library Inventory System - Search Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Inverted index for searching books by title and author words
+"""
+
+import bisect
+import heapq
+import re
+from operator import attrgetter, itemgetter
+
+
+TOKEN = re.compile(r'\w+')
+
+# Score of a query word matching a book word, by field and match kind
+TITLE_EXACT = 4
+TITLE_PREFIX = 2
+AUTHOR_EXACT = 2
+AUTHOR_PREFIX = 1
+
+
+def tokenize(text):
+    """
+    Split text into lowercase words.
+    
+    Args:
+        text (str): Title, author or query text
+        
+    Returns:
+        list: Words in order of appearance
+    """
+    return TOKEN.findall(text.casefold())
+
+
+class SearchIndex:
+    """
+    Inverted index from title and author words to Book objects.
+    
+    Each word maps to the books whose title (or author) contains it, kept in
+    slot order, and a sorted vocabulary of all words lets a query word match
+    every word it is a prefix of. Every query word must match the title or
+    the author; books are ranked by how well they match (whole words over
+    prefixes, titles over authors), then by the order they were added.
+    
+    A query walks the postings of its most selective word, best-scoring
+    postings first and in slot order within them, and stops as soon as no
+    later book could beat the `limit` best found so far.
+    
+    Attributes:
+        size (int): Number of books indexed
+    """
+    
+    def __init__(self):
+        """Initialize an empty index."""
+        self._titles = {}  # word -> Books with it in the title, in slot order
+        self._authors = {}  # word -> Books with it in the author, in slot order
+        self._vocab = []  # sorted words of both fields; None until next query
+        self.size = 0
+    
+    def add(self, book):
+        """
+        Index a book's title and author.
+        
+        Books must be added in slot order, which is the order the Library
+        hands slots out in.
+        
+        Args:
+            book (Book): Book to index
+        """
+        for postings, text in ((self._titles, book.title), (self._authors, book.author)):
+            for word in set(tokenize(text)):
+                books = postings.get(word)
+                if books is None:
+                    if self._vocab is not None and not self._known(word):
+                        bisect.insort(self._vocab, word)
+                    books = postings[word] = []
+                books.append(book)
+        self.size += 1
+    
+    def add_many(self, books):
+        """
+        Index many books at once, sorting the vocabulary only at the next query.
+        
+        Args:
+            books (iterable): Books to index, in slot order
+        """
+        self._vocab = None
+        for book in books:
+            self.add(book)
+    
+    def remove(self, book):
+        """
+        Remove a book from the index.
+        
+        Args:
+            book (Book): Book previously passed to add
+        """
+        for postings, text in ((self._titles, book.title), (self._authors, book.author)):
+            for word in set(tokenize(text)):
+                books = postings.get(word)
+                if books is None:
+                    continue
+                books.remove(book)
+                if not books:
+                    del postings[word]
+                    if self._vocab is not None and not self._known(word):
+                        index = bisect.bisect_left(self._vocab, word)
+                        del self._vocab[index]
+        self.size -= 1
+    
+    def _known(self, word):
+        """Return True if either field still has postings for the word."""
+        return word in self._titles or word in self._authors
+    
+    def _expand(self, prefix):
+        """Return every indexed word that starts with `prefix`."""
+        if self._vocab is None:
+            self._vocab = sorted(self._titles.keys() | self._authors.keys())
+        vocab = self._vocab
+        start = bisect.bisect_left(vocab, prefix)
+        end = start
+        while end < len(vocab) and vocab[end].startswith(prefix):
+            end += 1
+        return vocab[start:end]
+    
+    def _tiers(self, term):
+        """
+        Group the postings a query word matches by the score they give it.
+        
+        Returns:
+            list: (score, list of postings lists) pairs, best score first;
+            empty if no indexed word matches
+        """
+        tiers = {}
+        for word in self._expand(term):
+            exact = word == term
+            for index, weight in ((self._titles, TITLE_EXACT if exact else TITLE_PREFIX),
+                                  (self._authors, AUTHOR_EXACT if exact else AUTHOR_PREFIX)):
+                books = index.get(word)
+                if books:
+                    tiers.setdefault(weight, []).append(books)
+        return sorted(tiers.items(), reverse=True)
+    
+    @staticmethod
+    def _read_score(book, terms):
+        """
+        Score a book against query words by reading its title and author.
+        
+        Returns:
+            int: Sum of each word's best match, or 0 if any word does not match
+        """
+        title_words = tokenize(book.title)
+        author_words = tokenize(book.author)
+        total = 0
+        for term in terms:
+            best = 0
+            for words, exact_weight, prefix_weight in (
+                    (title_words, TITLE_EXACT, TITLE_PREFIX),
+                    (author_words, AUTHOR_EXACT, AUTHOR_PREFIX)):
+                for word in words:
+                    if word == term:
+                        best = max(best, exact_weight)
+                    elif best < prefix_weight and word.startswith(term):
+                        best = prefix_weight
+            if not best:
+                return 0
+            total += best
+        return total
+    
+    @staticmethod
+    def _lookup_score(book, tier_sets):
+        """
+        Score a book against query words by looking it up in their postings.
+        
+        Returns:
+            int: Sum of each word's best match, or 0 if any word does not match
+        """
+        total = 0
+        for tiers in tier_sets:
+            for weight, books in tiers:
+                if book in books:
+                    total += weight
+                    break
+            else:
+                return 0
+        return total
+    
+    def by_author(self, author, start=0):
+        """
+        Yield the books by an author, in slot order.
+        
+        Only the postings of the author's rarest word are walked, from the
+        first book in slot `start` or later, so a page of an author's books
+        costs a binary search and the page itself.
+        
+        Args:
+            author (str): Author name, matched whole but ignoring case
+            start (int): First slot to consider
+            
+        Yields:
+            Book: Each book by the author
+        """
+        postings = [self._authors.get(word, []) for word in set(tokenize(author))]
+        if not postings:
+            return
+        books = min(postings, key=len)
+        low, high = 0, len(books)
+        while low < high:
+            middle = (low + high) // 2
+            if books[middle].slot < start:
+                low = middle + 1
+            else:
+                high = middle
+        name = author.casefold()
+        # Indexed rather than sliced, so a long list is not copied per page
+        index = low
+        while index < len(books):
+            book = books[index]
+            if book.author.casefold() == name:
+                yield book
+            index += 1
+    
+    def search(self, query, limit=10):
+        """
+        Find the books best matching a query.
+        
+        Args:
+            query (str): Words to look for; each may be the start of a word
+            limit (int): Maximum number of results
+            
+        Returns:
+            list: (Book, score) pairs, best match first
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        
+        plans = []
+        for term in terms:
+            tiers = self._tiers(term)
+            if not tiers:
+                return []
+            cost = sum(len(books) for weight, lists in tiers for books in lists)
+            plans.append((cost, term, tiers))
+        plans.sort(key=itemgetter(0))
+        
+        # Walk the most selective word's books, best tier first and in slot
+        # order within a tier; the other words are scored per book. Reading
+        # a book's words is cheap for a few books, but once many have been
+        # walked it pays to turn the other words' postings into sets.
+        cost, term, tiers = plans[0]
+        others = [plan[1] for plan in plans[1:]]
+        others_best = sum(plan[2][0][0] for plan in plans[1:])
+        others_cost = sum(plan[0] for plan in plans[1:])
+        tier_sets = None
+        walked = 0
+        
+        top = []  # min-heap of (score, -slot, book) holding the best so far
+        seen = set()
+        for weight, lists in tiers:
+            ceiling = weight + others_best
+            if len(top) == limit and top[0][0] > ceiling:
+                break
+            stream = lists[0] if len(lists) == 1 else heapq.merge(*lists, key=attrgetter('slot'))
+            previous = None
+            for book in stream:
+                if book is previous or book in seen:
+                    continue
+                previous = book
+                if len(tiers) > 1:
+                    seen.add(book)
+                
+                score = weight
+                if others:
+                    walked += 1
+                    if tier_sets is None and walked * 64 > others_cost:
+                        tier_sets = [[(w, set().union(*postings)) for w, postings in plan[2]]
+                                     for plan in plans[1:]]
+                    if tier_sets is None:
+                        matched = self._read_score(book, others)
+                    else:
+                        matched = self._lookup_score(book, tier_sets)
+                    if not matched:
+                        continue
+                    score += matched
+                
+                if len(top) < limit:
+                    heapq.heappush(top, (score, -book.slot, book))
+                elif score > top[0][0]:
+                    heapq.heapreplace(top, (score, -book.slot, book))
+                else:
+                    continue
+                # Later books in this tier can at best tie, and lose on slot
+                if len(top) == limit and top[0][0] >= ceiling:
+                    break
+        
+        return [(book, score) for score, slot, book in sorted(top, reverse=True)]
@@ -0,0 +1,409 @@
+"""
+Library Inventory System - Server Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: asyncio JSON-lines server that puts one Library behind many clients
+"""
+
+import asyncio
+import contextlib
+import json
+import os
+import sys
+from events import Events
+from history import LoanHistory
+from journal import Journal
+from library import Library
+from storage import JSONStorage, SQLiteStorage
+
+
+# Operations that change the library; their replies wait until they are durable
+WRITE_OPS = {'add_book', 'add_copies', 'register_member', 'remove_book', 'remove_member',
+             'lend', 'return', 'lend_many', 'return_many', 'place_hold', 'cancel_hold'}
+
+# Most books or members a "books" or "members" request lists at once
+PAGE_LIMIT = 1000
+
+# Type each request field must have; the optional ones may also be null
+FIELD_TYPES = {'title': str, 'author': str, 'isbn': str, 'name': str, 'member_id': str,
+               'query': str, 'copies': int, 'count': int, 'limit': int, 'after': int,
+               'copy': int, 'hours': (int, float), 'since': (int, float),
+               'until': (int, float), 'available': bool, 'with_loans': bool, 'atomic': bool,
+               'items': list}
+OPTIONAL_FIELDS = {'author', 'after', 'copy', 'since', 'until'}
+
+
+def _run(method, *args):
+    """
+    Call a Library method, capturing the events it reports.
+    
+    Returns:
+        tuple: (return value, message of the last event reported)
+    """
+    with method.__self__.events.capture() as events:
+        value = method(*args)
+    return value, events[-1].message if events else ''
+
+
+
+def _check_fields(request):
+    """
+    Check the types of a request's fields before the library sees them.
+    
+    Raises:
+        TypeError: Naming the first field of the wrong type
+    """
+    for field, value in request.items():
+        kind = FIELD_TYPES.get(field)
+        if kind is None or (value is None and field in OPTIONAL_FIELDS):
+            continue
+        # bool is a subclass of int, but true is not a copy count
+        if not isinstance(value, kind) or (isinstance(value, bool) and kind is not bool):
+            raise TypeError(f"Field {field} has the wrong type")
+    for item in request.get('items', ()):
+        if (not isinstance(item, list) or len(item) != 2 or
+                not all(isinstance(part, str) for part in item)):
+            raise TypeError("Field items must be a list of [member_id, isbn] pairs")
+
+
+def _report(library):
+    """Collect the library report figures as a dict."""
+    report = library.report()
+    book, count = report['most_borrowed']
+    report['most_borrowed'] = {'book': book.to_dict(), 'count': count} if book else None
+    return report
+
+
+def handle(library, request):
+    """
+    Carry out one request against the library.
+    
+    Requests are JSON objects with an "op" and its arguments, e.g.
+    {"op": "lend", "member_id": "M1", "isbn": "978..."}. The reply always
+    has "ok"; a successful one has "result" and a failed one "error". An
+    "id" in the request is echoed in the reply. A field of the wrong type
+    fails the request without touching the library. The "books" and "members"
+    ops list a page at a time: the "next" of one reply is the "after" of
+    the request for the next page, and is null after the last page.
+    
+    Args:
+        library (Library): Library to operate on
+        request (dict): Decoded request
+        
+    Returns:
+        dict: Reply to send back
+    """
+    op = request.get('op')
+    try:
+        _check_fields(request)
+        if op == 'add_book':
+            book, message = _run(library.add_book, request['title'], request['author'],
+                                 request['isbn'], request.get('copies', 1))
+            result = book.to_dict() if book else None
+        elif op == 'add_copies':
+            book, message = _run(library.add_copies, request['isbn'], request.get('count', 1))
+            result = book.to_dict() if book else None
+        elif op == 'register_member':
+            member, message = _run(library.register_member, request['name'],
+                                   request['member_id'])
+            result = member.to_dict() if member else None
+        elif op == 'remove_book':
+            result, message = _run(library.remove_book, request['isbn'])
+        elif op == 'remove_member':
+            result, message = _run(library.remove_member, request['member_id'])
+        elif op == 'lend':
+            result, message = _run(library.lend_book, request['member_id'], request['isbn'])
+        elif op == 'return':
+            result, message = _run(library.take_return, request['member_id'], request['isbn'])
+        elif op == 'place_hold':
+            result, message = _run(library.place_hold, request['member_id'], request['isbn'])
+        elif op == 'cancel_hold':
+            result, message = _run(library.cancel_hold, request['member_id'], request['isbn'])
+        elif op in ('lend_many', 'return_many'):
+            method = library.lend_many if op == 'lend_many' else library.return_many
+            result, message = _run(method, request['items'], request.get('atomic', False))
+        elif op == 'book':
+            result = library.describe_book(request['isbn'], 'dict')
+            message = f"Book with ISBN {request['isbn']} not found!"
+        elif op == 'member':
+            result = library.describe_member(request['member_id'], 'dict')
+            message = f"Member with ID {request['member_id']} not found!"
+        elif op == 'search':
+            books = library.search_books(request['query'], request.get('limit', 10))
+            result, message = [book.to_dict() for book in books], ''
+        elif op in ('books', 'members'):
+            limit = min(request.get('limit', PAGE_LIMIT), PAGE_LIMIT)
+            if op == 'books':
+                records = list(library.iter_books(request.get('available', False),
+                                                  request.get('author'), request.get('after'),
+                                                  limit))
+            else:
+                records = list(library.iter_members(request.get('with_loans', False),
+                                                    request.get('after'), limit))
+            result = {op: [record.to_dict() for record in records],
+                      'next': records[-1].slot if len(records) == limit else None}
+            message = ''
+        elif op == 'history':
+            result = library.get_loan_history(request.get('member_id'), request.get('isbn'),
+                                              request.get('since'), request.get('until'),
+                                              min(request.get('limit', PAGE_LIMIT), PAGE_LIMIT))
+            message = ''
+        elif op == 'last_borrower':
+            result = library.get_last_borrower(request['isbn'], request.get('copy'))
+            message = f"Book with ISBN {request['isbn']} has never been lent"
+        elif op in ('overdue', 'due_soon'):
+            if op == 'overdue':
+                loans = library.get_overdue_loans()
+            else:
+                loans = library.get_loans_due(request.get('hours', 24))
+            result = [{'due_at': due, 'member_id': member_id, 'isbn': isbn}
+                      for due, member_id, isbn in loans]
+            message = ''
+        elif op == 'fines':
+            result, message = library.compute_fines(), ''
+        elif op == 'report':
+            result, message = _report(library), ''
+        elif op == 'metrics':
+            result, message = library.events.snapshot(), ''
+            if library.views is not None:
+                result['views'] = library.views.stats()
+            if library.history is not None:
+                result['history'] = library.history.stats()
+        elif op == 'ping':
+            result, message = 'pong', ''
+        else:
+            return {'ok': False, 'error': f"Unknown operation: {op}"}
+    except KeyError as e:
+        return {'ok': False, 'error': f"Missing field: {e.args[0]}"}
+    except ValueError as e:
+        return {'ok': False, 'error': str(e)}
+    except TypeError as e:
+        return {'ok': False, 'error': f"Bad request: {e}"}
+    
+    if result is None or result is False:
+        return {'ok': False, 'error': message}
+    return {'ok': True, 'result': result}
+
+
+class LibraryServer:
+    """
+    Serves one Library to many clients from a single asyncio event loop.
+    
+    The protocol is JSON lines: each request is one JSON object on a line
+    and gets one reply line, in order. Clients may pipeline, sending many
+    requests without waiting; each connection's requests are applied as
+    soon as they arrive, while replies are queued behind them.
+    
+    Library operations run on the event loop, since they only touch memory.
+    Persistence does not: the journal is fsynced on a worker thread, and
+    every write waiting at that moment is acknowledged by the same fsync
+    (group commit), so a reply to a write means it is on disk. Snapshots
+    are also written on a worker thread, holding back writes meanwhile.
+    
+    Attributes:
+        library (Library): Library being served
+        host (str): Address to listen on
+        port (int): Port to listen on (0 picks a free one)
+        compact_every (int): Journal length that triggers a snapshot (0 = never)
+    """
+    
+    def __init__(self, library, host='127.0.0.1', port=8765, compact_every=1000):
+        """
+        Initialize the server.
+        
+        Args:
+            library (Library): Library to serve; its own compaction should be
+                off (compact_every=0), as the server takes care of it
+            host (str): Address to listen on
+            port (int): Port to listen on (0 picks a free one)
+            compact_every (int): Journal length that triggers a snapshot (0 = never)
+        """
+        self.library = library
+        self.host = host
+        self.port = port
+        self.compact_every = compact_every
+        self._waiters = []  # futures of writes waiting for the next sync
+        self._dirty = asyncio.Event()
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._persist = asyncio.Lock()
+        self._server = None
+        self._flusher = None
+    
+    async def start(self):
+        """Start listening and persisting; returns once the socket is bound."""
+        self._server = await asyncio.start_server(
+            self._serve_client, self.host, self.port, limit=1 << 24)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def serve_forever(self):
+        """Serve clients until cancelled."""
+        await self._server.serve_forever()
+    
+    async def stop(self):
+        """Stop accepting clients and make every acknowledged write durable."""
+        self._server.close()
+        await self._server.wait_closed()
+        self._flusher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._flusher
+        await self._sync()
+    
+    async def _serve_client(self, reader, writer):
+        """Read a client's requests, apply them in order, and queue the replies."""
+        replies = asyncio.Queue()
+        sender = asyncio.create_task(self._send_replies(writer, replies))
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    if not isinstance(request.get('op', ''), str):
+                        raise ValueError("op must be a string")
+                except ValueError as e:
+                    replies.put_nowait((None, {'ok': False, 'error': f"Bad request: {e}"}))
+                    continue
+                
+                durable = None
+                if request.get('op') in WRITE_OPS:
+                    await self._writable.wait()
+                    reply = handle(self.library, request)
+                    if reply['ok']:
+                        durable = asyncio.get_running_loop().create_future()
+                        self._waiters.append(durable)
+                        self._dirty.set()
+                else:
+                    reply = handle(self.library, request)
+                if 'id' in request:
+                    reply['id'] = request['id']
+                replies.put_nowait((durable, reply))
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            replies.put_nowait(None)
+            await sender
+    
+    async def _send_replies(self, writer, replies):
+        """Write replies in request order, each once its write is durable."""
+        try:
+            while True:
+                item = await replies.get()
+                if item is None:
+                    break
+                durable, reply = item
+                if durable is not None:
+                    await durable
+                writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+                if replies.empty():
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+    
+    async def _flush_loop(self):
+        """Sync pending writes as a group, compacting the journal when due."""
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            await self._sync()
+            journal = getattr(self.library.storage, 'journal', None)
+            if journal is not None and self.compact_every and journal.records >= self.compact_every:
+                await self._compact()
+    
+    async def _sync(self):
+        """Make every write applied so far durable, then release its reply."""
+        waiters, self._waiters = self._waiters, []
+        storage = self.library.storage
+        async with self._persist:
+            journal = getattr(storage, 'journal', None)
+            if journal is not None:
+                fd = journal.flush()
+                if fd is not None:
+                    await asyncio.get_running_loop().run_in_executor(None, os.fsync, fd)
+            elif storage.lazy:
+                # sqlite3 connections belong to the thread that opened them
+                storage.commit()
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+    
+    async def _compact(self):
+        """Write a snapshot on a worker thread, holding back writes meanwhile."""
+        self._writable.clear()
+        try:
+            async with self._persist:
+                _, message = await asyncio.get_running_loop().run_in_executor(
+                    None, _run, self.library.save_data)
+                print(f"Info: Compacted journal into snapshot - {message}")
+        finally:
+            self._writable.set()
+
+
+async def serve(library, host, port):
+    """Run a LibraryServer until interrupted, then save and close the library."""
+    server = LibraryServer(library, host, port)
+    await server.start()
+    print(f"Info: Listening on {host}:{server.port}", flush=True)
+    try:
+        await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        await server.stop()
+
+
+def main():
+    """
+    Server entry point.
+    
+    Usage: python server.py [--host 127.0.0.1] [--port 8765] [--db library.db]
+                            [--cache 10000] [--history history]
+    Without --db the library is kept in books.json/members.json with a journal.
+    --cache sets how many rendered books and members are cached (0 = none).
+    --history is the directory of the loan history.
+    """
+    options = {'--host': '127.0.0.1', '--port': '8765', '--db': None, '--cache': '10000',
+               '--history': 'history'}
+    args = sys.argv[1:]
+    while args:
+        option = args.pop(0)
+        if option not in options or not args:
+            print("Usage: python server.py [--host 127.0.0.1] [--port 8765] [--db library.db] "
+                  "[--cache 10000] [--history history]")
+            sys.exit(2)
+        options[option] = args.pop(0)
+    
+    cache = int(options['--cache'])
+    events = Events()
+    history = LoanHistory(options['--history'], events=events)
+    if options['--db']:
+        # Writes are committed as a group before their replies are sent
+        library = Library(storage=SQLiteStorage(options['--db'], commit_every=0),
+                          view_cache=cache, history=history, events=events)
+    else:
+        journal = Journal('journal.log', sync_every=0, events=events)
+        storage = JSONStorage(journal=journal, compact_every=0)
+        library = Library(storage=storage, view_cache=cache, history=history, events=events)
+    library.load_data()
+    
+    try:
+        asyncio.run(serve(library, options['--host'], int(options['--port'])))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("\nInfo: Saving data...")
+        library.save_data()
+        library.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,945 @@
+"""
+Library Inventory System - Sharding Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Library partitioned across worker processes behind one coordinator
+"""
+
+import collections
+import contextlib
+import heapq
+import json
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import threading
+import zlib
+from events import Events, timed
+from journal import Journal
+from library import Library
+from storage import JSONStorage
+
+
+def shard_of(key, shards):
+    """
+    Pick the shard that owns an ISBN or member ID.
+    
+    crc32 is used rather than hash(), which differs between processes.
+    
+    Args:
+        key (str): ISBN or member ID
+        shards (int): Number of shards
+        
+    Returns:
+        int: Shard index
+    """
+    return zlib.crc32(key.encode('utf-8')) % shards
+
+
+class Shard:
+    """
+    The state one worker process owns: a Library holding its books and members.
+    
+    A member borrowing a book from another shard is registered on the
+    book's shard as a shadow: an ordinary Member there, so the loan, its
+    due date and the book's holders are kept by the Library as usual. The
+    member's own shard records the ISBN in `remote`, which is what stops
+    the member being removed while the loan is out. Shadows are dropped
+    as soon as they hold nothing.
+    
+    Attributes:
+        index (int): This shard's number
+        shards (int): Number of shards
+        library (Library): Books and members owned here, plus shadows
+        shadows (set): IDs of members registered here only as borrowers
+        remote (dict): Member ID -> set of ISBNs the member holds on other shards
+        pending (Counter): Member ID -> cross-shard operations prepared but
+            not yet committed or aborted
+        added (dict): ISBN -> the book's place in the order books were
+            added to the whole library, saved beside the shard's snapshot
+    """
+    
+    def __init__(self, index, shards, directory, journal, options):
+        """
+        Initialize a Shard.
+        
+        Args:
+            index (int): This shard's number
+            shards (int): Number of shards
+            directory (str): Directory of the shard's snapshot and journal files
+            journal (bool): Journal every operation
+            options (dict): Keyword arguments for Library
+        """
+        self.index = index
+        self.shards = shards
+        self.path = path = os.path.join(directory, f"shard-{index}")
+        events = Events(sinks=[])
+        journal = Journal(path + '-journal.log', events=events) if journal else None
+        storage = JSONStorage(path + '-books.json', path + '-members.json', journal=journal,
+                              compact_every=options.pop('compact_every', 1000))
+        self.library = Library(storage=storage, events=events, **options)
+        self.shadows = set()
+        self.remote = {}
+        self.pending = collections.Counter()
+        self.added = {}
+        self._unplaced = []  # ISBNs loaded without a saved place, in insertion order
+    
+    def call(self, name, *args):
+        """Call a Library method by name and return its result."""
+        return getattr(self.library, name)(*args)
+    
+    def add_book(self, title, author, isbn, copies, place):
+        """Add a book at the given place in the order of additions; returns the Book or None."""
+        book = self.library.add_book(title, author, isbn, copies)
+        if book is not None:
+            self.added[isbn] = place
+        return book
+    
+    def add_books(self, records, places):
+        """
+        Add many books, each at its place in the order of additions.
+        
+        Returns:
+            list: ISBNs skipped because the library already has them
+        """
+        existing = self.library.add_books(records)
+        for record, place in zip(records, places):
+            # A book already here, or repeated in the batch, keeps its first place
+            self.added.setdefault(record[2], place)
+        return existing
+    
+    def remove_book(self, isbn):
+        """Remove a book; returns True if removed."""
+        if not self.library.remove_book(isbn):
+            return False
+        self.added.pop(isbn, None)
+        return True
+    
+    def check(self, members, items, op):
+        """
+        First phase of an atomic batch, on a book's shard: check its pairs without applying them.
+        
+        Args:
+            members (list): (member ID, name) of every member from another
+                shard taking part
+            items (list): (member ID, ISBN) pairs
+            op (str): 'lend' or 'return'
+            
+        Returns:
+            list: The result dict of each pair (see Library.check_many)
+        """
+        return self.shadowed(members, 'check_many', op, items)
+    
+    def prepare(self, items):
+        """
+        First phase of cross-shard lends and returns, on the members' shard.
+        
+        Each member that exists is marked as having an operation in
+        flight, so it cannot be removed before the operation is committed
+        or aborted.
+        
+        Args:
+            items (list): (member ID, ISBN) pairs
+            
+        Returns:
+            list: Each member's name, or None if the member does not exist
+        """
+        names = []
+        for member_id, isbn in items:
+            member = self.library.find_member_by_id(member_id)
+            if member is None:
+                self.library.events.emit('Error', 'member_not_found',
+                                         "Member with ID {member_id} not found!",
+                                         member_id=member_id)
+                names.append(None)
+                continue
+            self.pending[member_id] += 1
+            names.append(member.name)
+        return names
+    
+    def commit(self, op, items):
+        """
+        Second phase, on the members' shard: record the outcome on the book's shard.
+        
+        Args:
+            op (str): 'lend' or 'return'
+            items (list): (member ID, ISBN, success) for every prepared pair;
+                an unsuccessful one is aborted
+        """
+        for member_id, isbn, success in items:
+            self.pending[member_id] -= 1
+            if not self.pending[member_id]:
+                del self.pending[member_id]
+            if not success:
+                continue
+            if op == 'lend':
+                self.remote.setdefault(member_id, set()).add(isbn)
+            else:
+                held = self.remote[member_id]
+                held.discard(isbn)
+                if not held:
+                    del self.remote[member_id]
+    
+    def shadowed(self, members, name, *args):
+        """
+        Call a Library method with shadows registered for the given members.
+        
+        Args:
+            members (list): (member ID, name) of every member from another
+                shard taking part
+            name (str): Library method, e.g. 'lend_book' or 'lend_many'
+            *args: Arguments for the method
+            
+        Returns:
+            The method's result
+        """
+        library = self.library
+        with library.events.muted():
+            for member_id, member_name in members:
+                if member_id not in self.shadows:
+                    library.register_member(member_name, member_id)
+                    self.shadows.add(member_id)
+        try:
+            return getattr(library, name)(*args)
+        finally:
+            with library.events.muted():
+                for member_id, member_name in members:
+                    member = library.find_member_by_id(member_id)
+                    if member_id in self.shadows and not member.loans:
+                        library.remove_member(member_id)
+                        self.shadows.discard(member_id)
+    
+    def remove_member(self, member_id):
+        """Remove a member unless they hold or are borrowing books on other shards."""
+        if member_id in self.remote or member_id in self.pending:
+            member = self.library.find_member_by_id(member_id)
+            self.library.events.emit('Error', 'member_has_loans',
+                                     "{name} still has borrowed books and cannot be removed!",
+                                     member_id=member_id, name=member.name)
+            return False
+        return self.library.remove_member(member_id)
+    
+    def member(self, member_id):
+        """
+        Look up a member owned by this shard.
+        
+        Returns:
+            tuple: (Member or None, ISBNs the member holds on other shards)
+        """
+        return self.library.find_member_by_id(member_id), self.remote.get(member_id, set())
+    
+    def loans_of(self, member_id):
+        """Return the Loans a shadow member holds here."""
+        member = self.library.find_member_by_id(member_id)
+        return dict(member.loans) if member is not None else {}
+    
+    def search(self, query, limit):
+        """
+        Search this shard's books.
+        
+        Returns:
+            list: (score, Book) pairs, best match first; scores are
+            comparable between shards
+        """
+        library = self.library
+        if library.search_index is None:
+            library.search_books(query, 0)  # builds the index on first use
+        return [(score, book) for book, score in library.search_index.search(query, limit)]
+    
+    def report(self):
+        """
+        Collect this shard's share of the report figures.
+        
+        Returns:
+            dict: Figures that add up across shards, plus this shard's
+            most borrowed book and its count
+        """
+        library = self.library
+        active = library.get_active_members_count() - len(self.shadows)
+        # Members whose only loans are on other shards
+        active += sum(1 for member_id in self.remote
+                      if not library.find_member_by_id(member_id).loans)
+        book, count = library.get_most_borrowed_book()
+        return {
+            'total_books': len(library.books),
+            'total_copies': library.get_total_copies_count(),
+            'total_members': len(library.members) - len(self.shadows),
+            'borrowed_books': library.get_borrowed_books_count(),
+            'active_members': active,
+            'most_borrowed': (book, count),
+            'added': self.added[book.isbn] if book else None,
+        }
+    
+    def save(self):
+        """Save the shard's Library and the places of its books in the order of additions."""
+        self.library.save_data()
+        temp = self.path + '-added.json.tmp'
+        with open(temp, 'w', encoding='utf-8') as file:
+            json.dump(self.added, file)
+        os.replace(temp, self.path + '-added.json')
+    
+    def load(self):
+        """
+        Load the shard's files and find its shadows.
+        
+        Loading also clears every operation left prepared, so a member
+        marked by a batch that never finished can be removed again. The
+        loans such a batch did make are found from the shadows like any
+        other.
+        
+        Returns:
+            dict: 'loans', the (member ID, ISBN) of every loan held here by
+            a shadow, for the coordinator to send to the members' own
+            shards; 'newest', the latest place saved in the order of
+            additions (-1 if none); and 'unplaced', the number of books
+            added since the places were last saved
+        """
+        library = self.library
+        library.load_data(progress_every=0)
+        self.shadows = {member.member_id for member in library.members
+                        if shard_of(member.member_id, self.shards) != self.index}
+        self.remote = {}
+        self.pending.clear()
+        try:
+            with open(self.path + '-added.json', encoding='utf-8') as file:
+                saved = json.load(file)
+        except FileNotFoundError:
+            saved = {}
+        self.added = {}
+        self._unplaced = []
+        for book in library.books:
+            if book.isbn in saved:
+                self.added[book.isbn] = saved[book.isbn]
+            else:
+                self._unplaced.append(book.isbn)
+        return {
+            'loans': [(member_id, isbn) for member_id in self.shadows
+                      for isbn in library.find_member_by_id(member_id).loans],
+            'newest': max(self.added.values(), default=-1),
+            'unplaced': len(self._unplaced),
+        }
+    
+    def place(self, first):
+        """Give the books found by load without a saved place the places from `first` on."""
+        for offset, isbn in enumerate(self._unplaced):
+            self.added[isbn] = first + offset
+        self._unplaced = []
+    
+    def restore_remote(self, items):
+        """Record loans this shard's members hold elsewhere, found by load."""
+        for member_id, isbn in items:
+            self.remote.setdefault(member_id, set()).add(isbn)
+
+
+def _serve(connection, index, shards, directory, journal, options):
+    """
+    Worker process loop: apply requests to one Shard until told to close.
+    
+    Each request is (method name, arguments) and gets the reply
+    (True, result, events) or (False, error message, events), where events
+    are the (level, name, template, fields) of everything reported.
+    """
+    # Ctrl-C is for the coordinator, which closes the workers in turn
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    shard = Shard(index, shards, directory, journal, options)
+    while True:
+        try:
+            op, args = connection.recv()
+        except EOFError:
+            op, args = 'close', ()
+        if op == 'close':
+            shard.library.close()
+            connection.close()
+            return
+        with shard.library.events.capture() as events:
+            try:
+                reply = (True, getattr(shard, op)(*args))
+            except Exception as e:
+                reply = (False, f"{type(e).__name__}: {e}")
+        connection.send(reply + ([(event.level, event.name, event.template, event.fields)
+                                  for event in events],))
+
+
+class ShardedLibrary:
+    """
+    A library partitioned across worker processes, with the Library API.
+    
+    Books are placed on a shard by a hash of their ISBN and members by a
+    hash of their member ID, and each worker process keeps its share in
+    an ordinary Library, so reports, searches and imports run on every
+    core at once. This coordinator forwards each call to the shards
+    involved; messages the workers report are re-emitted through its own
+    `events`, so the console output is the same as a single Library's.
+    
+    A lend or return whose member and book live on different shards runs
+    a small two-phase protocol. The member's shard first checks the
+    member exists and marks an operation in flight (prepare). The book's
+    shard then performs the operation against a shadow of the member (see
+    Shard). Finally the member's shard records the loan, or just clears
+    the mark if the operation failed (commit or abort). The book's shard
+    decides the outcome, so it needs no prepare phase of its own. An
+    atomic batch adds one: every shard involved is held for the whole
+    batch, each book's shard checks its pairs without applying them, and
+    the batch is applied only if every shard found all its pairs valid.
+    Marks are cleared whichever way a call ends, even when a shard fails;
+    they live only in the workers' memory, so a coordinator that dies
+    between the phases takes them with it, and load_data rebuilds the
+    cross-shard loans from the shadows.
+    
+    The coordinator also numbers books in the order they are added, and
+    each shard saves the numbers of its books beside its snapshot, so
+    ties for the most borrowed book go to the book added first, as in
+    Library. Books added after a shard was last saved lose their number
+    if it is reopened from its journal; they are numbered after every
+    other book, in shard order.
+    
+    The coordinator is safe to share between threads. Each call holds
+    only the shards it talks to, and only until they reply.
+    
+    Attributes:
+        shards (int): Number of worker processes
+        directory (str): Directory of the shards' snapshot and journal files
+        events (Events): Where outcomes are reported
+    """
+    
+    def __init__(self, shards=4, directory='.', journal=False, events=None, **options):
+        """
+        Start the worker processes.
+        
+        Args:
+            shards (int): Number of worker processes; a library must always
+                be opened with the number of shards it was saved with
+            directory (str): Directory of the shards' snapshot and journal files
+            journal (bool): Journal every operation in each shard
+            events (Events): Event sinks, counters and latency histograms
+                (default: messages printed to the console)
+            **options: Further Library arguments, e.g. loan_days
+        """
+        self.shards = shards
+        self.directory = directory
+        self.events = events if events is not None else Events()
+        self._connections = []
+        self._processes = []
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._order_lock = threading.Lock()
+        self._next_added = 0
+        for index in range(shards):
+            parent, child = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_serve, args=(child, index, shards, directory, journal, dict(options)),
+                daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(parent)
+            self._processes.append(process)
+    
+    @contextlib.contextmanager
+    def _holding(self, indexes):
+        """Hold several shards for the length of a with block (see _scatter's `locked`)."""
+        indexes = sorted(indexes)
+        for index in indexes:
+            self._locks[index].acquire()
+        try:
+            yield
+        finally:
+            for index in indexes:
+                self._locks[index].release()
+    
+    def _scatter(self, calls, report=True, locked=False):
+        """
+        Send requests to several shards at once and gather their replies.
+        
+        Args:
+            calls (dict): Shard index -> (method name, arguments)
+            report (bool): Re-emit the events the shards report
+            locked (bool): The caller already holds the shards (see _holding)
+            
+        Returns:
+            dict: Shard index -> result
+            
+        Raises:
+            RuntimeError: If a shard failed to carry out its request
+        """
+        indexes = sorted(calls)
+        held = set()
+        if not locked:
+            # Taking the locks in index order keeps concurrent callers from deadlocking
+            for index in indexes:
+                self._locks[index].acquire()
+            held.update(indexes)
+        waiting = {}
+        replies = {}
+        try:
+            for index in indexes:
+                self._connections[index].send(calls[index])
+                waiting[self._connections[index]] = index
+            while waiting:
+                for connection in multiprocessing.connection.wait(list(waiting)):
+                    index = waiting.pop(connection)
+                    replies[index] = connection.recv()
+                    if index in held:
+                        self._locks[index].release()
+                        held.discard(index)
+        finally:
+            for index in held:
+                self._locks[index].release()
+        
+        results = {}
+        for index in indexes:
+            ok, result, events = replies[index]
+            if report:
+                for level, name, template, fields in events:
+                    self.events.emit(level, name, template, **fields)
+            if not ok:
+                raise RuntimeError(f"Shard {index} failed - {result}")
+            results[index] = result
+        return results
+    
+    def _call(self, index, op, *args):
+        """Send one request to one shard and return its result."""
+        return self._scatter({index: (op, args)})[index]
+    
+    def _everywhere(self, op, *args):
+        """Send the same request to every shard; returns their results in shard order."""
+        results = self._scatter({index: (op, args) for index in range(self.shards)})
+        return [results[index] for index in range(self.shards)]
+    
+    def _book_shard(self, isbn):
+        """Shard index owning an ISBN."""
+        return shard_of(isbn, self.shards)
+    
+    def _member_shard(self, member_id):
+        """Shard index owning a member ID."""
+        return shard_of(member_id, self.shards)
+    
+    def _places(self, count):
+        """Take the next `count` places in the order books are added."""
+        with self._order_lock:
+            first = self._next_added
+            self._next_added += count
+        return range(first, first + count)
+    
+    def add_book(self, title, author, isbn, copies=1):
+        """
+        Add a new book, or report that the ISBN already exists.
+        
+        Returns:
+            Book: A copy of the newly added Book, or None if it already exists
+        """
+        place, = self._places(1)
+        return self._call(self._book_shard(isbn), 'add_book', title, author, isbn, copies, place)
+    
+    def add_books(self, records):
+        """
+        Add many books at once, each shard taking its share in parallel.
+        
+        Args:
+            records (iterable): (title, author, isbn, copies) tuples
+            
+        Returns:
+            list: ISBNs skipped because the library already has them
+        """
+        records = list(records)
+        groups = collections.defaultdict(list)
+        places = collections.defaultdict(list)
+        for record, place in zip(records, self._places(len(records))):
+            index = self._book_shard(record[2])
+            groups[index].append(record)
+            places[index].append(place)
+        results = self._scatter({index: ('add_books', (group, places[index]))
+                                 for index, group in groups.items()}, report=False)
+        existing = [isbn for index in sorted(results) for isbn in results[index]]
+        added = sum(len(group) for group in groups.values()) - len(existing)
+        self.events.emit('Success', 'add_books', "Added {count} books", count=added)
+        if existing:
+            self.events.emit('Warning', 'books_exist',
+                             "{count} books were already in the library", count=len(existing))
+        return existing
+    
+    def add_copies(self, isbn, count=1):
+        """Add copies of a book; returns a copy of the Book, or None."""
+        return self._call(self._book_shard(isbn), 'call', 'add_copies', isbn, count)
+    
+    def remove_book(self, isbn):
+        """Remove a book; returns True if removed."""
+        return self._call(self._book_shard(isbn), 'remove_book', isbn)
+    
+    def register_member(self, name, member_id):
+        """
+        Register a new member.
+        
+        Returns:
+            Member: A copy of the new Member, or None if the ID already exists
+        """
+        return self._call(self._member_shard(member_id), 'call', 'register_member',
+                          name, member_id)
+    
+    def remove_member(self, member_id):
+        """Remove a member; returns True if removed."""
+        return self._call(self._member_shard(member_id), 'remove_member', member_id)
+    
+    @timed('lend', sampled=True)
+    def lend_book(self, member_id, isbn):
+        """
+        Lend the next free copy of a book to a member.
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self._single('lend', 'lend_book', member_id, isbn)
+    
+    @timed('return', sampled=True)
+    def take_return(self, member_id, isbn):
+        """
+        Accept a book return from a member.
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self._single('return', 'take_return', member_id, isbn)
+    
+    def _single(self, op, method, member_id, isbn):
+        """Lend or return one book, across shards if need be."""
+        home = self._member_shard(member_id)
+        shard = self._book_shard(isbn)
+        if home == shard:
+            return self._call(shard, 'call', method, member_id, isbn)
+        
+        name, = self._call(home, 'prepare', [(member_id, isbn)])
+        if name is None:
+            return False
+        success = False
+        try:
+            success = self._call(shard, 'shadowed', [(member_id, name)], method,
+                                 member_id, isbn)
+        finally:
+            self._call(home, 'commit', op, [(member_id, isbn, success)])
+        return success
+    
+    @timed('lend_many')
+    def lend_many(self, pairs, atomic=False):
+        """
+        Lend many books at once, every shard working in parallel.
+        
+        Every pair for a book is applied by the book's shard, in input
+        order, so the results are those Library.lend_many would give.
+        
+        Args:
+            pairs (iterable): (member_id, isbn) pairs
+            atomic (bool): Lend nothing unless every pair is valid
+            
+        Returns:
+            list: One result dict per pair, in input order (see Library._batch)
+        """
+        if atomic:
+            return self._atomic_batch('lend', pairs)
+        return self._batch('lend', pairs)
+    
+    @timed('return_many')
+    def return_many(self, pairs, atomic=False):
+        """
+        Accept many returns at once, every shard working in parallel.
+        
+        See lend_many for how the pairs are applied.
+        
+        Args:
+            pairs (iterable): (member_id, isbn) pairs
+            atomic (bool): Return nothing unless every pair is valid
+            
+        Returns:
+            list: One result dict per pair, in input order (see Library._batch)
+        """
+        if atomic:
+            return self._atomic_batch('return', pairs)
+        return self._batch('return', pairs)
+    
+    def _split(self, pairs):
+        """
+        Sort the positions of a batch's pairs by the shards that take part.
+        
+        Returns:
+            tuple: (book's shard -> positions of the pairs whose member is
+            on the same shard, member's shard -> positions of the rest)
+        """
+        local = collections.defaultdict(list)
+        prepares = collections.defaultdict(list)
+        for position, (member_id, isbn) in enumerate(pairs):
+            home = self._member_shard(member_id)
+            if home == self._book_shard(isbn):
+                local[home].append(position)
+            else:
+                prepares[home].append(position)
+        return local, prepares
+    
+    def _prepare(self, pairs, prepares, results, locked=False):
+        """
+        First phase: the members' shards check and mark the members.
+        
+        The result of each pair whose member is missing is filled in.
+        
+        Returns:
+            dict: Position -> member's name, for every pair prepared
+        """
+        names = self._scatter({index: ('prepare', ([pairs[position] for position in positions],))
+                               for index, positions in prepares.items()},
+                              report=False, locked=locked)
+        prepared = {}
+        for index, positions in prepares.items():
+            for position, name in zip(positions, names[index]):
+                member_id, isbn = pairs[position]
+                if name is None:
+                    results[position] = {'member_id': member_id, 'isbn': isbn, 'success': False,
+                                         'error': f"Member with ID {member_id} not found"}
+                else:
+                    prepared[position] = name
+        return prepared
+    
+    def _commit(self, op, pairs, prepares, prepared, results, locked=False):
+        """Last phase: tell the members' shards which prepared pairs were applied."""
+        commits = collections.defaultdict(list)
+        for index, positions in prepares.items():
+            for position in positions:
+                if position in prepared:
+                    member_id, isbn = pairs[position]
+                    success = results[position] is not None and results[position]['success']
+                    commits[index].append((member_id, isbn, success))
+        self._scatter({index: ('commit', (op, items)) for index, items in commits.items()},
+                      report=False, locked=locked)
+    
+    def _book_calls(self, name, args, pairs, local, prepared):
+        """
+        Build each book's shard's request for its local and prepared pairs.
+        
+        Args:
+            name (str): 'check', or the Library method to run, e.g. 'lend_many'
+            args (tuple): Arguments following the pairs
+            pairs (list): The batch's (member ID, ISBN) pairs
+            local (dict): Shard -> positions of the pairs needing no shadow
+            prepared (dict): Position -> member's name
+            
+        Returns:
+            tuple: (shard index -> request, for _scatter; shard index ->
+            positions of the pairs in its request, in input order)
+        """
+        groups = collections.defaultdict(list)
+        for index, positions in local.items():
+            groups[index].extend(positions)
+        shadows = collections.defaultdict(dict)  # books' shard -> {member ID: name}
+        for position, member_name in prepared.items():
+            member_id, isbn = pairs[position]
+            index = self._book_shard(isbn)
+            groups[index].append(position)
+            shadows[index][member_id] = member_name
+        calls = {}
+        for index, positions in groups.items():
+            positions.sort()
+            batch = [pairs[position] for position in positions]
+            members = list(shadows[index].items())
+            if name == 'check':
+                calls[index] = ('check', (members, batch) + args)
+            elif members:
+                calls[index] = ('shadowed', (members, name, batch) + args)
+            else:
+                calls[index] = ('call', (name, batch) + args)
+        return calls, groups
+    
+    def _batch(self, op, pairs):
+        """
+        Apply a batch of lends or returns across the shards, best effort.
+        
+        Pairs whose member and book share a shard go straight to that
+        shard's Library batch. The rest go through the two phases, each
+        phase sent to all the shards involved at once.
+        """
+        pairs = list(pairs)
+        method = op + '_many'
+        results = [None] * len(pairs)
+        local, prepares = self._split(pairs)
+        prepared = self._prepare(pairs, prepares, results)
+        
+        # Phase two: each book's shard applies its local and shadowed pairs as one batch
+        calls, groups = self._book_calls(method, (False,), pairs, local, prepared)
+        done = {}
+        try:
+            done = self._scatter(calls, report=False)
+        finally:
+            for index, positions in groups.items():
+                for position, result in zip(positions, done.get(index, ())):
+                    results[position] = result
+            self._commit(op, pairs, prepares, prepared, results)
+        
+        applied = sum(1 for result in results if result['success'])
+        verb = 'Lent' if op == 'lend' else 'Returned'
+        self.events.emit('Success', method, "{verb} {applied} of {count} books",
+                         verb=verb, applied=applied, count=len(results))
+        if applied < len(results):
+            self.events.emit('Warning', 'batch_failures',
+                             "{failed} items failed; see the results for details",
+                             failed=len(results) - applied)
+        return results
+    
+    def _atomic_batch(self, op, pairs):
+        """
+        Apply a batch of lends or returns across the shards, all or nothing.
+        
+        Every shard involved is held from the first phase to the last, so
+        nothing changes between checking the pairs and applying them. The
+        members' shards prepare as for any batch; each book's shard then
+        checks its pairs without applying them. Only if no member is
+        missing and every pair checks out are the books' shards told to
+        apply their pairs; otherwise nothing is applied. The members'
+        shards are told the outcome either way.
+        """
+        pairs = list(pairs)
+        method = op + '_many'
+        results = [None] * len(pairs)
+        local, prepares = self._split(pairs)
+        involved = set(prepares)
+        involved.update(self._book_shard(isbn) for member_id, isbn in pairs)
+        applied = False
+        with self._holding(involved):
+            prepared = {}
+            try:
+                prepared = self._prepare(pairs, prepares, results, locked=True)
+                calls, groups = self._book_calls('check', (op,), pairs, local, prepared)
+                for index, checked in self._scatter(calls, report=False, locked=True).items():
+                    for position, result in zip(groups[index], checked):
+                        results[position] = result
+                if all(result['success'] for result in results):
+                    calls, groups = self._book_calls(method, (True,), pairs, local, prepared)
+                    self._scatter(calls, report=False, locked=True)
+                    applied = True
+            finally:
+                if not applied:
+                    for position, result in enumerate(results):
+                        if result is None or result['success']:
+                            member_id, isbn = pairs[position]
+                            results[position] = {'member_id': member_id, 'isbn': isbn,
+                                                 'success': False, 'error': "Batch aborted"}
+                self._commit(op, pairs, prepares, prepared, results, locked=True)
+        
+        if not applied:
+            failed = sum(1 for result in results if result['error'] != "Batch aborted")
+            self.events.emit('Error', 'batch_aborted',
+                             "Batch not applied - {failed} of {count} items are invalid!",
+                             failed=failed, count=len(results))
+            return results
+        verb = 'Lent' if op == 'lend' else 'Returned'
+        self.events.emit('Success', method, "{verb} {applied} of {count} books",
+                         verb=verb, applied=len(results), count=len(results))
+        return results
+    
+    def find_book_by_isbn(self, isbn):
+        """Return a copy of the Book with this ISBN, or None."""
+        return self._call(self._book_shard(isbn), 'call', 'find_book_by_isbn', isbn)
+    
+    def find_member_by_id(self, member_id):
+        """
+        Return a copy of a Member, with the loans they hold on every shard.
+        
+        Returns:
+            Member: The member, or None if not found
+        """
+        member, remote = self._call(self._member_shard(member_id), 'member', member_id)
+        if member is not None and remote:
+            shards = {self._book_shard(isbn) for isbn in remote}
+            for loans in self._scatter({index: ('loans_of', (member_id,))
+                                        for index in shards}).values():
+                member.loans.update(loans)
+        return member
+    
+    def search_books(self, query, limit=10):
+        """
+        Find books by words in their title or author, searching every shard at once.
+        
+        Returns:
+            list: Matching Book copies, best match first
+        """
+        found = self._everywhere('search', query, limit)
+        best = heapq.merge(*found, key=lambda pair: -pair[0])
+        return [book for score, book in list(best)[:limit]]
+    
+    def report(self):
+        """
+        Gather the report figures from every shard.
+        
+        Returns:
+            dict: total_books, total_copies, total_members, borrowed_books,
+            active_members and most_borrowed, a (Book, count) pair
+        """
+        figures = self._everywhere('report')
+        report = {key: sum(shard[key] for shard in figures)
+                  for key in ('total_books', 'total_copies', 'total_members',
+                              'borrowed_books', 'active_members')}
+        # Ties go to the book added first, as in Library
+        best = min((shard for shard in figures if shard['most_borrowed'][0] is not None),
+                   key=lambda shard: (-shard['most_borrowed'][1], shard['added']), default=None)
+        report['most_borrowed'] = best['most_borrowed'] if best else (None, 0)
+        return report
+    
+    def get_most_borrowed_book(self):
+        """Get the most borrowed book as (Book, count), or (None, 0)."""
+        return self.report()['most_borrowed']
+    
+    def display_report(self):
+        """Display the library analytics report, gathered from every shard."""
+        report = self.report()
+        print("\n" + "=" * 60)
+        print("LIBRARY ANALYTICS REPORT")
+        print("=" * 60)
+        
+        print(f"\nTotal Books in Library: {report['total_books']}")
+        print(f"Total Copies: {report['total_copies']}")
+        print(f"Total Registered Members: {report['total_members']}")
+        print(f"Copies Currently Borrowed: {report['borrowed_books']}")
+        print(f"Active Members: {report['active_members']}")
+        
+        most_borrowed, count = report['most_borrowed']
+        if most_borrowed and count:
+            print(f"\nMost Borrowed Book:")
+            print(f"   Title: {most_borrowed.title}")
+            print(f"   Author: {most_borrowed.author}")
+            print(f"   Times Borrowed: {count}")
+        else:
+            print(f"\nMost Borrowed Book: None (No books borrowed yet)")
+        
+        print("\n" + "=" * 60)
+    
+    @timed('save')
+    def save_data(self):
+        """Save every shard to its own snapshot files, in parallel."""
+        self._everywhere('save')
+    
+    @timed('load')
+    def load_data(self):
+        """
+        Load every shard in parallel, then tell each whose books its members hold.
+        
+        Books that lost their place in the order of additions are placed
+        after every other book, in shard order.
+        """
+        loaded = self._everywhere('load')
+        homes = collections.defaultdict(list)
+        for shard in loaded:
+            for member_id, isbn in shard['loans']:
+                homes[self._member_shard(member_id)].append((member_id, isbn))
+        first = max(shard['newest'] for shard in loaded) + 1
+        calls = {}
+        for index, shard in enumerate(loaded):
+            calls[index] = ('place', (first,))
+            first += shard['unplaced']
+        with self._order_lock:
+            self._next_added = first
+        self._scatter(calls)
+        self._scatter({index: ('restore_remote', (items,)) for index, items in homes.items()})
+    
+    def close(self):
+        """Stop the worker processes, closing their storage."""
+        for index, connection in enumerate(self._connections):
+            with self._locks[index]:
+                connection.send(('close', ()))
+                connection.close()
+        for process in self._processes:
+            process.join()
@@ -0,0 +1,326 @@
+"""
+Library Inventory System - Snapshot Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Crash-safe, checksummed snapshot files for books and members
+"""
+
+import hashlib
+import json
+import os
+import re
+
+
+CHECKSUM_KEY = ',\n    "checksum": '
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot file is missing, truncated or corrupted."""
+
+
+def _fsync_directory(path):
+    """Make renames inside the directory of `path` durable, where supported."""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def encode(data):
+    """
+    Serialize snapshot data with a trailing SHA-256 checksum.
+    
+    The checksum covers every byte that precedes the "checksum" key, so a
+    reader can verify the file without re-serializing it.
+    
+    Args:
+        data (dict): Snapshot content (must not contain 'checksum')
+        
+    Returns:
+        str: JSON text ending with the checksum key
+    """
+    body = json.dumps(data, indent=4)[:-2]
+    digest = hashlib.sha256(body.encode('utf-8')).hexdigest()
+    return f'{body}{CHECKSUM_KEY}"{digest}"\n}}\n'
+
+
+def write(files):
+    """
+    Atomically replace a set of snapshot files as one generation.
+    
+    Each file is written to a temporary file and fsynced first. Only then
+    is the current file moved to `<name>.prev` and the new one renamed into
+    place. Whatever point a crash interrupts this at, `load` can still find
+    a generation present in every file.
+    
+    Args:
+        files (dict): Target path -> snapshot content, in write order; a
+            dict is written as checksummed JSON, bytes are written as they are
+    """
+    for path, data in files.items():
+        if isinstance(data, bytes):
+            f = open(path + '.tmp', 'wb')
+        else:
+            f = open(path + '.tmp', 'w', encoding='utf-8', newline='\n')
+            data = encode(data)
+        with f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+    
+    for path in files:
+        if os.path.exists(path):
+            os.replace(path, path + '.prev')
+        os.replace(path + '.tmp', path)
+    
+    for path in files:
+        _fsync_directory(path)
+
+
+class SnapshotReader:
+    """
+    Streams one snapshot file record by record.
+    
+    Iterating yields (key, value) pairs for the top-level keys of the file:
+    scalars are yielded once, every element of a list is yielded on its
+    own, and every member of an object is yielded as a (name, value) pair.
+    Only one record is held in memory at a time, and the checksum is
+    verified as the text goes by; a mismatch raises SnapshotError once the
+    whole file has been read, so callers must not commit what they built
+    until iteration has finished.
+    
+    Attributes:
+        path (str): File being read
+        generation (int): Generation number, from the start of the file
+        values (dict): Scalar top-level values seen so far
+    """
+    
+    TRAILER_LENGTH = len(CHECKSUM_KEY) + 64 + 5
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+    SEPARATOR = re.compile(r'[ \t\n\r]*(?:,[ \t\n\r]*)?')
+    NAME = re.compile(r'"((?:[^"\\]|\\.)*)"[ \t\n\r]*:')
+    
+    def __init__(self, path, chunk_size=1 << 20):
+        """
+        Prepare to stream a snapshot file.
+        
+        Args:
+            path (str): File to read
+            chunk_size (int): Number of characters read at a time
+        """
+        self.path = path
+        self.chunk_size = chunk_size
+        self.generation = peek_generation(path)
+        self.values = {}
+    
+    def __iter__(self):
+        """Yield (key, value) pairs; see the class docstring."""
+        decoder = json.JSONDecoder()
+        self._hash = hashlib.sha256()
+        self._held = ''
+        self._buf = ''
+        self._pos = 0
+        self._eof = False
+        
+        try:
+            with open(self.path, 'r', encoding='utf-8') as self._file:
+                self._expect('{')
+                while True:
+                    if self._peek() == '}':
+                        break
+                    key = self._decode(decoder)
+                    self._expect(':')
+                    opener = self._peek()
+                    if opener in '[{':
+                        self._pos += 1
+                        for item in self._items(decoder.scan_once, opener == '{'):
+                            yield key, item
+                    else:
+                        value = self._decode(decoder)
+                        self.values[key] = value
+                        if key != 'checksum':
+                            yield key, value
+                    if self._peek() == ',':
+                        self._pos += 1
+                
+                while not self._eof:
+                    self._fill()
+        except (ValueError, IndexError) as e:
+            raise SnapshotError(f"{self.path} is corrupted - {e}")
+        
+        expected = self.values.get('checksum')
+        if expected is not None:
+            if not self._held.startswith(CHECKSUM_KEY):
+                raise SnapshotError(f"{self.path} failed its checksum")
+            if self._hash.hexdigest() != expected:
+                raise SnapshotError(f"{self.path} failed its checksum")
+    
+    def _items(self, scan, members):
+        """
+        Yield the elements of the list (or members of the object) being read.
+        
+        This is the hot loop of a load, so whitespace, separators and member
+        names are matched with regular expressions and each value is handed
+        straight to the C scanner.
+        
+        Args:
+            scan (callable): The JSON decoder's scan_once function
+            members (bool): True for an object, False for a list
+        """
+        closer = '}' if members else ']'
+        while True:
+            while not self._eof and len(self._buf) - self._pos < self.chunk_size:
+                self._fill()
+            buf = self._buf
+            pos = self.SEPARATOR.match(buf, self._pos).end()
+            if pos < len(buf) and buf[pos] == closer:
+                self._pos = pos + 1
+                return
+            
+            end = None
+            if members:
+                match = self.NAME.match(buf, pos)
+                if match is not None:
+                    name = match.group(1)
+                    if '\\' in name:
+                        name = json.loads(f'"{name}"')
+                    pos = self.WHITESPACE.match(buf, match.end()).end()
+            if not members or match is not None:
+                try:
+                    value, end = scan(buf, pos)
+                except (StopIteration, ValueError):
+                    end = None
+            
+            # The record runs past the buffer; read more and try again
+            if end is None or end == len(buf):
+                if self._eof:
+                    raise ValueError(f"malformed record at offset {pos}")
+                self._fill()
+                continue
+            
+            self._pos = end
+            yield (name, value) if members else value
+    
+    def _fill(self):
+        """Read the next chunk, hashing all but the possible trailer."""
+        chunk = self._file.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+            return
+        
+        self._held += chunk
+        if len(self._held) > self.TRAILER_LENGTH:
+            cut = len(self._held) - self.TRAILER_LENGTH
+            self._hash.update(self._held[:cut].encode('utf-8'))
+            self._held = self._held[cut:]
+        
+        if self._pos > self.chunk_size:
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        self._buf += chunk
+    
+    def _peek(self):
+        """Skip whitespace and return the next character."""
+        while True:
+            self._pos = self.WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if self._eof:
+                raise ValueError("unexpected end of file")
+            self._fill()
+    
+    def _expect(self, char):
+        """Consume `char`, which must be the next non-blank character."""
+        if self._peek() != char:
+            raise ValueError(f"expected {char!r} at offset {self._pos}")
+        self._pos += 1
+    
+    def _decode(self, decoder):
+        """Decode the next complete JSON value, reading more text as needed."""
+        self._peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+                self._fill()
+                continue
+            # A number that ends the buffer may continue in the next chunk
+            if end == len(self._buf) and not self._eof:
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+def peek_generation(path):
+    """
+    Read the generation number from the start of a snapshot file.
+    
+    Args:
+        path (str): File to inspect
+        
+    Returns:
+        int: Generation number (0 for files written without one)
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        match = re.match(r'\{\s*"generation":\s*(\d+)', f.read(64))
+    return int(match.group(1)) if match else 0
+
+
+def candidates(paths, formats=None):
+    """
+    List the snapshot generations that every file can offer, newest first.
+    
+    Both the current file and its `.prev` backup are considered. Only the
+    generation numbers at the start of each file are read here; contents
+    and checksums are verified when a SnapshotReader is iterated, so a
+    caller falls back to the next candidate if that fails. A file that
+    does not exist in any form is treated as empty, so a library that has
+    never saved members can still be loaded.
+    
+    Args:
+        paths (list): Snapshot paths that make up one generation
+        formats (list): (peek function, reader class) per path, for files
+            in another format (default: peek_generation and SnapshotReader)
+            
+    Returns:
+        list: One list per generation, holding a reader (or None for an
+        absent file) for each path
+        
+    Raises:
+        SnapshotError: If files exist but share no generation
+    """
+    formats = formats or [(peek_generation, SnapshotReader)] * len(paths)
+    generations = []
+    for path, (peek, reader) in zip(paths, formats):
+        found = {}
+        for candidate in (path, path + '.prev'):
+            if os.path.exists(candidate):
+                try:
+                    found.setdefault(peek(candidate), candidate)
+                except (OSError, ValueError):
+                    continue
+        exists = found or os.path.exists(path) or os.path.exists(path + '.prev')
+        generations.append(found if exists else None)
+    
+    available = [found for found in generations if found is not None]
+    if not available:
+        return [[None] * len(paths)]
+    
+    common = set.intersection(*(set(found) for found in available))
+    if not common:
+        raise SnapshotError("no consistent snapshot generation found")
+    
+    return [[reader(found[generation]) if found is not None else None
+             for found, (peek, reader) in zip(generations, formats)]
+            for generation in sorted(common, reverse=True)]
@@ -0,0 +1,784 @@
+"""
+Library Inventory System - Storage Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Pluggable storage backends (JSON and columnar snapshot files, and SQLite)
+"""
+
+import sqlite3
+import sys
+import time
+import columns
+import snapshot
+from book import Book
+from events import Events
+from popularity import SECONDS_PER_DAY
+from search import tokenize
+from snapshot import SnapshotError
+
+
+class JSONStorage:
+    """
+    Stores the library as JSON snapshot files plus an optional journal.
+    
+    The whole catalog is loaded into memory at startup. Operations are
+    appended to the journal (if any) and folded back into a new snapshot
+    generation by save_data.
+    
+    Attributes:
+        lazy (bool): Always False - the library is fully loaded into memory
+        books_file (str): Filename for books data
+        members_file (str): Filename for members data
+        journal (Journal): Optional write-ahead journal of operations
+        journal_seq (int): Sequence number of the last journaled operation
+        generation (int): Generation number of the last loaded or saved snapshot
+        compact_every (int): Journal length that triggers a snapshot (0 = never)
+    """
+    
+    lazy = False
+    
+    def __init__(self, books_file='books.json', members_file='members.json',
+                 journal=None, compact_every=1000):
+        """
+        Initialize JSON storage.
+        
+        Args:
+            books_file (str): Filename for books data
+            members_file (str): Filename for members data
+            journal (Journal): Optional journal to record every operation in
+            compact_every (int): Journal length that triggers a snapshot (0 = never)
+        """
+        self.books_file = books_file
+        self.members_file = members_file
+        self.journal = journal
+        self.journal_seq = 0
+        self.generation = 0
+        self.compact_every = compact_every
+    
+    def load(self, books_file=None, members_file=None):
+        """
+        List the snapshot generations available to load, newest first.
+        
+        Args:
+            books_file (str): Filename for books data (default: current)
+            members_file (str): Filename for members data (default: current)
+            
+        Returns:
+            list: (books reader, members reader) pairs to try in order;
+            either reader is None if that file is absent
+            
+        Raises:
+            SnapshotError: If the files share no generation
+        """
+        self.books_file = books_file or self.books_file
+        self.members_file = members_file or self.members_file
+        return snapshot.candidates([self.books_file, self.members_file])
+    
+    def accept(self, books_reader, members_reader):
+        """
+        Adopt the journal position and generation of a loaded snapshot.
+        
+        Args:
+            books_reader (SnapshotReader): Reader the books were loaded from
+            members_reader (SnapshotReader): Reader the members were loaded from
+        """
+        self.generation = 0
+        self.journal_seq = 0
+        for reader in (books_reader, members_reader):
+            if reader is not None:
+                self.generation = reader.generation
+                self.journal_seq = reader.values.get('journal_seq', self.journal_seq)
+    
+    def replay(self):
+        """
+        Iterate over journaled operations newer than the loaded snapshot.
+        
+        Yields:
+            dict: Journal records, in order
+        """
+        if self.journal is None:
+            return
+        for record in self.journal.replay(after_seq=self.journal_seq):
+            self.journal_seq = record['seq']
+            yield record
+        self.journal.seq = max(self.journal.seq, self.journal_seq)
+    
+    def record(self, op, **fields):
+        """
+        Append a completed operation to the journal, if one is attached.
+        
+        Args:
+            op (str): Operation name
+            **fields: Operation arguments needed to replay it
+            
+        Returns:
+            bool: True if the journal is long enough to be compacted
+        """
+        if self.journal is None:
+            return False
+        
+        self.journal_seq = self.journal.append(op, **fields)
+        return bool(self.compact_every) and self.journal.records >= self.compact_every
+    
+    def save(self, library, books_file=None, members_file=None):
+        """
+        Write the library as a new snapshot generation.
+        
+        Args:
+            library (Library): Library to save
+            books_file (str): Filename for books data (default: current)
+            members_file (str): Filename for members data (default: current)
+        """
+        books_file = books_file or self.books_file
+        members_file = members_file or self.members_file
+        generation = self.generation + 1
+        
+        # Save books and members as one generation
+        books_data = self._books_snapshot(library, generation)
+        members_data = {
+            'generation': generation,
+            'members': [member.to_dict() for member in library.members],
+            'holds': library.holds.to_list()
+        }
+        snapshot.write({books_file: books_data, members_file: members_data})
+        
+        self.generation = generation
+        self.books_file = books_file
+        self.members_file = members_file
+        
+        # The snapshot now contains every journaled operation
+        if self.journal is not None:
+            self.journal.rotate()
+    
+    def _books_snapshot(self, library, generation):
+        """Return the content of the books file for a new generation."""
+        return {
+            'generation': generation,
+            'journal_seq': self.journal_seq,
+            'books': [book.to_dict() for book in library.books],
+            'borrow_history': library.borrow_history,
+            'popularity': library.popularity.to_dict()
+        }
+    
+    def close(self):
+        """Sync and close the journal, if any."""
+        if self.journal is not None:
+            self.journal.close()
+
+
+class ColumnarStorage(JSONStorage):
+    """
+    Stores books in a binary columnar snapshot, and members as JSON.
+    
+    The books file is memory-mapped at startup instead of being parsed:
+    Book objects are only created as books are looked up, so a large
+    catalog is usable almost at once. Members, holds and the journal are
+    kept exactly as JSONStorage keeps them, and both files still make up
+    one snapshot generation.
+    
+    Attributes:
+        lazy (bool): Always False - the Library keeps its in-memory indexes
+    """
+    
+    def __init__(self, books_file='books.col', members_file='members.json',
+                 journal=None, compact_every=1000):
+        """
+        Initialize columnar storage.
+        
+        Args:
+            books_file (str): Filename for the columnar books snapshot
+            members_file (str): Filename for members data
+            journal (Journal): Optional journal to record every operation in
+            compact_every (int): Journal length that triggers a snapshot (0 = never)
+        """
+        super().__init__(books_file, members_file, journal, compact_every)
+    
+    def load(self, books_file=None, members_file=None):
+        """
+        List the snapshot generations available to load, newest first.
+        
+        Returns:
+            list: (ColumnReader, members SnapshotReader) pairs to try in
+            order; either reader is None if that file is absent
+            
+        Raises:
+            SnapshotError: If the files share no generation
+        """
+        self.books_file = books_file or self.books_file
+        self.members_file = members_file or self.members_file
+        return snapshot.candidates(
+            [self.books_file, self.members_file],
+            [(columns.peek_generation, columns.ColumnReader),
+             (snapshot.peek_generation, snapshot.SnapshotReader)])
+    
+    def _books_snapshot(self, library, generation):
+        """Return the content of the books file for a new generation."""
+        return columns.encode(library.books, library.borrow_history,
+                              library.popularity.to_dict(), generation, self.journal_seq)
+
+
+class SQLiteStorage:
+    """
+    Stores the library in an SQLite database with indexed tables.
+    
+    The library is not loaded into memory: books and members are fetched
+    by key on first use, every operation is written through to the
+    database, and report figures are answered by indexed queries.
+    
+    Attributes:
+        lazy (bool): Always True - records are fetched on demand
+        path (str): Database filename
+        commit_every (int): Number of operations between commits (0 = caller commits)
+    """
+    
+    lazy = True
+    
+    # books.available counts the copies on the shelf, so a database from
+    # before copies were tracked (one copy, available 0 or 1) reads the same
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS books (
+            id INTEGER PRIMARY KEY,
+            isbn TEXT NOT NULL UNIQUE,
+            title TEXT NOT NULL,
+            author TEXT NOT NULL,
+            available INTEGER NOT NULL DEFAULT 1,
+            copies INTEGER NOT NULL DEFAULT 1
+        );
+        CREATE INDEX IF NOT EXISTS idx_books_borrowed
+            ON books(id) WHERE available = 0;
+        CREATE TABLE IF NOT EXISTS members (
+            id INTEGER PRIMARY KEY,
+            member_id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS loans (
+            id INTEGER PRIMARY KEY,
+            member_id TEXT NOT NULL,
+            isbn TEXT NOT NULL,
+            copy INTEGER NOT NULL DEFAULT 0,
+            borrowed_at REAL,
+            due_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_loans_member ON loans(member_id);
+        CREATE INDEX IF NOT EXISTS idx_loans_isbn ON loans(isbn);
+        CREATE TABLE IF NOT EXISTS holds (
+            id INTEGER PRIMARY KEY,
+            isbn TEXT NOT NULL,
+            member_id TEXT NOT NULL,
+            copy INTEGER,
+            deadline REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_holds_isbn ON holds(isbn, member_id);
+        CREATE TABLE IF NOT EXISTS borrow_counts (
+            isbn TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0,
+            book_id INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_borrow_counts_count
+            ON borrow_counts(count DESC, book_id);
+        CREATE TABLE IF NOT EXISTS daily_borrows (
+            day INTEGER NOT NULL,
+            isbn TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, isbn)
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+            title, author, content='books', content_rowid='id', prefix='2 3'
+        );
+        CREATE TRIGGER IF NOT EXISTS books_fts_insert AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts (rowid, title, author)
+                VALUES (new.id, new.title, new.author);
+        END;
+        CREATE TRIGGER IF NOT EXISTS books_fts_delete AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, title, author)
+                VALUES ('delete', old.id, old.title, old.author);
+        END;
+    """
+    
+    # Columns added since the first schema, for databases created before them
+    ADDED_COLUMNS = [
+        ('books', 'copies', 'INTEGER NOT NULL DEFAULT 1'),
+        ('loans', 'copy', 'INTEGER NOT NULL DEFAULT 0'),
+        ('loans', 'borrowed_at', 'REAL'),
+        ('loans', 'due_at', 'REAL'),
+    ]
+    
+    def __init__(self, path='library.db', commit_every=1):
+        """
+        Open (or create) an SQLite library database.
+        
+        By default every operation is committed as it is written, so none
+        is lost if the program crashes, just as with the JSON journal.
+        Committing every few operations instead is much faster, but the
+        operations since the last commit are lost on a crash; only use it
+        where something else commits before an operation is acknowledged,
+        as the server does with commit_every=0.
+        
+        Args:
+            path (str): Database filename
+            commit_every (int): Number of operations between commits (0 = caller commits)
+        """
+        self.path = path
+        self.commit_every = commit_every
+        self._pending = 0
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        has_fts = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'books_fts'").fetchone()
+        self.conn.executescript(self.SCHEMA)
+        for table, column, definition in self.ADDED_COLUMNS:
+            columns = [row[1] for row in self.conn.execute(f'PRAGMA table_info({table})')]
+            if column not in columns:
+                self.conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_loans_due ON loans(due_at)')
+        if not has_fts:
+            # Databases created before the search index existed
+            self.conn.execute("INSERT INTO books_fts (books_fts) VALUES ('rebuild')")
+        self.conn.commit()
+    
+    def load(self, books_file=None, members_file=None):
+        """
+        Nothing is loaded eagerly; records are fetched on first use.
+        
+        Returns:
+            tuple: (None, None)
+        """
+        return None, None
+    
+    def replay(self):
+        """Committed SQLite writes are durable; there is nothing to replay."""
+        return iter(())
+    
+    def fetch_book(self, isbn):
+        """
+        Fetch one book by ISBN.
+        
+        Args:
+            isbn (str): The ISBN to look up
+            
+        Returns:
+            tuple: (book dict, borrow count), or (None, 0) if not found
+        """
+        row = self.conn.execute(
+            'SELECT b.title, b.author, b.isbn, b.available, b.copies, c.count '
+            'FROM books b JOIN borrow_counts c ON c.isbn = b.isbn '
+            'WHERE b.isbn = ?', (isbn,)).fetchone()
+        if row is None:
+            return None, 0
+        title, author, isbn, available, copies, count = row
+        free = (1 << copies) - 1
+        if available < copies:
+            # Copies are off the shelf while on loan or set aside for a hold
+            for (copy,) in self.conn.execute(
+                    'SELECT copy FROM loans WHERE isbn = ? UNION ALL '
+                    'SELECT copy FROM holds WHERE isbn = ? AND copy IS NOT NULL', (isbn, isbn)):
+                free &= ~(1 << copy)
+        return {'title': title, 'author': author, 'isbn': isbn,
+                'available': available > 0, 'copies': copies, 'free': free}, count
+    
+    def fetch_member(self, member_id):
+        """
+        Fetch one member, with the ISBNs they currently hold.
+        
+        Args:
+            member_id (str): The member ID to look up
+            
+        Returns:
+            dict: Member dict in Member.to_dict format, or None if not found
+        """
+        row = self.conn.execute(
+            'SELECT name, member_id FROM members WHERE member_id = ?',
+            (member_id,)).fetchone()
+        if row is None:
+            return None
+        loans = self.conn.execute(
+            'SELECT isbn, copy, borrowed_at, due_at FROM loans WHERE member_id = ? ORDER BY id',
+            (member_id,)).fetchall()
+        return {'name': row[0], 'member_id': row[1],
+                'borrowed_books': [loan[0] for loan in loans],
+                'borrowed_copies': [loan[1] for loan in loans],
+                'borrowed_at': [loan[2] for loan in loans],
+                'due_at': [loan[3] for loan in loans]}
+    
+    def iter_holders(self, isbn):
+        """Yield the IDs of the members holding a copy of a book, in loan order."""
+        for (member_id,) in self.conn.execute(
+                'SELECT member_id FROM loans WHERE isbn = ? ORDER BY id', (isbn,)):
+            yield member_id
+    
+    def iter_isbns(self):
+        """Yield every ISBN in insertion order."""
+        for (isbn,) in self.conn.execute('SELECT isbn FROM books ORDER BY id'):
+            yield isbn
+    
+    def iter_member_ids(self):
+        """Yield every member ID in registration order."""
+        for (member_id,) in self.conn.execute('SELECT member_id FROM members ORDER BY id'):
+            yield member_id
+    
+    def _count(self, query):
+        """Run a COUNT query and return its single value."""
+        return self.conn.execute(query).fetchone()[0]
+    
+    def count_books(self):
+        """Return the number of books."""
+        return self._count('SELECT COUNT(*) FROM books')
+    
+    def count_members(self):
+        """Return the number of members."""
+        return self._count('SELECT COUNT(*) FROM members')
+    
+    def count_borrowed(self):
+        """Return the number of copies currently borrowed."""
+        return self._count('SELECT COUNT(*) FROM loans')
+    
+    def count_copies(self):
+        """Return the number of copies of all books."""
+        return self._count('SELECT COALESCE(SUM(copies), 0) FROM books')
+    
+    def count_active_members(self):
+        """Return the number of members holding at least one book."""
+        return self._count('SELECT COUNT(DISTINCT member_id) FROM loans')
+    
+    def most_borrowed(self):
+        """
+        Return the most borrowed ISBN, earliest added first on ties.
+        
+        Returns:
+            tuple: (isbn, count), or (None, 0) if nothing was ever borrowed
+        """
+        row = self.conn.execute(
+            'SELECT isbn, count FROM borrow_counts WHERE count > 0 '
+            'ORDER BY count DESC, book_id LIMIT 1').fetchone()
+        return row if row else (None, 0)
+    
+    def search(self, query, limit=10):
+        """
+        Find books by words (or the start of words) in their title or author.
+        
+        Args:
+            query (str): Words to search for
+            limit (int): Maximum number of results
+            
+        Returns:
+            list: Matching ISBNs, best match first
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        match = ' '.join(f'"{word}"*' for word in words)
+        return [isbn for (isbn,) in self.conn.execute(
+            'SELECT b.isbn FROM books_fts f JOIN books b ON b.id = f.rowid '
+            'WHERE books_fts MATCH ? ORDER BY bm25(books_fts, 2.0, 1.0), b.id LIMIT ?',
+            (match, limit))]
+    
+    def iter_daily_borrows(self, days):
+        """
+        Yield the per-day borrow counts of the last `days` days.
+        
+        Args:
+            days (int): Number of days to go back
+            
+        Yields:
+            tuple: (day number, ISBN, author, count), oldest day first
+        """
+        first = int(time.time() // SECONDS_PER_DAY) - days + 1
+        yield from self.conn.execute(
+            'SELECT d.day, d.isbn, b.author, d.count '
+            'FROM daily_borrows d JOIN books b ON b.isbn = d.isbn '
+            'WHERE d.day >= ? ORDER BY d.day', (first,))
+    
+    def iter_due(self, start, end):
+        """
+        Yield the loans due in a time range.
+        
+        Args:
+            start (float): Start of the range, inclusive (None = no limit)
+            end (float): End of the range, exclusive
+            
+        Yields:
+            tuple: (due time, member ID, ISBN), earliest due first
+        """
+        yield from self.conn.execute(
+            'SELECT due_at, member_id, isbn FROM loans WHERE due_at >= ? AND due_at < ? '
+            'ORDER BY due_at, member_id, isbn',
+            (float('-inf') if start is None else start, end))
+    
+    def iter_holds(self):
+        """
+        Yield every hold, oldest first.
+        
+        Yields:
+            tuple: (ISBN, member ID, copy set aside, pickup deadline), with
+            copy and deadline None while the hold is waiting
+        """
+        yield from self.conn.execute(
+            'SELECT isbn, member_id, copy, deadline FROM holds ORDER BY id')
+    
+    def _release_holds(self, pairs):
+        """End holds, putting copies set aside for them back on the shelf."""
+        self.conn.executemany(
+            'UPDATE books SET available = available + 1 WHERE isbn = ?2 AND EXISTS '
+            '(SELECT 1 FROM holds WHERE member_id = ?1 AND isbn = ?2 AND copy IS NOT NULL)',
+            pairs)
+        self.conn.executemany('DELETE FROM holds WHERE member_id = ? AND isbn = ?', pairs)
+    
+    def record(self, op, **fields):
+        """
+        Write a completed operation through to the database.
+        
+        Args:
+            op (str): Operation name
+            **fields: Operation arguments
+            
+        Returns:
+            bool: Always False - SQLite storage never needs compaction
+        """
+        execute = self.conn.execute
+        executemany = self.conn.executemany
+        now = time.time()
+        if op == 'lend':
+            items = [(fields['member_id'], fields['isbn'], fields['copy'])]
+        elif op == 'return':
+            items = [(fields['member_id'], fields['isbn'])]
+        elif op == 'lend_many':
+            items = fields['items']
+        elif op == 'return_many':
+            items = [(member_id, isbn) for member_id, isbn, copy in fields['items']]
+        
+        if op == 'add_book':
+            copies = fields.get('copies', 1)
+            cursor = execute('INSERT INTO books (isbn, title, author, available, copies) '
+                             'VALUES (?, ?, ?, ?, ?)',
+                             (fields['isbn'], fields['title'], fields['author'], copies, copies))
+            execute('INSERT INTO borrow_counts (isbn, count, book_id) VALUES (?, 0, ?)',
+                    (fields['isbn'], cursor.lastrowid))
+        elif op == 'add_books':
+            executemany('INSERT INTO books (isbn, title, author, available, copies) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        [(isbn, title, author, copies, copies)
+                         for title, author, isbn, copies in fields['items']])
+            executemany('INSERT INTO borrow_counts (isbn, count, book_id) '
+                        'SELECT isbn, 0, id FROM books WHERE isbn = ?',
+                        [(isbn,) for title, author, isbn, copies in fields['items']])
+        elif op == 'add_copies':
+            execute('UPDATE books SET copies = copies + ?, available = available + ? '
+                    'WHERE isbn = ?', (fields['count'], fields['count'], fields['isbn']))
+        elif op == 'register_member':
+            execute('INSERT INTO members (member_id, name) VALUES (?, ?)',
+                    (fields['member_id'], fields['name']))
+        elif op == 'remove_book':
+            execute('DELETE FROM books WHERE isbn = ?', (fields['isbn'],))
+            execute('DELETE FROM borrow_counts WHERE isbn = ?', (fields['isbn'],))
+        elif op == 'remove_member':
+            execute('DELETE FROM members WHERE member_id = ?', (fields['member_id'],))
+        elif op == 'place_hold':
+            execute('INSERT INTO holds (isbn, member_id) VALUES (?, ?)',
+                    (fields['isbn'], fields['member_id']))
+        elif op in ('cancel_hold', 'expire_hold'):
+            self._release_holds([(fields['member_id'], fields['isbn'])])
+        elif op == 'hold_ready':
+            execute('UPDATE holds SET copy = ?, deadline = ? WHERE member_id = ? AND isbn = ?',
+                    (fields['copy'], fields['deadline'], fields['member_id'], fields['isbn']))
+            execute('UPDATE books SET available = available - 1 WHERE isbn = ?',
+                    (fields['isbn'],))
+        elif op in ('lend', 'lend_many'):
+            # A loan ends the borrower's hold, collecting any copy set aside
+            self._release_holds([(member_id, isbn) for member_id, isbn, copy in items])
+            isbns = [(isbn,) for member_id, isbn, copy in items]
+            day = int(now // SECONDS_PER_DAY)
+            executemany('UPDATE books SET available = available - 1 WHERE isbn = ?', isbns)
+            executemany('UPDATE borrow_counts SET count = count + 1 WHERE isbn = ?', isbns)
+            executemany('INSERT INTO loans (member_id, isbn, copy, borrowed_at, due_at) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        [(member_id, isbn, copy, now, fields.get('due'))
+                         for member_id, isbn, copy in items])
+            executemany('INSERT INTO daily_borrows (day, isbn, count) VALUES (?, ?, 1) '
+                        'ON CONFLICT (day, isbn) DO UPDATE SET count = count + 1',
+                        [(day, isbn) for member_id, isbn, copy in items])
+        elif op in ('return', 'return_many'):
+            executemany('UPDATE books SET available = available + 1 WHERE isbn = ?',
+                        [(isbn,) for member_id, isbn in items])
+            executemany('DELETE FROM loans WHERE member_id = ? AND isbn = ?', items)
+        
+        self._pending += 1
+        if self.commit_every and self._pending >= self.commit_every:
+            self.commit()
+        return False
+    
+    def commit(self):
+        """Commit pending operations."""
+        self.conn.commit()
+        self._pending = 0
+    
+    def save(self, library, books_file=None, members_file=None):
+        """Commit pending operations; everything else is already stored."""
+        self.commit()
+    
+    def import_snapshot(self, books_reader, members_reader):
+        """
+        Stream a JSON snapshot into an empty database in one transaction.
+        
+        Args:
+            books_reader (SnapshotReader): Books snapshot, or None
+            members_reader (SnapshotReader): Members snapshot, or None
+            
+        Raises:
+            SnapshotError: If a snapshot file fails verification; nothing
+            is imported in that case
+        """
+        with self.conn:
+            for key, value in books_reader or ():
+                if key == 'books':
+                    copies = value.get('copies', 1)
+                    if 'free' in value:
+                        available = bin(value['free']).count('1')
+                    else:
+                        available = copies if value['available'] else 0
+                    cursor = self.conn.execute(
+                        'INSERT INTO books (isbn, title, author, available, copies) '
+                        'VALUES (?, ?, ?, ?, ?)',
+                        (value['isbn'], value['title'], value['author'], available, copies))
+                    self.conn.execute(
+                        'INSERT INTO borrow_counts (isbn, count, book_id) VALUES (?, 0, ?)',
+                        (value['isbn'], cursor.lastrowid))
+                elif key == 'borrow_history':
+                    isbn, count = value
+                    self.conn.execute('UPDATE borrow_counts SET count = ? WHERE isbn = ?',
+                                      (count, isbn))
+                elif key == 'popularity':
+                    day, counts = value
+                    self.conn.executemany(
+                        'INSERT INTO daily_borrows (day, isbn, count) VALUES (?, ?, ?)',
+                        [(int(day), isbn, count) for isbn, count in counts['titles'].items()])
+            for key, member in members_reader or ():
+                if key == 'holds':
+                    self.conn.execute(
+                        'INSERT INTO holds (isbn, member_id, copy, deadline) VALUES (?, ?, ?, ?)',
+                        member)
+                    continue
+                if key != 'members':
+                    continue
+                self.conn.execute('INSERT INTO members (member_id, name) VALUES (?, ?)',
+                                  (member['member_id'], member['name']))
+                isbns = member.get('borrowed_books', [])
+                none = [None] * len(isbns)
+                self.conn.executemany(
+                    'INSERT INTO loans (member_id, isbn, copy, borrowed_at, due_at) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(member['member_id'], *loan) for loan in zip(
+                        isbns, member.get('borrowed_copies') or [0] * len(isbns),
+                        member.get('borrowed_at') or none, member.get('due_at') or none)])
+    
+    def close(self):
+        """Commit and close the database."""
+        self.commit()
+        self.conn.close()
+
+
+def migrate(books_file, members_file, db_file, events=None):
+    """
+    Copy a JSON snapshot into a new SQLite database.
+    
+    Args:
+        books_file (str): Filename for books data
+        members_file (str): Filename for members data
+        db_file (str): SQLite database to create
+        events (Events): Event sinks and counters (default: messages printed to the console)
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    events = events if events is not None else Events()
+    storage = SQLiteStorage(db_file)
+    try:
+        if storage.count_books() or storage.count_members():
+            events.emit('Error', 'migrate_target_not_empty', "{path} already contains data!",
+                        path=db_file)
+            return False
+        
+        for books_reader, members_reader in JSONStorage(books_file, members_file).load():
+            try:
+                storage.import_snapshot(books_reader, members_reader)
+                break
+            except SnapshotError as e:
+                events.emit('Warning', 'snapshot_unreadable', "{error}", error=str(e))
+        else:
+            events.emit('Error', 'migrate_failed', "No readable snapshot generation found")
+            return False
+        
+        events.emit('Success', 'migrate', "Migrated {books} books and {members} members to {path}",
+                    books=storage.count_books(), members=storage.count_members(), path=db_file)
+        return True
+    except (SnapshotError, sqlite3.Error) as e:
+        events.emit('Error', 'migrate_failed', "Migration failed - {error}", error=str(e))
+        return False
+    finally:
+        storage.close()
+
+
+def convert_to_columns(books_file, members_file, columns_file, events=None):
+    """
+    Write the books of a JSON snapshot as a columnar snapshot.
+    
+    The columnar file gets the same generation as the JSON files, so it
+    pairs with the existing members file and journal.
+    
+    Args:
+        books_file (str): Filename for books data
+        members_file (str): Filename for members data
+        columns_file (str): Columnar books snapshot to write
+        events (Events): Event sinks and counters (default: messages printed to the console)
+        
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    events = events if events is not None else Events()
+    try:
+        for books_reader, members_reader in JSONStorage(books_file, members_file).load():
+            if books_reader is None:
+                events.emit('Error', 'file_not_found', "{path} not found!", path=books_file)
+                return False
+            books = []
+            borrow_history = {}
+            popularity = {}
+            try:
+                for key, value in books_reader:
+                    if key == 'books':
+                        books.append(Book.from_dict(value))
+                    elif key == 'borrow_history':
+                        borrow_history[value[0]] = value[1]
+                    elif key == 'popularity':
+                        popularity[value[0]] = value[1]
+                break
+            except SnapshotError as e:
+                events.emit('Warning', 'snapshot_unreadable', "{error}", error=str(e))
+        else:
+            events.emit('Error', 'convert_failed', "No readable snapshot generation found")
+            return False
+        
+        snapshot.write({columns_file: columns.encode(
+            books, borrow_history, popularity, books_reader.generation,
+            books_reader.values.get('journal_seq', 0))})
+        events.emit('Success', 'convert', "Wrote {books} books to {path}", books=len(books),
+                     path=columns_file)
+        return True
+    except (SnapshotError, OSError) as e:
+        events.emit('Error', 'convert_failed', "Conversion failed - {error}", error=str(e))
+        return False
+
+
+if __name__ == "__main__":
+    # python storage.py migrate [books.json] [members.json] [library.db]
+    # python storage.py columns [books.json] [members.json] [books.col]
+    commands = {'migrate': (migrate, 'library.db'), 'columns': (convert_to_columns, 'books.col')}
+    if len(sys.argv) < 2 or sys.argv[1] not in commands:
+        print("Usage: python storage.py migrate [books.json] [members.json] [library.db]")
+        print("       python storage.py columns [books.json] [members.json] [books.col]")
+        sys.exit(2)
+    command, target = commands[sys.argv[1]]
+    defaults = ['books.json', 'members.json', target]
+    args = sys.argv[2:] + defaults[len(sys.argv) - 2:]
+    sys.exit(0 if command(*args[:3]) else 1)
@@ -0,0 +1,273 @@
+"""
+Library Inventory System - Versions Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Versioned before-images of books and members for consistent snapshots
+"""
+
+import collections
+
+
+class VersionStore:
+    """
+    Keeps the states of books and members that open snapshots still need.
+    
+    Taking a snapshot only starts a new epoch. Nothing is copied at that
+    point. Afterwards, the first change to a book or member in each epoch
+    saves its previous state: a copy of it, or None if it did not exist.
+    A snapshot taken at epoch s reads a record's state from the first
+    saved state with epoch s or later, and from the live object if none
+    has been saved. While no snapshot is open, writers save nothing.
+    
+    Saved states are reclaimed as readers finish. A state saved in epoch e
+    is only needed by snapshots taken at e or earlier.
+    
+    Attributes:
+        epoch (int): Version of the newest snapshot taken
+        readers (Counter): Version -> number of snapshots open at it
+        books (dict): ISBN -> list of (epoch, Book copy or None), oldest first
+        members (dict): Member ID -> list of (epoch, Member copy or None)
+        abandoned (list): Versions of snapshots garbage collected without
+            being closed, released at the next open, close or keep
+    """
+    
+    def __init__(self):
+        """Initialize an empty store."""
+        self.epoch = 0
+        self.readers = collections.Counter()
+        self.books = {}
+        self.members = {}
+        self.abandoned = []
+    
+    def open(self):
+        """
+        Start a new epoch for a snapshot.
+        
+        Returns:
+            int: The snapshot's version
+        """
+        if self.abandoned:
+            self._release_abandoned()
+        self.epoch += 1
+        self.readers[self.epoch] += 1
+        return self.epoch
+    
+    def close(self, version):
+        """
+        Release a snapshot and drop the saved states no open snapshot needs.
+        
+        Args:
+            version (int): Version the snapshot was opened at
+        """
+        if self.abandoned:
+            self._release_abandoned()
+        self.readers[version] -= 1
+        if self.readers[version]:
+            return
+        del self.readers[version]
+        if not self.readers:
+            self.books = {}
+            self.members = {}
+            return
+        oldest = min(self.readers)
+        if version < oldest:
+            for history in (self.books, self.members):
+                for key in list(history):
+                    states = [state for state in history[key] if state[0] >= oldest]
+                    if states:
+                        history[key] = states
+                    else:
+                        del history[key]
+    
+    def _release_abandoned(self):
+        """Close the snapshots that were garbage collected without being closed."""
+        while self.abandoned:
+            self.close(self.abandoned.pop())
+    
+    def keep(self, history, key, live):
+        """
+        Save a record's state before it changes, if an open snapshot needs it.
+        
+        Callers hold the Library's state lock, and check `readers` first
+        so this costs nothing while no snapshot is open; it is checked
+        again here in case the last snapshot closed in between.
+        
+        Args:
+            history (dict): `books` or `members`
+            key (str): ISBN or member ID
+            live: The Book or Member as it is now, or None if there is none
+        """
+        if self.abandoned:
+            self._release_abandoned()
+        if not self.readers:
+            return
+        states = history.get(key)
+        if states is None:
+            history[key] = [(self.epoch, live.copy() if live is not None else None)]
+        elif states[-1][0] < self.epoch:
+            states.append((self.epoch, live.copy() if live is not None else None))
+    
+    def state_at(self, history, key, version, live):
+        """
+        Find a record's state as of a snapshot.
+        
+        The live object must be read before calling this. A writer saves
+        the old state before it changes anything, so if the live object
+        was caught changing, a saved state is found here.
+        
+        Args:
+            history (dict): `books` or `members`
+            key (str): ISBN or member ID
+            version (int): Snapshot version
+            live: A copy of the live Book or Member, or None
+            
+        Returns:
+            The Book or Member copy as of the snapshot, or None if it did not exist
+        """
+        for epoch, state in history.get(key, ()):
+            if epoch >= version:
+                return state
+        return live
+
+
+class Snapshot:
+    """
+    A consistent, read-only view of a Library as it was at one moment.
+    
+    Taking one costs O(1), and writers carry on while it is read: they
+    save the old state of whatever they change, once per snapshot epoch.
+    Books and members are handed out as copies. A member's Loans are
+    shared with the live member, since a Loan never changes once made;
+    a Loan's book is the live Book, whose title, author and ISBN are fixed.
+    Close the snapshot, or use it in a with block, so the saved states
+    can be reclaimed; one that is garbage collected is released soon after.
+    
+    A snapshot keeps the indexes it was taken of, so reloading the
+    Library's data does not change what it shows.
+    
+    Attributes:
+        version (int): Epoch the snapshot was taken at
+        figures (dict): total_books, total_copies, total_members,
+            borrowed_books, active_members and most_borrowed, a (Book, count)
+            pair, all as of the snapshot
+        books: Iterable, sized view of every Book, in slot order; books
+            removed since the snapshot come last
+        members: Iterable, sized view of every Member, in the order
+            registered; members removed since the snapshot come last
+    """
+    
+    def __init__(self, library, version, figures):
+        """
+        Initialize a Snapshot; use Library.snapshot rather than calling this.
+        
+        Args:
+            library (Library): Library the snapshot is of
+            version (int): Epoch the snapshot was taken at
+            figures (dict): Report figures captured with it
+        """
+        self._library = library
+        self._store = library.versions
+        self._books = library._books
+        self._members = library._members
+        self.version = version
+        self.figures = figures
+        self.books = SnapshotView(self._iter_books, figures['total_books'])
+        self.members = SnapshotView(self._iter_members, figures['total_members'])
+        self._closed = False
+    
+    def find_book(self, isbn):
+        """Return a copy of the Book with this ISBN as of the snapshot, or None."""
+        live = getattr(self._books, 'peek', self._books.get)(isbn)
+        live = live.copy() if live is not None else None
+        return self._store.state_at(self._store.books, isbn, self.version, live)
+    
+    def find_member(self, member_id):
+        """Return a copy of the Member with this ID as of the snapshot, or None."""
+        live = self._members.get(member_id)
+        live = live.copy() if live is not None else None
+        return self._store.state_at(self._store.members, member_id, self.version, live)
+    
+    def _iter_books(self):
+        """Yield every Book as of the snapshot."""
+        books = self._books
+        # A columnar mapping can look a book up without keeping it in memory
+        yield from self._iter(books, getattr(books, 'peek', books.get), 'books')
+    
+    def _iter_members(self):
+        """Yield every Member as of the snapshot."""
+        yield from self._iter(self._members, self._members.get, 'members')
+    
+    def _iter(self, records, lookup, kind):
+        """
+        Yield the snapshot's state of each live record, then of those removed since.
+        
+        The keys are listed first, since a dict cannot be iterated while
+        it grows, and the saved states are listed only after that, so a
+        record removed in between is found among them.
+        
+        Args:
+            records: The Library's books or members mapping
+            lookup (callable): Maps a key to its live object, or None
+            kind (str): 'books' or 'members'
+        """
+        store = self._store
+        history = getattr(store, kind)
+        keys = list(records)
+        removed = set(history)
+        for key in keys:
+            removed.discard(key)
+            live = lookup(key)
+            live = live.copy() if live is not None else None
+            state = store.state_at(history, key, self.version, live)
+            if state is not None:
+                yield state
+        for key in removed:
+            state = store.state_at(history, key, self.version, None)
+            if state is not None:
+                yield state
+    
+    def close(self):
+        """Release the snapshot, letting its saved states be reclaimed."""
+        if not self._closed:
+            self._closed = True
+            self._library._close_snapshot(self._store, self.version)
+    
+    def __enter__(self):
+        """Use the snapshot in a with block."""
+        return self
+    
+    def __exit__(self, *exc_info):
+        """Close the snapshot at the end of the with block."""
+        self.close()
+    
+    def __del__(self):
+        """Hand a snapshot that was never closed back to be released."""
+        # The collector may run while this thread holds the state lock, so
+        # the release is left to the next thread that takes it
+        if not self._closed:
+            self._closed = True
+            self._store.abandoned.append(self.version)
+
+
+class SnapshotView:
+    """Iterable, sized view of the books or members of a Snapshot."""
+    
+    def __init__(self, iterate, count):
+        """
+        Initialize the view.
+        
+        Args:
+            iterate (callable): Returns an iterator over the records
+            count (int): Number of records as of the snapshot
+        """
+        self._iterate = iterate
+        self._count = count
+    
+    def __iter__(self):
+        """Yield every record as of the snapshot."""
+        return self._iterate()
+    
+    def __len__(self):
+        """Return the number of records as of the snapshot."""
+        return self._count
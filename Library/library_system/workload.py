@@ -0,0 +1,146 @@
+"""
+Library Inventory System - Workload Module
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Seeded generator of synthetic catalogs, members and lend/return traffic
+"""
+
+import itertools
+import random
+
+
+def make_isbn(n):
+    """
+    Build a 13-digit ISBN string for the n-th generated book.
+    
+    Args:
+        n (int): Sequence number of the book
+        
+    Returns:
+        str: A unique ISBN-like string
+    """
+    return f"978{n:010d}"
+
+
+def member_id(n):
+    """
+    Build the member ID of the n-th generated member.
+    
+    Args:
+        n (int): Sequence number of the member
+        
+    Returns:
+        str: A unique member ID
+    """
+    return f"M{n:08d}"
+
+
+def zipf_cum_weights(count, exponent=1.0):
+    """
+    Cumulative Zipf weights for ranks 1 to `count`, for random.choices.
+    
+    Args:
+        count (int): Number of ranks
+        exponent (float): Zipf exponent; larger values concentrate on the top ranks
+        
+    Returns:
+        list: Cumulative weight of each rank
+    """
+    return list(itertools.accumulate(1 / rank ** exponent for rank in range(1, count + 1)))
+
+
+def generate_catalog(size, seed=42, authors=None):
+    """
+    Generate a catalog of books.
+    
+    A few prolific authors write most of the books (Zipf-distributed),
+    and about one title in five has several copies.
+    
+    Args:
+        size (int): Number of books
+        seed (int): Random seed; the same seed gives the same catalog
+        authors (int): Number of distinct authors (default: one per ten books)
+        
+    Returns:
+        list: (title, author, isbn, copies) tuples, ISBNs in ascending order
+    """
+    rng = random.Random(seed)
+    authors = authors or max(size // 10, 1)
+    names = rng.choices(range(authors), cum_weights=zipf_cum_weights(authors), k=size)
+    catalog = []
+    for n, author in enumerate(names):
+        copies = rng.randint(2, 5) if rng.random() < 0.2 else 1
+        catalog.append((f"Title {n}", f"Author {author}", make_isbn(n), copies))
+    return catalog
+
+
+def generate_members(count):
+    """
+    Generate members.
+    
+    Args:
+        count (int): Number of members
+        
+    Returns:
+        list: (name, member ID) tuples
+    """
+    return [(f"Member {n}", member_id(n)) for n in range(count)]
+
+
+def generate_operations(catalog, members, operations, seed=42, exponent=0.8,
+                        outstanding=None):
+    """
+    Generate lend and return traffic against a catalog.
+    
+    Book popularity follows Zipf's law over a seeded shuffle of the
+    catalog, so the bestsellers are spread across the ISBN range rather
+    than being the first books added. Borrowers are chosen uniformly.
+    The more copies are out, the likelier the next operation is a return,
+    so the traffic settles with about `outstanding` copies on loan. The
+    generator follows the copies on loan as the library would, so
+    each return gives back a copy that is actually out; a lend may still
+    fail because every copy is out or the member already holds one, just
+    as it would at a real desk.
+    
+    Args:
+        catalog (list): (title, author, isbn, copies) tuples from generate_catalog
+        members (list): (name, member ID) tuples from generate_members
+        operations (int): Number of operations to generate
+        seed (int): Random seed; the same seed gives the same traffic
+        exponent (float): Zipf exponent of book popularity
+        outstanding (int): Copies on loan the traffic settles around
+            (default: one per member)
+            
+    Returns:
+        list: ('lend' or 'return', member ID, isbn) tuples
+    """
+    rng = random.Random(seed)
+    outstanding = outstanding or len(members)
+    ranked = list(range(len(catalog)))
+    rng.shuffle(ranked)
+    picks = iter(rng.choices(ranked, cum_weights=zipf_cum_weights(len(ranked), exponent),
+                             k=operations))
+    
+    available = [copies for _, _, _, copies in catalog]
+    loans = []  # (member index, book index) of every copy out
+    held = set()
+    result = []
+    for _ in range(operations):
+        if rng.random() * (len(loans) + outstanding) < len(loans):
+            slot = rng.randrange(len(loans))
+            loans[slot], loans[-1] = loans[-1], loans[slot]
+            member, book = loans.pop()
+            held.discard((member, book))
+            available[book] += 1
+            result.append(('return', members[member][1], catalog[book][2]))
+            continue
+        
+        book = next(picks)
+        member = rng.randrange(len(members))
+        if available[book] and (member, book) not in held:
+            available[book] -= 1
+            held.add((member, book))
+            loans.append((member, book))
+        result.append(('lend', members[member][1], catalog[book][2]))
+    return result
@@ -0,0 +1,41 @@
+"""
+Library Inventory System - Borrowing Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check that borrowing says whether it worked, including for copy 0
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from book import Book
+from member import Member
+
+
+class BorrowTest(unittest.TestCase):
+    """borrow() and borrow_book() return bools; the *_copy variants name the copy."""
+    
+    def test_first_copy_counts_as_success(self):
+        book = Book('Title', 'Author', 'B1', copies=2)
+        member = Member('Member', 'M1')
+        self.assertIs(member.borrow_book(book), True)
+        self.assertEqual(member.loans['B1'].copy, 0)
+        self.assertIs(member.borrow_book(book), False)
+        self.assertIs(book.borrow(), True)
+        self.assertIs(book.borrow(), False)
+    
+    def test_copy_variants_return_the_copy(self):
+        book = Book('Title', 'Author', 'B1', copies=2)
+        self.assertEqual(Member('First', 'M1').borrow_copy(book), 0)
+        self.assertEqual(book.borrow_copy(), 1)
+        self.assertIsNone(Member('Second', 'M2').borrow_copy(book))
+        self.assertIsNone(book.borrow_copy())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Library Inventory System - View Cache Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check that cached book and member views follow lends and returns, and expire
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from cache import LRUCache
+from events import Events
+from library import Library
+
+
+class ViewInvalidationTest(unittest.TestCase):
+    """A lend or return drops the cached views of the book and the member."""
+    
+    def setUp(self):
+        self.library = Library(storage=None, events=Events(sinks=[]), view_cache=16)
+        self.library.add_book('Title', 'Author', 'B1', copies=2)
+        self.library.register_member('Member', 'M1')
+    
+    def test_lend_and_return_are_seen(self):
+        library = self.library
+        self.assertIn('2 of 2 copies available', library.describe_book('B1'))
+        self.assertEqual(library.describe_member('M1', 'dict')['borrowed_books'], [])
+        # Served from the cache until something changes
+        hits = library.views.hits
+        library.describe_book('B1')
+        self.assertEqual(library.views.hits, hits + 1)
+        
+        library.lend_book('M1', 'B1')
+        self.assertIn('1 of 2 copies available', library.describe_book('B1'))
+        self.assertEqual(library.describe_member('M1', 'dict')['borrowed_books'], ['B1'])
+        
+        library.take_return('M1', 'B1')
+        self.assertIn('2 of 2 copies available', library.describe_book('B1'))
+        self.assertEqual(library.describe_member('M1', 'dict')['borrowed_books'], [])
+    
+    def test_removed_book_is_not_served(self):
+        self.assertIsNotNone(self.library.describe_book('B1'))
+        self.library.remove_book('B1')
+        self.assertIsNone(self.library.describe_book('B1'))
+
+
+class ExpiryTest(unittest.TestCase):
+    """Entries stop being served once their time to live has passed."""
+    
+    def setUp(self):
+        self.now = 1000.0
+        self.cache = LRUCache(4, ttl=60, clock=lambda: self.now)
+    
+    def test_entry_expires(self):
+        self.cache.put('key', 'value')
+        self.now += 59
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.now += 1
+        self.assertIsNone(self.cache.get('key'))
+        self.assertEqual(self.cache.expirations, 1)
+        self.assertEqual(len(self.cache), 0)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+    
+    def test_replacing_an_entry_restarts_its_time(self):
+        self.cache.put('key', 'old')
+        self.now += 45
+        self.cache.put('key', 'new')
+        self.now += 45
+        self.assertEqual(self.cache.get('key'), 'new')
+    
+    def test_put_after_invalidation_is_skipped(self):
+        since = self.cache.invalidations
+        self.cache.invalidate('key')
+        self.assertFalse(self.cache.put('key', 'stale', since))
+        self.assertIsNone(self.cache.get('key'))
+
+
+if __name__ == '__main__':
+    unittest.main()
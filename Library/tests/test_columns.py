@@ -0,0 +1,78 @@
+"""
+Library Inventory System - Columnar Storage Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check paging over a columnar snapshot and the books added since
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from columns import ColumnarBooks
+from events import Events
+from library import Library
+from storage import ColumnarStorage
+
+
+class ColumnarPagingTest(unittest.TestCase):
+    """Cursor pages over snapshot books, then books added and removed since."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        library = self.open_library()
+        library.add_books([(f"Title {n}", 'Author', f"S{n}", 1) for n in range(30)])
+        library.save_data()
+        library.close()
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+    
+    def open_library(self):
+        library = Library(storage=ColumnarStorage(), events=Events(sinks=[]))
+        library.load_data()
+        return library
+    
+    def pages(self, library, size):
+        isbns = []
+        cursor = None
+        while True:
+            page = list(library.iter_books(start_after=cursor, limit=size))
+            isbns.extend(book.isbn for book in page)
+            if len(page) < size:
+                return isbns
+            cursor = page[-1].slot
+    
+    def test_pages_cover_snapshot_and_added_books_in_order(self):
+        library = self.open_library()
+        self.assertIsInstance(library._books, ColumnarBooks)
+        for n in range(10):
+            library.add_book(f"Added {n}", 'Author', f"A{n}")
+        library.remove_book('A3')
+        library.remove_book('S5')
+        library.add_book('Again', 'Author', 'S5')
+        # Looking books up keeps them, which must not disturb the order
+        for n in range(0, 30, 2):
+            library.find_book_by_isbn(f"S{n}")
+        
+        expected = ([f"S{n}" for n in range(30) if n != 5] +
+                    [f"A{n}" for n in range(10) if n != 3] + ['S5'])
+        self.assertEqual([book.isbn for book in library.books], expected)
+        for size in (1, 7, 40, 100):
+            self.assertEqual(self.pages(library, size), expected)
+        added = library.find_book_by_isbn('A0').slot
+        self.assertEqual([book.isbn for book in library.iter_books(start_after=added, limit=3)],
+                         ['A1', 'A2', 'A4'])
+        library.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
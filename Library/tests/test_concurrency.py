@@ -0,0 +1,138 @@
+"""
+Library Inventory System - Concurrency Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Stress a Library shared by threads and check it stays consistent
+"""
+
+import os
+import random
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from events import Events
+from journal import Journal
+from library import Library
+
+
+BOOKS = 40
+MEMBERS = 60
+THREADS = 8
+OPERATIONS = 3000
+
+
+def state(library):
+    """Capture everything a replay must reproduce."""
+    books = sorted((book.isbn, book.copies, book.free) for book in library.books)
+    loans = sorted((member.member_id, isbn, loan.copy)
+                   for member in library.members for isbn, loan in member.loans.items())
+    return books, loans, sorted(map(tuple, library.holds.to_list()))
+
+
+def worker(library, seed, errors):
+    """
+    Lend, return and place or cancel holds on random books, collecting any exception.
+    
+    Most returns and cancellations are of this worker's own loans and of
+    holds that exist, so the library keeps turning over rather than
+    running out of copies.
+    """
+    rng = random.Random(seed)
+    lent = []
+    try:
+        for _ in range(OPERATIONS):
+            member_id = f"M{rng.randrange(MEMBERS)}"
+            isbn = f"B{rng.randrange(BOOKS)}"
+            action = rng.random()
+            if action < 0.45:
+                if library.lend_book(member_id, isbn):
+                    lent.append((member_id, isbn))
+            elif action < 0.9:
+                if lent and rng.random() < 0.9:
+                    member_id, isbn = lent.pop(rng.randrange(len(lent)))
+                library.take_return(member_id, isbn)
+            elif action < 0.94:
+                library.place_hold(member_id, isbn)
+            else:
+                held = sorted(library.holds.holds_of(member_id))
+                library.cancel_hold(member_id, rng.choice(held) if held else isbn)
+    except Exception as e:
+        errors.append(e)
+
+
+class StripedLockingTest(unittest.TestCase):
+    """Many threads lending, returning and holding through one striped Library."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        self.interval = sys.getswitchinterval()
+        # Switch threads far more often than usual to provoke races
+        sys.setswitchinterval(1e-6)
+    
+    def tearDown(self):
+        sys.setswitchinterval(self.interval)
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+    
+    def open_library(self):
+        return Library(journal=Journal('journal.log'), compact_every=0, lock_stripes=16,
+                       availability_bitmap=True, events=Events(sinks=[]))
+    
+    def test_invariants_hold_and_journal_replays(self):
+        library = self.open_library()
+        rng = random.Random(7)
+        for n in range(BOOKS):
+            library.add_book(f"Title {n}", f"Author {n % 7}", f"B{n}", copies=rng.randint(1, 3))
+        for n in range(MEMBERS):
+            library.register_member(f"Member {n}", f"M{n}")
+        
+        errors = []
+        threads = [threading.Thread(target=worker, args=(library, seed, errors))
+                   for seed in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        self.assertEqual(errors, [])
+        self.assertGreater(sum(library.borrow_history.values()), OPERATIONS)
+        self.assertTrue(library.check_counters())
+        
+        # Every copy is on the shelf, on loan to one member, or set aside for one hold
+        held = {}
+        for member in library.members:
+            self.assertEqual(len(member.loans), len(set(member.loans)))
+            for isbn, loan in member.loans.items():
+                self.assertNotIn((isbn, loan.copy), held)
+                held[(isbn, loan.copy)] = member.member_id
+        for isbn, member_id, copy, deadline in library.holds.to_list():
+            if copy is not None:
+                self.assertNotIn((isbn, copy), held)
+                held[(isbn, copy)] = member_id
+        for book in library.books:
+            for copy in range(book.copies):
+                on_shelf = bool(book.free >> copy & 1)
+                self.assertNotEqual(on_shelf, (book.isbn, copy) in held, (book.isbn, copy))
+            self.assertEqual({member.member_id for member in library.get_holders(book.isbn)},
+                             {member.member_id for member in library.members
+                              if book.isbn in member.loans})
+        
+        expected = state(library)
+        library.close()
+        replayed = self.open_library()
+        replayed.load_data()
+        self.assertEqual(state(replayed), expected)
+        self.assertTrue(replayed.check_counters())
+        replayed.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Library Inventory System - Due Date Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check overdue and due-soon queries around bucket and due boundaries
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from dues import DueIndex
+from events import Events
+from library import Library
+from popularity import SECONDS_PER_DAY
+
+
+HOUR = 3600
+BOUNDARY = 1000 * HOUR  # start of bucket 1000
+
+
+class DueIndexTest(unittest.TestCase):
+    """Loans due either side of a bucket boundary and within one bucket."""
+    
+    def setUp(self):
+        self.dues = DueIndex(bucket_seconds=HOUR)
+        self.times = {'before': BOUNDARY - 1, 'at': BOUNDARY, 'middle': BOUNDARY + HOUR // 2,
+                      'end': BOUNDARY + HOUR - 1, 'next': BOUNDARY + HOUR}
+        for name, due in self.times.items():
+            self.dues.add(name, 'B1', due)
+    
+    def names(self, start, end):
+        return [member_id for due, member_id, isbn in self.dues.between(start, end)]
+    
+    def test_end_is_exclusive_even_on_a_boundary(self):
+        self.assertEqual(self.names(None, BOUNDARY), ['before'])
+        self.assertEqual(self.names(None, BOUNDARY + 1), ['before', 'at'])
+    
+    def test_partial_buckets_are_filtered_by_due_time(self):
+        self.assertEqual(self.names(None, BOUNDARY + HOUR // 2), ['before', 'at'])
+        self.assertEqual(self.names(BOUNDARY + 1, BOUNDARY + HOUR), ['middle', 'end'])
+        self.assertEqual(self.names(BOUNDARY, BOUNDARY + HOUR + 1),
+                         ['at', 'middle', 'end', 'next'])
+    
+    def test_removed_loan_is_gone_and_empty_bucket_dropped(self):
+        self.dues.remove('next', 'B1', self.times['next'])
+        self.assertEqual(self.names(BOUNDARY + HOUR, BOUNDARY + 2 * HOUR), [])
+        self.assertEqual(len(self.dues), 4)
+        self.assertNotIn(1001, self.dues._numbers)
+
+
+class OverdueLoansTest(unittest.TestCase):
+    """A Library's overdue list and fines as a loan passes its due time."""
+    
+    def test_loan_becomes_overdue_just_after_it_is_due(self):
+        library = Library(events=Events(sinks=[]), loan_days=14, fine_per_day=0.25)
+        library.add_book('Title', 'Author', 'B1')
+        library.register_member('Member', 'M1')
+        library.lend_book('M1', 'B1')
+        due = library.find_member_by_id('M1').loans['B1'].due_at
+        
+        self.assertEqual(library.get_overdue_loans(due), [])
+        self.assertEqual(library.get_overdue_loans(due + 1), [(due, 'M1', 'B1')])
+        self.assertEqual(library.get_loans_due(hours=1, now=due - HOUR + 1), [(due, 'M1', 'B1')])
+        self.assertEqual(library.get_loans_due(hours=1, now=due - HOUR), [])
+        self.assertEqual(library.compute_fines(due + 1), {'M1': 0.25})
+        self.assertEqual(library.compute_fines(due + SECONDS_PER_DAY + 1), {'M1': 0.5})
+        
+        library.take_return('M1', 'B1')
+        self.assertEqual(library.get_overdue_loans(due + 1), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
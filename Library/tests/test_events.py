@@ -0,0 +1,64 @@
+"""
+Library Inventory System - Events Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check latency sampling settings and that each Library samples its own calls
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from events import Events
+from library import Library
+
+
+def small_library(**options):
+    """A Library with one book and one member and no event sinks."""
+    library = Library(events=Events(sinks=[], **options))
+    library.add_book('Title', 'Author', 'B1')
+    library.register_member('Member', 'M1')
+    return library
+
+
+class SamplingTest(unittest.TestCase):
+    """sample_every is validated and calls are counted per Events, not per method."""
+    
+    def test_sample_every_must_be_positive(self):
+        for value in (0, -1, 1.5, True, None):
+            with self.assertRaises(ValueError):
+                Events(sample_every=value)
+    
+    def test_libraries_count_their_own_calls(self):
+        first = small_library(sample_every=2)
+        second = small_library(sample_every=2)
+        first.lend_book('M1', 'B1')
+        second.lend_book('M1', 'B1')
+        # Each library has made one lend, so neither has reached its sample yet
+        self.assertNotIn('lend', first.events.histograms)
+        self.assertNotIn('lend', second.events.histograms)
+        second.take_return('M1', 'B1')
+        second.lend_book('M1', 'B1')
+        self.assertEqual(second.events.histograms['lend'].count, 1)
+        self.assertEqual(first.events.calls['lend'], 1)
+    
+    def test_lookups_are_timed_only_when_asked(self):
+        library = small_library(sample_every=1)
+        library.find_book_by_isbn('B1')
+        self.assertEqual(library.events.lookups, 0)
+        self.assertNotIn('lookup', library.events.histograms)
+        
+        library = small_library(sample_every=1, time_lookups=True)
+        library.events.reset()
+        self.assertEqual(library.find_book_by_isbn('B1').isbn, 'B1')
+        self.assertIsNone(library.find_book_by_isbn('B2'))
+        self.assertEqual(library.events.lookups, 2)
+        self.assertEqual(library.events.histograms['lookup'].count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
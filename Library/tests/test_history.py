@@ -0,0 +1,139 @@
+"""
+Library Inventory System - Loan History Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check that lends and returns replayed from the journal reach the loan history
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from events import Events
+from history import LoanHistory
+from journal import Journal
+from library import Library
+
+
+class JournalReplayTest(unittest.TestCase):
+    """A crash between history syncs must not lose the lends and returns the journal kept."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+    
+    def open_library(self):
+        library = Library(journal=Journal('journal.log'), compact_every=0,
+                          events=Events(sinks=[]), history=LoanHistory('history'))
+        library.load_data()
+        return library
+    
+    def crash(self, library, keep_history):
+        """Stop without saving; the history loses everything since its last sync unless kept."""
+        library.storage.journal.close()
+        log = library.history._file.name
+        library.history.close()
+        if not keep_history:
+            with open(log, 'r+b') as file:
+                file.truncate(self.synced)
+    
+    def work(self, library):
+        library.add_book('Title', 'Author', 'B1', copies=2)
+        for n in range(3):
+            library.register_member(f"Member {n}", f"M{n}")
+        library.history.sync()
+        self.synced = os.path.getsize(library.history._file.name)
+        library.lend_book('M0', 'B1')
+        library.take_return('M0', 'B1')
+        library.lend_many([('M1', 'B1'), ('M2', 'B1')])
+        library.return_many([('M2', 'B1')])
+    
+    def history_of(self, library):
+        return [(event['op'], event['member_id'], event['copy'])
+                for event in library.get_loan_history(isbn='B1')]
+    
+    def test_lost_history_is_rebuilt_from_the_journal(self):
+        library = self.open_library()
+        self.work(library)
+        expected = self.history_of(library)
+        self.assertEqual(len(expected), 5)
+        self.crash(library, keep_history=False)
+        
+        library = self.open_library()
+        self.assertEqual(self.history_of(library), expected)
+        self.assertEqual(library.get_last_borrower('B1', copy=0)['member_id'], 'M1')
+        library.close()
+    
+    def test_kept_history_is_not_logged_twice(self):
+        library = self.open_library()
+        self.work(library)
+        expected = self.history_of(library)
+        self.crash(library, keep_history=True)
+        
+        library = self.open_library()
+        self.assertEqual(self.history_of(library), expected)
+        library.close()
+
+
+class TornTailTest(unittest.TestCase):
+    """A torn trailing record is dropped quietly when the console sink is off, and counted."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+    
+    def test_journal_tail(self):
+        journal = Journal('journal.log')
+        journal.append('add_member', name='Member', member_id='M1')
+        journal.close()
+        size = os.path.getsize('journal.log')
+        with open('journal.log', 'ab') as file:
+            file.write(b'{"seq": 2, "op": "rem')
+        
+        events = Events(sinks=[])
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            journal = Journal('journal.log', events=events)
+        journal.close()
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual(events.counters['journal_tail_discarded'], 1)
+        self.assertEqual(journal.seq, 1)
+        self.assertEqual(os.path.getsize('journal.log'), size)
+    
+    def test_history_tail(self):
+        history = LoanHistory('history')
+        history.append('lend', 'M1', 'B1', copy=0)
+        history.close()
+        log = history._file.name
+        size = os.path.getsize(log)
+        with open(log, 'ab') as file:
+            file.write(b'\x01')
+        
+        events = Events(sinks=[])
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            history = LoanHistory('history', events=events)
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual(events.counters['history_tail_discarded'], 1)
+        self.assertEqual([event['member_id'] for event in history.query(isbn='B1')], ['M1'])
+        history.close()
+        self.assertEqual(os.path.getsize(log), size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+"""
+Library Inventory System - Hold Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check that returned copies go to waiting members and holds expire
+"""
+
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from events import Events
+from library import Library
+from popularity import SECONDS_PER_DAY
+
+
+class HoldTest(unittest.TestCase):
+    """One copy of a book and a queue of members waiting for it."""
+    
+    def setUp(self):
+        self.library = Library(events=Events(sinks=[]), hold_days=7)
+        self.library.add_book('Title', 'Author', 'B1')
+        for n in range(4):
+            self.library.register_member(f"Member {n}", f"M{n}")
+        self.library.lend_book('M0', 'B1')
+    
+    def test_returned_copy_is_set_aside_for_the_first_in_line(self):
+        library = self.library
+        self.assertEqual(library.place_hold('M1', 'B1'), 1)
+        self.assertEqual(library.place_hold('M2', 'B1'), 2)
+        
+        library.take_return('M0', 'B1')
+        self.assertEqual(library.holds.ready_copy('B1', 'M1'), 0)
+        self.assertFalse(library.find_book_by_isbn('B1').available)
+        # The copy is not on the shelf for anyone else
+        self.assertFalse(library.lend_book('M3', 'B1'))
+        self.assertTrue(library.lend_book('M1', 'B1'))
+        self.assertFalse(library.holds.has_hold('B1', 'M1'))
+        
+        library.take_return('M1', 'B1')
+        self.assertEqual(library.holds.ready_copy('B1', 'M2'), 0)
+        self.assertTrue(library.check_counters())
+    
+    def test_uncollected_copy_passes_on_then_returns_to_the_shelf(self):
+        library = self.library
+        library.place_hold('M1', 'B1')
+        library.place_hold('M2', 'B1')
+        library.take_return('M0', 'B1')
+        
+        later = time.time() + 8 * SECONDS_PER_DAY
+        library._expire_holds(later)
+        self.assertFalse(library.holds.has_hold('B1', 'M1'))
+        self.assertEqual(library.holds.ready_copy('B1', 'M2'), 0)
+        
+        library._expire_holds(later + 8 * SECONDS_PER_DAY)
+        self.assertFalse(library.holds.has_hold('B1', 'M2'))
+        self.assertTrue(library.find_book_by_isbn('B1').available)
+        self.assertEqual(library.holds.ready_count, 0)
+        self.assertTrue(library.lend_book('M3', 'B1'))
+        self.assertTrue(library.check_counters())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Library Inventory System - Search Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check that searches follow books being added, removed and retitled
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from book import Book
+from events import Events
+from library import Library
+from search import SearchIndex
+
+
+def isbns(books):
+    return [book.isbn for book in books]
+
+
+class LibrarySearchTest(unittest.TestCase):
+    """Library.search_books as books come and go."""
+    
+    def setUp(self):
+        self.library = Library(events=Events(sinks=[]))
+        self.library.add_book('The Hobbit', 'J. R. R. Tolkien', 'B1')
+        self.library.add_book('Dune', 'Frank Herbert', 'B2')
+    
+    def test_added_book_is_found_by_title_author_and_prefix(self):
+        self.assertEqual(isbns(self.library.search_books('silmarillion')), [])
+        self.library.add_book('The Silmarillion', 'J. R. R. Tolkien', 'B3')
+        self.assertEqual(isbns(self.library.search_books('silmarillion')), ['B3'])
+        self.assertEqual(isbns(self.library.search_books('silm')), ['B3'])
+        self.assertEqual(sorted(isbns(self.library.search_books('tolkien'))), ['B1', 'B3'])
+        # A title match outranks an author-only match
+        self.library.add_book('Tolkien: A Biography', 'Humphrey Carpenter', 'B4')
+        self.assertEqual(isbns(self.library.search_books('tolkien'))[0], 'B4')
+    
+    def test_removed_book_is_not_found(self):
+        self.assertTrue(self.library.remove_book('B2'))
+        self.assertEqual(isbns(self.library.search_books('dune')), [])
+        self.assertEqual(isbns(self.library.search_books('herbert')), [])
+        self.assertEqual(isbns(self.library.search_books('hobbit')), ['B1'])
+
+
+class RetitleTest(unittest.TestCase):
+    """A book retitled in place is removed and added again, as the index expects."""
+    
+    def test_retitled_book_is_found_only_by_its_new_title(self):
+        index = SearchIndex()
+        book = Book('Fellowship', 'J. R. R. Tolkien', 'B1')
+        other = Book('Fellowship Notes', 'Someone Else', 'B2')
+        # The index breaks ties by slot, which a Library would have given them
+        book.slot, other.slot = 0, 1
+        index.add_many([book, other])
+        self.assertEqual(len(index.search('fellowship')), 2)
+        
+        index.remove(book)
+        book.title = 'The Two Towers'
+        index.add(book)
+        self.assertEqual([found for found, score in index.search('fellowship')], [other])
+        self.assertEqual([found for found, score in index.search('towers')], [book])
+        self.assertEqual([found for found, score in index.search('tolkien')], [book])
+        self.assertEqual(index.size, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
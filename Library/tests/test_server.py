@@ -0,0 +1,90 @@
+"""
+Library Inventory System - Server Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check that bad requests fail on their own without dropping the connection
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from events import Events
+from journal import Journal
+from library import Library
+from server import LibraryServer
+from storage import JSONStorage
+
+
+class MalformedRequestTest(unittest.TestCase):
+    """Requests with fields of the wrong type, followed by good ones on one connection."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        storage = JSONStorage(journal=Journal('journal.log', sync_every=0), compact_every=0)
+        self.library = Library(storage=storage, events=Events(sinks=[]))
+        self.library.add_book('Title', 'Author', 'B1', copies=2)
+        self.library.register_member('Member', 'M1')
+    
+    def tearDown(self):
+        self.library.close()
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+    
+    async def exchange(self, lines):
+        """Send raw request lines over one connection and read a reply to each."""
+        server = LibraryServer(self.library, port=0, compact_every=0)
+        await server.start()
+        try:
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.port)
+            writer.write(b''.join(line.encode('utf-8') + b'\n' for line in lines))
+            await writer.drain()
+            replies = []
+            for _ in lines:
+                line = await asyncio.wait_for(reader.readline(), 10)
+                self.assertTrue(line, "connection dropped")
+                replies.append(json.loads(line))
+            writer.close()
+            await writer.wait_closed()
+            return replies
+        finally:
+            await server.stop()
+    
+    def test_wrong_types_fail_alone(self):
+        bad = [
+            {'op': 'add_book', 'title': 'T', 'author': 'A', 'isbn': 'B2', 'copies': '2'},
+            {'op': 'add_book', 'title': 'T', 'author': 'A', 'isbn': 'B3', 'copies': True},
+            {'op': 'lend', 'member_id': ['x'], 'isbn': 'B1'},
+            {'op': 'lend_many', 'items': [['M1']]},
+            {'op': 'lend_many', 'items': 'M1'},
+            {'op': 'search', 'query': {'q': 1}},
+            {'op': ['lend']},
+        ]
+        good = [{'op': 'lend', 'member_id': 'M1', 'isbn': 'B1'}, {'op': 'ping'}]
+        lines = [json.dumps({'id': n, **request}) for n, request in enumerate(bad + good)]
+        replies = asyncio.run(self.exchange(lines))
+        
+        for reply in replies[:len(bad)]:
+            self.assertFalse(reply['ok'])
+            self.assertIn('error', reply)
+        self.assertEqual([reply.get('id') for reply in replies[:len(bad) - 1]],
+                         list(range(len(bad) - 1)))
+        self.assertEqual([reply['ok'] for reply in replies[len(bad):]], [True, True])
+        self.assertEqual(replies[-1]['result'], 'pong')
+        # Nothing from the bad requests reached the library
+        self.assertIsNone(self.library.find_book_by_isbn('B2'))
+        self.assertIsNone(self.library.find_book_by_isbn('B3'))
+        self.assertEqual(list(self.library.find_member_by_id('M1').loans), ['B1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""
+Library Inventory System - Sharding Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check all-or-nothing batches and the report on a ShardedLibrary
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from events import Events
+from sharding import ShardedLibrary
+
+
+class AtomicBatchTest(unittest.TestCase):
+    """Atomic lend_many and return_many with members on several shards."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = ShardedLibrary(3, self.directory.name, events=Events(sinks=[]),
+                                      compact_every=0)
+        self.shelves = {}  # shard -> ISBNs of the books it holds
+        for n in range(30):
+            self.library.add_book(f"Title {n}", 'Author', f"B{n}")
+            self.library.register_member(f"Member {n}", f"M{n}")
+            self.shelves.setdefault(self.library._book_shard(f"B{n}"), []).append(f"B{n}")
+        # Books on one shard; the members M0-M29 are spread over all three
+        self.isbns = self.shelves[min(self.shelves)]
+    
+    def tearDown(self):
+        self.library.close()
+        self.directory.cleanup()
+    
+    def loans(self, member_id):
+        return set(self.library.find_member_by_id(member_id).loans)
+    
+    def test_valid_batch_is_applied(self):
+        pairs = [(f"M{n}", self.isbns[n]) for n in range(3)]
+        self.assertTrue(all(result['success']
+                            for result in self.library.lend_many(pairs, atomic=True)))
+        self.assertEqual(self.loans('M2'), {self.isbns[2]})
+        self.assertTrue(all(result['success']
+                            for result in self.library.return_many(pairs, atomic=True)))
+        self.assertEqual(self.loans('M2'), set())
+    
+    def test_invalid_pair_aborts_the_batch(self):
+        self.library.lend_book('M0', self.isbns[0])
+        results = self.library.lend_many([('M5', self.isbns[3]), ('M6', self.isbns[0])],
+                                          atomic=True)
+        self.assertEqual([result['success'] for result in results], [False, False])
+        self.assertEqual(results[0]['error'], "Batch aborted")
+        self.assertEqual(self.loans('M5'), set())
+    
+    def test_missing_member_aborts_the_batch(self):
+        results = self.library.lend_many([('M5', self.isbns[3]), ('nobody', self.isbns[4])],
+                                         atomic=True)
+        self.assertFalse(any(result['success'] for result in results))
+        self.assertEqual(self.loans('M5'), set())
+        # The aborted member is no longer marked as having an operation in flight
+        self.assertTrue(self.library.remove_member('M5'))
+    
+    def test_batch_across_book_shards_is_applied(self):
+        pairs = [(f"M{n}", isbns[-1]) for n, isbns in enumerate(self.shelves.values())]
+        self.assertEqual(len({self.library._book_shard(isbn) for member_id, isbn in pairs}), 3)
+        self.assertTrue(all(result['success']
+                            for result in self.library.lend_many(pairs, atomic=True)))
+        self.assertEqual(self.loans('M1'), {pairs[1][1]})
+        self.assertTrue(all(result['success']
+                            for result in self.library.return_many(pairs, atomic=True)))
+        self.assertEqual(self.library.report()['borrowed_books'], 0)
+    
+    def test_invalid_pair_on_one_book_shard_aborts_every_shard(self):
+        first, second, third = (isbns[-1] for isbns in self.shelves.values())
+        self.library.lend_book('M9', third)
+        results = self.library.lend_many([('M4', first), ('M5', second), ('M6', third)],
+                                         atomic=True)
+        self.assertEqual([result['error'] for result in results[:2]], ["Batch aborted"] * 2)
+        self.assertIn("not available", results[2]['error'])
+        self.assertEqual(self.loans('M4') | self.loans('M5') | self.loans('M6'), set())
+        self.assertEqual(self.library.report()['borrowed_books'], 1)
+        # Every member marked by the first phase has been released again
+        for member_id in ('M4', 'M5', 'M6'):
+            self.assertTrue(self.library.remove_member(member_id))
+
+
+class ReportTest(unittest.TestCase):
+    """The most borrowed book is chosen across shards the way Library chooses it."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.library = ShardedLibrary(3, self.directory.name, events=Events(sinks=[]),
+                                      compact_every=0)
+    
+    def tearDown(self):
+        self.library.close()
+        self.directory.cleanup()
+    
+    def test_ties_go_to_the_book_added_first(self):
+        # The book added first is on the last shard and the later one on the
+        # first shard, so taking shard order alone would pick the later one
+        isbns = [f"B{n}" for n in range(30)]
+        first = next(isbn for isbn in isbns if self.library._book_shard(isbn) == 2)
+        latest = next(isbn for isbn in isbns if self.library._book_shard(isbn) == 0)
+        self.library.add_book('First', 'Author', first)
+        self.library.add_book('Latest', 'Author', latest)
+        self.library.register_member('Member', 'M1')
+        self.library.lend_book('M1', latest)
+        self.library.lend_book('M1', first)
+        book, count = self.library.get_most_borrowed_book()
+        self.assertEqual((book.isbn, count), (first, 1))
+        
+        # The order of additions survives saving and reopening
+        self.library.save_data()
+        self.library.close()
+        self.library = ShardedLibrary(3, self.directory.name, events=Events(sinks=[]))
+        self.library.load_data()
+        book, count = self.library.get_most_borrowed_book()
+        self.assertEqual((book.isbn, count), (first, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
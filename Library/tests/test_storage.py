@@ -0,0 +1,117 @@
+"""
+Library Inventory System - Storage Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check snapshot fallback and the bounded record cache of SQLite storage
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from events import Events
+from library import Library
+from storage import SQLiteStorage
+
+
+class SnapshotFallbackTest(unittest.TestCase):
+    """Loading after the current books.json fails its checksum."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+    
+    def test_checksum_failure_loads_prev_generation(self):
+        library = Library(events=Events(sinks=[]))
+        library.add_book('First Title', 'Author', 'B1')
+        library.register_member('Member', 'M1')
+        library.save_data()
+        library.add_book('Second Title', 'Author', 'B2')
+        library.lend_book('M1', 'B1')
+        library.save_data()
+        self.assertTrue(os.path.exists('books.json.prev'))
+        
+        with open('books.json', 'rb') as file:
+            data = file.read()
+        with open('books.json', 'wb') as file:
+            file.write(data.replace(b'Second Title', b'Second Tytle'))
+        
+        loaded = Library(events=Events(sinks=[]))
+        loaded.load_data()
+        counters = loaded.events.counters
+        self.assertEqual(counters['snapshot_unreadable'], 1)
+        self.assertEqual(counters['snapshot_fallback'], 1)
+        self.assertEqual(counters['load_failed'], 0)
+        # Both files come from the first generation, so they agree with each other
+        self.assertIsNotNone(loaded.find_book_by_isbn('B1'))
+        self.assertIsNone(loaded.find_book_by_isbn('B2'))
+        self.assertEqual(loaded.find_member_by_id('M1').loans, {})
+        self.assertEqual(loaded.find_book_by_isbn('B1').available_copies, 1)
+        self.assertTrue(loaded.check_counters())
+
+
+class LazyCacheTest(unittest.TestCase):
+    """A Library over SQLite keeps only a bounded number of idle records in memory."""
+    
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        library = self.open_library()
+        library.add_books([(f"Title {n}", 'Author', f"B{n}", 2) for n in range(200)])
+        for n in range(200):
+            library.register_member(f"Member {n}", f"M{n}")
+        library.close()
+    
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.directory.cleanup()
+    
+    def open_library(self):
+        library = Library(storage=SQLiteStorage('library.db'), events=Events(sinks=[]),
+                          lazy_cache=10)
+        library.load_data()
+        return library
+    
+    def test_idle_records_are_dropped_and_loans_kept(self):
+        library = self.open_library()
+        for n in range(5):
+            self.assertTrue(library.lend_book(f"M{n}", f"B{n}"))
+        # Reading everything once leaves the cache at its bound plus the records in use
+        self.assertEqual(len(list(library.books)), 200)
+        self.assertEqual(len(list(library.members)), 200)
+        self.assertLessEqual(len(library._books), 10 + 5)
+        self.assertLessEqual(len(library._members), 10 + 5)
+        
+        # The books on loan are the very objects the members' loans point at
+        for n in range(5):
+            member = library.find_member_by_id(f"M{n}")
+            self.assertIs(member.loans[f"B{n}"].book, library.find_book_by_isbn(f"B{n}"))
+            self.assertEqual(library.find_book_by_isbn(f"B{n}").available_copies, 1)
+        for n in range(5):
+            self.assertTrue(library.take_return(f"M{n}", f"B{n}"))
+        list(library.books)
+        list(library.members)
+        self.assertLessEqual(len(library._books), 10)
+        self.assertLessEqual(len(library._members), 10)
+        library.close()
+        
+        library = self.open_library()
+        self.assertEqual(library.find_book_by_isbn('B0').available_copies, 2)
+        self.assertEqual(library.borrow_history['B0'], 1)
+        self.assertEqual(library.find_member_by_id('M0').loans, {})
+        library.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Library Inventory System - Snapshot Tests
+Author: Student Name
+Date: November 21, 2025
+Assignment: Programming for Problem Solving Using Python - Assignment 3
+Description: Check that a snapshot keeps showing the library as it was when taken
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..',
+                                'library_system'))
+
+from events import Events
+from library import Library
+
+
+class SnapshotTest(unittest.TestCase):
+    """A lend and a remove made after the snapshot is taken do not show in it."""
+    
+    def setUp(self):
+        self.library = Library(storage=None, events=Events(sinks=[]))
+        self.library.add_book('First Title', 'Author', 'B1', copies=2)
+        self.library.add_book('Second Title', 'Author', 'B2')
+        self.library.register_member('First Member', 'M1')
+        self.library.register_member('Second Member', 'M2')
+        self.library.lend_book('M1', 'B1')
+        self.snapshot = self.library.snapshot()
+        self.library.lend_book('M2', 'B1')
+        self.library.remove_book('B2')
+    
+    def tearDown(self):
+        self.snapshot.close()
+    
+    def test_lend_is_not_seen(self):
+        self.assertEqual(self.library.find_book_by_isbn('B1').available_copies, 0)
+        self.assertEqual(self.snapshot.find_book('B1').available_copies, 1)
+        self.assertEqual(set(self.library.find_member_by_id('M2').loans), {'B1'})
+        self.assertEqual(self.snapshot.find_member('M2').loans, {})
+        self.assertEqual(set(self.snapshot.find_member('M1').loans), {'B1'})
+        self.assertEqual(self.snapshot.figures['borrowed_books'], 1)
+        self.assertEqual(self.snapshot.figures['active_members'], 1)
+    
+    def test_removed_book_is_still_listed(self):
+        self.assertIsNone(self.library.find_book_by_isbn('B2'))
+        self.assertEqual(self.snapshot.find_book('B2').title, 'Second Title')
+        self.assertEqual([book.isbn for book in self.snapshot.books], ['B1', 'B2'])
+        self.assertEqual(len(self.snapshot.books), 2)
+        self.assertEqual(self.snapshot.figures['total_books'], 2)
+        self.assertEqual(self.snapshot.figures['total_copies'], 3)
+    
+    def test_new_snapshot_sees_the_changes(self):
+        with self.library.snapshot() as snapshot:
+            self.assertEqual([book.isbn for book in snapshot.books], ['B1'])
+            self.assertEqual(snapshot.find_book('B1').available_copies, 0)
+            self.assertEqual(snapshot.figures['borrowed_books'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()